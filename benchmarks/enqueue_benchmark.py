@@ -0,0 +1,74 @@
+"""
+fan-out enqueue 지연 시간 벤치마크 (개별 명령 vs 배치)
+
+scene parser 이후 분기처럼 자식 task 여러 개를 등록할 때,
+task마다 HSET + 큐 등록을 따로 보내는 방식과 enqueue_tasks(MULTI/EXEC 한 번)를 비교해
+fan-out 1회당 p50/p99 지연 시간을 출력한다.
+
+사용법:
+    redis-server --port 6379 &
+    python -m benchmarks.enqueue_benchmark --iterations 2000 --fan-out 3
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+import redis
+
+from task_queue.task_queue_selector import TaskQueueSelector
+
+
+def make_tasks(fan_out: int):
+    return [
+        (str(uuid.uuid4()), {
+            "status": "queued",
+            "payload": "x" * 1024,
+            "pipelineId": "bench",
+            "order": 5
+        })
+        for _ in range(fan_out)
+    ]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fan-out enqueue 지연 시간 비교")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="벤치마크 전용 DB (실행 시 flush됨)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--backends", nargs="+", default=["list", "stream"])
+    args = parser.parse_args()
+
+    r = redis.Redis.from_url(args.redis_url, decode_responses=True)
+
+    print(f"{'backend':<8} {'mode':<10} {'p50(ms)':>9} {'p99(ms)':>9} {'mean(ms)':>9}")
+    for backend in args.backends:
+        queue = TaskQueueSelector.get_task_queue(backend, r)
+
+        def unbatched(tasks):
+            for step_id, mapping in tasks:
+                r.hset(f"task:{step_id}", mapping=mapping)
+                queue.enqueue(step_id, stage=mapping["order"])
+
+        for mode, enqueue in [("unbatched", unbatched), ("batched", queue.enqueue_tasks)]:
+            r.flushdb()
+            samples = []
+            for _ in range(args.iterations):
+                tasks = make_tasks(args.fan_out)
+                start = time.perf_counter()
+                enqueue(tasks)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(
+                f"{backend:<8} {mode:<10} {percentile(samples, 0.5):>9.3f} "
+                f"{percentile(samples, 0.99):>9.3f} {statistics.mean(samples):>9.3f}"
+            )
+    r.flushdb()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+장면별 이미지 생성 vs batch 생성 처리량 벤치마크 (CPU, random-weight 초소형 SD 파이프라인)
+
+DiffusionImageMaker.generate_images로 같은 장면들을 batch 크기별로 생성해
+images/sec를 출력한다. batch 1이 기존의 장면별 generate_image 호출과 같다.
+
+사용법:
+    python -m benchmarks.image_batch_benchmark --scenes 8 --batch-sizes 1 2 4 8
+"""
+import argparse
+import time
+
+import torch
+
+from benchmarks.tiny_diffusion import build_tiny_sd_pipeline
+from image_maker.dream_shaper_image_maker import DreamShaperImageMaker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 batch 생성 처리량 비교")
+    parser.add_argument("--scenes", type=int, default=8)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--sample-size", type=int, default=32, help="latent 해상도")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    image_maker = DreamShaperImageMaker.from_pipe(build_tiny_sd_pipeline(sample_size=args.sample_size))
+    image_maker.num_inference_steps = args.steps
+    prompts = [f"scene {i}, a fox walking through a quiet forest" for i in range(args.scenes)]
+
+    # 워밍업 (첫 호출의 초기화 비용 제외)
+    image_maker.generate_images(prompts[:1], batch_size=1)
+    print(f"auto batch size: {image_maker.auto_batch_size()}")
+
+    print(f"{'batch':>5} {'seconds':>9} {'images/s':>9} {'speedup':>8}")
+    baseline = None
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        images = image_maker.generate_images(prompts, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        assert all(image is not None for image in images)
+        baseline = baseline or elapsed
+        print(f"{batch_size:>5} {elapsed:>9.3f} {len(prompts) / elapsed:>9.2f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
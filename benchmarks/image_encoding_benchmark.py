@@ -0,0 +1,83 @@
+"""
+업로드 이미지 인코딩 벤치마크 (포맷/품질별 인코딩 시간과 크기, 축소 버전 병렬 인코딩)
+
+기본 입력은 image_maker/result*.png (모델이 생성한 512x512 이미지)이고, 각 설정의 장당 인코딩 시간과
+평균 바이트 수(원본 PNG 대비 비율)를 출력한다. --variants를 주면 원본 + 축소 버전을 순차로 인코딩할 때와
+ImageEncoder.encode_variants로 병렬 인코딩할 때의 장당 시간도 비교한다.
+
+사용법:
+    python -m benchmarks.image_encoding_benchmark --variants thumbnail:256,mobile:768
+"""
+import argparse
+import glob
+import os
+import time
+
+from PIL import Image
+
+from image_maker.image_encoder import ImageEncoder, parse_variants
+from image_maker.image_maker_manager import ImageMakerManager
+
+# (포맷, 품질, optimize)
+SETTINGS = [
+    ("png", 85, False), ("png", 85, True),
+    ("webp", 90, False), ("webp", 80, False), ("webp", 70, False),
+    ("jpeg", 90, False), ("jpeg", 80, False), ("jpeg", 80, True),
+]
+
+
+def measure(fn, images, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [fn(image) for image in images]
+    return (time.perf_counter() - start) / (repeat * len(images)), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 포맷/품질별 인코딩 시간과 크기 비교")
+    parser.add_argument("--images", default="image_maker/result*.png", help="입력 이미지 glob")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--variants", default="thumbnail:256,mobile:768")
+    args = parser.parse_args()
+
+    images = [Image.open(path).convert("RGB") for path in sorted(glob.glob(args.images))]
+    if not images:
+        raise SystemExit(f"입력 이미지가 없습니다: {args.images}")
+
+    baseline_seconds, baseline = measure(ImageMakerManager.image_to_bytes, images, args.repeat)
+    baseline_bytes = sum(map(len, baseline)) / len(baseline)
+
+    print(f"{len(images)} images, {images[0].width}x{images[0].height}")
+    print(f"{'format':<6} {'quality':>7} {'optimize':>8} {'ms/image':>9} {'KB/image':>9} {'vs png':>7}")
+    print(f"{'png*':<6} {'-':>7} {'-':>8} {baseline_seconds * 1000:>9.1f} {baseline_bytes / 1024:>9.1f} {1:>7.2f}")
+    for image_format, quality, optimize in SETTINGS:
+        encoder = ImageEncoder(image_format, quality, optimize=optimize)
+        seconds, encoded = measure(encoder.encode, images, args.repeat)
+        size = sum(len(e.data) for e in encoded) / len(encoded)
+        print(
+            f"{image_format:<6} {quality:>7} {str(optimize):>8} {seconds * 1000:>9.1f} "
+            f"{size / 1024:>9.1f} {size / baseline_bytes:>7.2f}"
+        )
+    print("* 기존 업로드 방식 (PNG, optimize 없음)")
+
+    variants = parse_variants(args.variants)
+    if variants:
+        encoder = ImageEncoder("webp", 80, variants)
+
+        def sequential(image):
+            # encode_variants와 같은 결과(원본보다 작아지지 않는 버전은 원본 재사용)를 한 스레드에서 만듦
+            original = encoder.encode(image)
+            return [original] + [encoder.encode(image, width, name) for name, width in variants.items() if width < image.width]
+
+        sequential_seconds, _ = measure(sequential, images, args.repeat)
+        parallel_seconds, encoded = measure(encoder.encode_variants, images, args.repeat)
+        sizes = ", ".join(f"{e.variant} {e.width}px {len(e.data) / 1024:.1f}KB" for e in encoded[-1])
+        print(f"\nwebp 80 + variants ({sizes})")
+        print(
+            f"sequential {sequential_seconds * 1000:.1f} ms/image, "
+            f"parallel {parallel_seconds * 1000:.1f} ms/image ({os.cpu_count()} CPUs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
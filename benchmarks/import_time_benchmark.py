@@ -0,0 +1,98 @@
+"""
+모듈 import 시간 리포트 (python -X importtime 결과 요약)
+
+모듈마다 새 인터프리터에서 `python -X importtime -c "import <module>"`을 실행하고 stderr를 파싱해
+- 전체 import 시간 (모든 모듈 self 시간의 합)
+- 최상위 패키지별 self 시간 합 상위 --top개
+- 무거운 패키지(--heavy, 기본 torch/diffusers/transformers) 중 import된 것
+을 출력한다. 기본 대상은 워커가 시작할 때 import하는 selector/manager 모듈과, 비교를 위해 selector가
+처음 사용할 때 import하는 구현 모듈(번역기, 이미지 생성기)이다.
+
+사용법:
+    python -m benchmarks.import_time_benchmark
+    python -m benchmarks.import_time_benchmark translator.translator_selector image_maker.dream_shaper_image_maker
+"""
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+DEFAULT_MODULES = [
+    "translator.translator_selector",
+    "image_maker.image_maker_selector",
+    "emotion_classifier.emotion_classifier_selector",
+    "prompt_maker.prompt_maker_selector",
+    "image_maker.image_maker_manager",
+    "image_maker.dynamic_image_batcher",
+    # 아래는 selector가 처음 사용할 때 import하는 구현 모듈 (워커 시작 시에는 import하지 않음)
+    "translator.marian_translator",
+    "image_maker.dream_shaper_image_maker",
+]
+
+# "import time:       123 |        456 |   package.module"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """-X importtime 출력 -> [(모듈 이름, self us, cumulative us, 중첩 깊이)]"""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure(module: str) -> List[Tuple[str, int, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr.splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def summarize(entries, heavy: List[str], top: int) -> Dict:
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+    imported = {name for name, _, _, _ in entries}
+    return {
+        "total_ms": sum(self_us for _, self_us, _, _ in entries) / 1000,
+        "modules": len(entries),
+        "heavy": [package for package in heavy if package in imported],
+        "top": sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="python -X importtime 기반 모듈 import 시간 요약")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3, help="모듈마다 반복 측정 횟수 (가장 빠른 결과 사용)")
+    parser.add_argument("--top", type=int, default=3, help="출력할 상위 패키지 수")
+    parser.add_argument("--heavy", default="torch,diffusers,transformers")
+    args = parser.parse_args()
+
+    heavy = [package for package in args.heavy.split(",") if package]
+    print(f"{'module':<46} {'total ms':>9} {'modules':>7}  {'heavy':<30} top packages (ms)")
+    for module in args.modules:
+        try:
+            runs = [summarize(measure(module), heavy, args.top) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:<46} {e}")
+            continue
+        summary = min(runs, key=lambda run: run["total_ms"])
+        top = ", ".join(f"{package} {us / 1000:.0f}" for package, us in summary["top"])
+        print(
+            f"{module:<46} {summary['total_ms']:>9.1f} {summary['modules']:>7}  "
+            f"{','.join(summary['heavy']) or '-':<30} {top}"
+        )
+
+
+if __name__ == "__main__":
+    main()
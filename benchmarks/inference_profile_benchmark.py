@@ -0,0 +1,52 @@
+"""
+inference profile별 이미지 생성 시간 벤치마크 (CPU, random-weight 초소형 SD 파이프라인)
+
+모델 기본 설정(기본 스케줄러, 25 step)과 draft / standard / quality profile의 장당 생성 시간을 출력한다.
+random weight라 결과 이미지 품질은 비교할 수 없고, step 수/스케줄러/메모리 배치에 따른 지연 시간만 비교한다.
+
+사용법:
+    python -m benchmarks.inference_profile_benchmark --images 4
+"""
+import argparse
+import time
+
+import torch
+
+from benchmarks.tiny_diffusion import build_tiny_sd_pipeline
+from image_maker.dream_shaper_image_maker import DreamShaperImageMaker
+from image_maker.inference_profiles import INFERENCE_PROFILES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="inference profile별 장당 생성 시간 비교")
+    parser.add_argument("--images", type=int, default=4)
+    parser.add_argument("--sample-size", type=int, default=32, help="latent 해상도")
+    parser.add_argument("--profiles", nargs="+", default=["default", *INFERENCE_PROFILES])
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    image_maker = DreamShaperImageMaker.from_pipe(build_tiny_sd_pipeline(sample_size=args.sample_size))
+    prompts = [f"scene {i}, a fox walking through a quiet forest" for i in range(args.images)]
+
+    print(f"{'profile':<9} {'scheduler':<28} {'steps':>5} {'s/image':>8}")
+    for name in args.profiles:
+        profile = None if name == "default" else name
+        image_maker.default_inference_profile = profile
+        # 워밍업 (스케줄러 교체 직후 첫 호출, torch.compile 등 초기화 비용 제외)
+        image_maker.generate_images(prompts[:1], batch_size=1)
+
+        start = time.perf_counter()
+        images = image_maker.generate_images(prompts, batch_size=1)
+        elapsed = time.perf_counter() - start
+        assert all(image is not None for image in images)
+        print(
+            f"{name:<9} {type(image_maker.pipe.scheduler).__name__:<28} "
+            f"{image_maker.num_inference_steps:>5} {elapsed / len(prompts):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+memory saver 단계별 peak RSS / 장당 생성 시간 벤치마크 (CPU, random-weight SD1.5 구조 축소판)
+
+설정마다 새 프로세스에서 파이프라인을 만들고 memory saver를 적용한 뒤 --images장을 생성하면서 RSS를 5ms 간격으로 재며
+- setup MB: 파이프라인 생성 + memory saver 적용 후 RSS (UNet 저정밀도 저장은 여기서 줄어듦)
+- peak MB: 생성 중 최대 RSS (대부분 VAE 디코드에서 나옴, VAE tiling은 여기서 줄어듦)
+- s/image: 장당 생성 시간
+을 출력한다. 단계(off / balanced / low) 외에 개별 설정(vae_tiling, bf16_unet)과, CPU에서는 적용하지 않는
+attention_slicing도 비교할 수 있다. VAE는 SD1.5와 같은 4 block(1/8 축소) 구조라 tiling 효과는 실제와 비슷하다.
+
+사용법:
+    python -m benchmarks.memory_saver_benchmark --size 512 --images 2
+    python -m benchmarks.memory_saver_benchmark --configs off,low,attention_slicing --steps 4
+"""
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+
+# 단계 이름이 아닌 개별 설정 (벤치마크에서만 등록)
+SINGLE_SETTINGS = {
+    "vae_tiling": {"vae_tile_size": 256},
+    "bf16_unet": {"reduce_weight_precision": True},
+}
+
+
+def run_child(args) -> dict:
+    """한 설정을 측정하고 결과를 dict로 반환 (새 프로세스에서 실행)"""
+    import gc
+
+    import psutil
+    import torch
+
+    from benchmarks.tiny_diffusion import build_small_sd_pipeline
+    from image_maker.dream_shaper_image_maker import DreamShaperImageMaker
+    from image_maker.memory_saver import MEMORY_SAVER_LEVELS, MemorySaverSettings
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    for name, fields in SINGLE_SETTINGS.items():
+        MEMORY_SAVER_LEVELS[name] = MemorySaverSettings(name, **fields)
+
+    image_maker = DreamShaperImageMaker.from_pipe(build_small_sd_pipeline(args.unet_channels, args.vae_channels, args.text_layers))
+    image_maker.num_inference_steps = args.steps
+    image_maker.height = image_maker.width = args.size
+    if args.config == "attention_slicing":
+        # memory saver는 SDPA가 있는 CPU/CUDA에서 적용하지 않으므로 직접 적용
+        image_maker.pipe.enable_attention_slicing()
+        level = "attention_slicing"
+    else:
+        level = image_maker.apply_memory_saver(args.config)
+    gc.collect()
+
+    process = psutil.Process()
+    setup_bytes = process.memory_info().rss
+    peak_bytes = [setup_bytes]
+    done = threading.Event()
+
+    def poll():
+        while not done.is_set():
+            peak_bytes[0] = max(peak_bytes[0], process.memory_info().rss)
+            time.sleep(0.005)
+
+    threading.Thread(target=poll, daemon=True).start()
+    prompts = [f"scene {i}, a fox walking through a quiet forest" for i in range(args.images)]
+    start = time.perf_counter()
+    image_maker.generate_images(prompts, batch_size=min(args.images, image_maker.max_batch_size), seeds=list(range(args.images)))
+    seconds = (time.perf_counter() - start) / args.images
+    done.set()
+
+    return {
+        "config": args.config,
+        "level": level,
+        "setup_mb": setup_bytes / 1024 ** 2,
+        "peak_mb": peak_bytes[0] / 1024 ** 2,
+        "seconds": seconds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="memory saver 단계별 peak RSS와 장당 생성 시간 비교")
+    parser.add_argument("--configs", default="off,balanced,low,vae_tiling,bf16_unet",
+                        help="비교할 단계(auto / off / balanced / low) 또는 개별 설정(vae_tiling / bf16_unet / attention_slicing)")
+    parser.add_argument("--size", type=int, default=512, help="이미지 해상도(px)")
+    parser.add_argument("--images", type=int, default=2, help="생성할 장면 수 (단계의 max_batch_size 안에서 한 batch)")
+    parser.add_argument("--steps", type=int, default=2)
+    parser.add_argument("--unet-channels", type=int, default=160)
+    parser.add_argument("--vae-channels", type=int, default=64)
+    parser.add_argument("--text-layers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    parser.add_argument("--config", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        print(json.dumps(run_child(args)))
+        return
+
+    print(f"{args.images} images, {args.size}x{args.size}, {args.steps} steps")
+    print(f"{'config':<18} {'level':<18} {'setup MB':>9} {'peak MB':>8} {'s/image':>8}")
+    for config in args.configs.split(","):
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.memory_saver_benchmark", *sys.argv[1:], "--config", config],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            print(f"{config:<18} 실패: {result.stderr.strip().splitlines()[-1]}")
+            continue
+        row = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{row['config']:<18} {row['level']:<18} {row['setup_mb']:>9.0f} {row['peak_mb']:>8.0f} {row['seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
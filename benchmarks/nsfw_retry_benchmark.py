@@ -0,0 +1,86 @@
+"""
+NSFW 재생성 방식(serial / parallel)별 지연 시간 벤치마크 (CPU, random-weight 초소형 SD 파이프라인)
+
+초소형 파이프라인에는 safety checker가 없으므로, seed를 보고 NSFW 판정을 흉내 낸다.
+--flagged-attempts 1이면 첫 생성만 판정되고, 2(기본)면 max_nsfw_attempts=3에서 마지막 후보만 안전한 최악의 경우다.
+판정된 장면 하나의 생성 시간과, 전체 중 판정되는 장면 비율(--flagged-ratio)에 따른 장당 평균 시간을 출력한다.
+
+사용법:
+    python -m benchmarks.nsfw_retry_benchmark --scenes 4 --flagged-ratio 0.25
+"""
+import argparse
+import time
+
+import torch
+
+from benchmarks.tiny_diffusion import build_tiny_sd_pipeline
+from image_maker.diffusion_image_maker import IMAGE_NSFW_CANDIDATES, IMAGE_NSFW_OUTCOMES, NSFW_RETRY_STRATEGIES
+from image_maker.dream_shaper_image_maker import DreamShaperImageMaker
+
+# 장면 i의 seed를 i * SEED_STRIDE로 잡아, 재생성 seed(seed + 시도 번호)에서 장면과 시도 번호를 알아냄
+SEED_STRIDE = 1000
+
+
+def flagging(run_batch, flagged_scenes, flagged_attempts):
+    """flagged_scenes에 속한 장면의 처음 flagged_attempts번 시도를 NSFW로 판정하는 _run_batch"""
+    def _run_batch(prompts, seeds, preview_keys=None):
+        images, _ = run_batch(prompts, seeds, preview_keys)
+        nsfw = [seed // SEED_STRIDE in flagged_scenes and seed % SEED_STRIDE < flagged_attempts for seed in seeds]
+        return images, nsfw
+
+    return _run_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NSFW 재생성 방식별 지연 시간 비교")
+    parser.add_argument("--scenes", type=int, default=4)
+    parser.add_argument("--flagged-ratio", type=float, default=0.25, help="NSFW로 판정될 장면 비율")
+    parser.add_argument("--flagged-attempts", type=int, default=2, help="장면마다 판정될 시도 수 (max_nsfw_attempts보다 작게)")
+    parser.add_argument("--sample-size", type=int, default=32, help="latent 해상도")
+    parser.add_argument("--profile", default="draft")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    image_maker = DreamShaperImageMaker.from_pipe(build_tiny_sd_pipeline(sample_size=args.sample_size))
+    image_maker.default_inference_profile = args.profile
+    prompts = [f"scene {i}, a fox walking through a quiet forest" for i in range(args.scenes)]
+    seeds = [i * SEED_STRIDE for i in range(args.scenes)]
+    flagged_scenes = set(range(round(args.scenes * args.flagged_ratio)))
+    run_batch = image_maker._run_batch
+    # 워밍업
+    image_maker.generate_images(prompts[:1], batch_size=1)
+
+    print(f"max_nsfw_attempts={image_maker.max_nsfw_attempts}, flagged attempts={args.flagged_attempts}, "
+          f"flagged scenes={len(flagged_scenes)}/{args.scenes}")
+    print(f"{'strategy':<9} {'flagged s/scene':>15} {'all s/scene':>12}")
+    results = {}
+    for strategy in NSFW_RETRY_STRATEGIES:
+        image_maker.nsfw_retry_strategy = strategy
+        image_maker._run_batch = flagging(run_batch, {0}, args.flagged_attempts)
+        start = time.perf_counter()
+        results[strategy] = image_maker.generate_images(prompts[:1], seeds=seeds[:1])
+        flagged_seconds = time.perf_counter() - start
+
+        image_maker._run_batch = flagging(run_batch, flagged_scenes, args.flagged_attempts)
+        start = time.perf_counter()
+        image_maker.generate_images(prompts, seeds=seeds)
+        all_seconds = (time.perf_counter() - start) / args.scenes
+        print(f"{strategy:<9} {flagged_seconds:>15.3f} {all_seconds:>12.3f}")
+
+    # 두 방식 모두 seed 순서상 첫 번째 안전한 후보를 고르므로 결과가 같아야 함
+    serial, parallel = (results[strategy][0].tobytes() for strategy in NSFW_RETRY_STRATEGIES)
+    print(f"identical images: {serial == parallel}")
+    for strategy in NSFW_RETRY_STRATEGIES:
+        outcomes = {
+            outcome: IMAGE_NSFW_OUTCOMES.labels(strategy, outcome)._value.get()
+            for outcome in ("safe", "retried", "unsafe")
+        }
+        candidates = IMAGE_NSFW_CANDIDATES.labels(strategy)._value.get()
+        print(f"{strategy}: outcomes {outcomes}, retry candidates {candidates:.0f}")
+
+
+if __name__ == "__main__":
+    main()
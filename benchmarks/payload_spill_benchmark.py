@@ -0,0 +1,116 @@
+"""
+payload spill/fetch 지연 시간 벤치마크 (Redis 압축 저장 vs artifact store로 내보내기)
+
+PayloadStore.pack + task 해시 HSET(spill), HGETALL + PayloadStore.unpack(fetch)을 payload 크기별로 반복해
+저장 위치(redis / local / s3)마다 p50/p99 지연 시간(ms)과 spill + fetch 평균 합계를 출력한다.
+s3는 --s3-endpoint(MinIO 등)를 주면 그 서버를, 생략하면 moto로 띄운 가상 S3를 사용한다
+(moto 결과는 네트워크 왕복이 빠진 하한값).
+
+사용법:
+    redis-server --port 6379 &
+    python -m benchmarks.payload_spill_benchmark --sizes 65536 1048576 4194304 --iterations 50
+"""
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+import redis
+
+from payload_store.local_artifact_store import LocalArtifactStore
+from payload_store.payload_store import PayloadStore
+from payload_store.s3_artifact_store import S3ArtifactStore
+
+
+def make_payload(size: int, seed: int = 0) -> str:
+    # 장면 JSON처럼 어느 정도 압축되는 텍스트 (반복 단어 + 무작위 숫자)
+    rng = random.Random(seed)
+    words = ["scene", "prompt", "숲속", "토끼", "하늘", "generated", "character", "night"]
+    parts, total = [], 0
+    while total < size:
+        part = f"{rng.choice(words)}{rng.randint(0, 99999)} "
+        parts.append(part)
+        total += len(part.encode("utf-8"))
+    return "".join(parts)
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+@contextlib.contextmanager
+def s3_store(endpoint, bucket):
+    import boto3
+
+    if endpoint:
+        client = boto3.client("s3", endpoint_url=endpoint)
+        yield S3ArtifactStore(client, bucket, prefix="benchmark/")
+        return
+
+    from moto import mock_aws
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=bucket)
+        yield S3ArtifactStore(client, bucket, prefix="benchmark/")
+
+
+def run(r, payloads, text, iterations):
+    spill, fetch = [], []
+    for _ in range(iterations):
+        step_id = str(uuid.uuid4())
+        task_key = f"task:{step_id}"
+
+        start = time.perf_counter()
+        r.hset(task_key, mapping=payloads.pack(step_id, "bench", text))
+        spill.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        restored = payloads.unpack(r.hgetall(task_key))
+        fetch.append((time.perf_counter() - start) * 1000)
+        assert restored == text
+    return spill, fetch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="payload 저장 위치별 spill/fetch 지연 시간 비교")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="벤치마크 전용 DB (실행 시 flush됨)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64 * 1024, 1024 * 1024, 4 * 1024 * 1024])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--locations", nargs="+", default=["redis", "local", "s3"])
+    parser.add_argument("--s3-endpoint", default=None, help="S3 호환 서버 주소 (생략 시 moto)")
+    parser.add_argument("--bucket", default="payload-benchmark")
+    args = parser.parse_args()
+
+    r = redis.Redis.from_url(args.redis_url, decode_responses=True)
+
+    print(f"{'location':<8} {'size(KB)':>9} {'spill p50':>10} {'spill p99':>10} {'fetch p50':>10} {'fetch p99':>10} {'total(ms)':>9}")
+    with tempfile.TemporaryDirectory() as local_dir, contextlib.ExitStack() as stack:
+        stores = {
+            "redis": None,
+            "local": LocalArtifactStore(local_dir),
+            "s3": stack.enter_context(s3_store(args.s3_endpoint, args.bucket)) if "s3" in args.locations else None,
+        }
+        for location in args.locations:
+            # redis는 압축만(artifact store 없음), 나머지는 압축 후 크기와 무관하게 항상 내보내도록 spill 기준을 0으로
+            payloads = PayloadStore(r, artifact_store=stores[location], spill_threshold=0)
+            for size in args.sizes:
+                r.flushdb()
+                spill, fetch = run(r, payloads, make_payload(size), args.iterations)
+                print(
+                    f"{location:<8} {size // 1024:>9} {percentile(spill, 0.5):>10.3f} {percentile(spill, 0.99):>10.3f} "
+                    f"{percentile(fetch, 0.5):>10.3f} {percentile(fetch, 0.99):>10.3f} "
+                    f"{statistics.mean(spill) + statistics.mean(fetch):>9.3f}"
+                )
+    r.flushdb()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+VAE 디코드 파이프라이닝 벤치마크 (CPU, random-weight SD1.5 구조 축소판)
+
+ImageMakerManager.process로 동화 한 편(--scenes 장면)을 생성해 PNG로 인코딩하는 시간을
+- sequential: 장면마다 denoising -> VAE 디코드 -> PIL 변환 -> PNG 인코딩을 차례로 실행
+- pipelined: denoising은 호출 스레드, 디코드/인코딩은 디코드 스레드에서 실행해 다음 장면의 denoising과 겹침
+으로 비교하고, 두 방식의 결과 PNG가 같은지 확인한다. 겹칠 수 있는 시간은 디코드+인코딩 시간만큼이라
+--steps가 적을수록(draft profile) 효과가 크고, CPU 코어가 하나뿐이면 두 스레드가 같은 코어를 나눠 써 효과가 없다.
+
+사용법:
+    python -m benchmarks.pipelined_decode_benchmark --scenes 4 --size 256 --steps 4
+"""
+import argparse
+import json
+import time
+
+import torch
+
+from benchmarks.tiny_diffusion import build_small_sd_pipeline
+from image_maker.dream_shaper_image_maker import DreamShaperImageMaker
+from image_maker.image_maker_manager import ImageMakerManager
+
+
+def run(manager: ImageMakerManager, prompts: str, batch_size: int, repeat: int):
+    """(가장 빠른 동화 한 편 생성 시간, 결과 PNG 목록)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = manager.process(prompts, batch_size=batch_size)
+        timings.append(time.perf_counter() - start)
+    return min(timings), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VAE 디코드 파이프라이닝 유무별 동화 한 편 생성 시간 비교")
+    parser.add_argument("--scenes", type=int, default=4)
+    parser.add_argument("--size", type=int, default=256, help="이미지 해상도(px)")
+    parser.add_argument("--steps", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1, help="한 번에 denoising할 장면 수")
+    parser.add_argument("--unet-channels", type=int, default=64)
+    parser.add_argument("--vae-channels", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=2, help="방식마다 반복 횟수 (가장 빠른 결과 사용)")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    image_maker = DreamShaperImageMaker.from_pipe(
+        build_small_sd_pipeline(unet_channels=args.unet_channels, vae_channels=args.vae_channels)
+    )
+    image_maker.num_inference_steps = args.steps
+    image_maker.height = image_maker.width = args.size
+    manager = ImageMakerManager(image_maker)
+    prompts = json.dumps([
+        {"generated_prompt": f"scene {i}, a fox walking through a quiet forest", "seed": i}
+        for i in range(args.scenes)
+    ])
+    # 워밍업
+    manager.process(prompts, batch_size=args.batch_size)
+
+    print(f"{args.scenes} scenes, {args.size}x{args.size}, {args.steps} steps, batch size {args.batch_size}, "
+          f"{torch.get_num_threads()} torch threads")
+    image_maker.pipelined_decode = False
+    sequential_seconds, sequential_results = run(manager, prompts, args.batch_size, args.repeat)
+    image_maker.pipelined_decode = True
+    pipelined_seconds, pipelined_results = run(manager, prompts, args.batch_size, args.repeat)
+
+    print(f"sequential: {sequential_seconds:.2f}s/story")
+    print(f"pipelined:  {pipelined_seconds:.2f}s/story ({sequential_seconds / pipelined_seconds:.2f}x)")
+    print(f"identical images: {sequential_results == pipelined_results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+중간 미리보기 전송 비용 벤치마크 (CPU, random-weight 초소형 SD 파이프라인)
+
+같은 장면들을 미리보기 없이 / every_n_steps별로 미리보기를 보내며 생성하고 장당 생성 시간, 미리보기를 끈 경우 대비
+오버헤드, 전송된 미리보기 수를 출력한다. 미리보기 디코드/전송은 백그라운드 스레드에서 하므로 생성 시간에는
+callback에서 latent를 복사하는 비용과 스레드 경합만 더해진다. 미리보기 유무와 관계없이 최종 이미지가 같은지도 확인한다.
+
+사용법:
+    redis-server --port 6379 &
+    python -m benchmarks.preview_benchmark --scenes 4 --steps 20 --every 0,5,1
+"""
+import argparse
+import time
+
+import redis
+import torch
+
+from benchmarks.tiny_diffusion import build_tiny_sd_pipeline
+from image_maker.dream_shaper_image_maker import DreamShaperImageMaker
+from image_maker.preview_publisher import IMAGE_PREVIEWS, PreviewPublisher
+
+
+def published_previews() -> float:
+    return IMAGE_PREVIEWS.labels("published")._value.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="중간 미리보기 전송 주기별 이미지 생성 시간 비교")
+    parser.add_argument("--scenes", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--every", default="0,5,1", help="비교할 every_n_steps 목록 (0은 미리보기 없음)")
+    parser.add_argument("--min-interval-ms", type=float, default=0, help="장면별 최소 전송 간격")
+    parser.add_argument("--sample-size", type=int, default=32, help="latent 해상도")
+    parser.add_argument("--repeat", type=int, default=3, help="설정마다 반복 횟수 (가장 빠른 결과 사용)")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="미리보기를 보낼 Redis")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    r = redis.Redis.from_url(args.redis_url)
+    image_maker = DreamShaperImageMaker.from_pipe(build_tiny_sd_pipeline(sample_size=args.sample_size))
+    image_maker.num_inference_steps = args.steps
+    prompts = [f"scene {i}, a fox walking through a quiet forest" for i in range(args.scenes)]
+    seeds = list(range(args.scenes))
+    preview_keys = [f"bench:{i + 1}" for i in range(args.scenes)]
+    # 워밍업
+    image_maker.generate_images(prompts[:1], batch_size=1, seeds=seeds[:1])
+
+    print(f"{args.scenes} scenes, {args.steps} steps, latent {args.sample_size}x{args.sample_size}")
+    print(f"{'every_n':>7} {'s/image':>8} {'overhead':>9} {'previews':>9}")
+    baseline_seconds = None
+    baseline_images = None
+    for every in (int(value) for value in args.every.split(",")):
+        publisher = None
+        if every > 0:
+            publisher = PreviewPublisher(r, every_n_steps=every, min_interval_seconds=args.min_interval_ms / 1000)
+        image_maker.preview_publisher = publisher
+
+        published = published_previews()
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            images = image_maker.generate_images(
+                prompts, seeds=seeds, preview_keys=preview_keys if publisher else None
+            )
+            timings.append((time.perf_counter() - start) / args.scenes)
+        if publisher is not None:
+            publisher.flush(timeout=30)
+        seconds = min(timings)
+
+        if baseline_seconds is None:
+            baseline_seconds, baseline_images = seconds, images
+        overhead = seconds / baseline_seconds - 1
+        identical = all(a.tobytes() == b.tobytes() for a, b in zip(images, baseline_images))
+        print(f"{every or '-':>7} {seconds:>8.3f} {overhead:>+9.1%} {published_previews() - published:>9.0f}"
+              f"{'' if identical else '  (images differ!)'}")
+
+    image_maker.preview_publisher = None
+
+
+if __name__ == "__main__":
+    main()
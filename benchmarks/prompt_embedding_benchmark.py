@@ -0,0 +1,101 @@
+"""
+프롬프트 임베딩 캐시 벤치마크 (CPU, SD1.5 크기의 random-weight CLIP 텍스트 인코더)
+
+동화 한 편(--scenes 장면)을 생성할 때 파이프라인이 하는 텍스트 인코딩(장면 프롬프트 + negative prompt)을
+캐시 없이 / 캐시를 써서 실행하고 인코딩에 걸린 시간을 비교한다. NSFW 재생성(--nsfw-ratio 비율의 장면을
+--nsfw-attempts번 더 생성)과 같은 동화의 재요청(--repeats)도 흉내 낸다.
+UNet/VAE는 포함하지 않으므로 생성 시간 중 텍스트 인코더 비중만 비교한다.
+
+사용법:
+    python -m benchmarks.prompt_embedding_benchmark --scenes 8
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import torch
+from transformers import CLIPTextConfig, CLIPTextModel
+
+from benchmarks.tiny_diffusion import build_tiny_tokenizer
+from image_maker.prompt_embedding_cache import PromptEmbeddingCache
+
+NEGATIVE_PROMPT = "low quality, blurry, nsfw"
+
+
+def build_text_encoder_pipe():
+    """encode에 필요한 tokenizer, text_encoder만 가진 SD1.5 크기(12 layer, hidden 768) 파이프라인 대용"""
+    tokenizer = build_tiny_tokenizer()
+    text_encoder = CLIPTextModel(CLIPTextConfig(
+        vocab_size=len(tokenizer),
+        hidden_size=768,
+        intermediate_size=3072,
+        num_hidden_layers=12,
+        num_attention_heads=12,
+        max_position_embeddings=77,
+        bos_token_id=tokenizer.bos_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+        pad_token_id=tokenizer.pad_token_id
+    )).eval()
+    return SimpleNamespace(tokenizer=tokenizer, text_encoder=text_encoder, _execution_device=torch.device("cpu"))
+
+
+def encode_uncached(pipe, texts):
+    """파이프라인이 매 호출 하는 인코딩 (캐시 없음)"""
+    ids = pipe.tokenizer(
+        texts, padding="max_length", max_length=pipe.tokenizer.model_max_length, truncation=True, return_tensors="pt"
+    ).input_ids
+    with torch.no_grad():
+        return pipe.text_encoder(ids)[0]
+
+
+def workload(args):
+    """(프롬프트 목록) 호출 순서: 장면 batch 생성 → NSFW 장면 재생성 (재요청마다 반복)"""
+    character = "yujin (a seven year old girl with short black hair, yellow raincoat); "
+    prompts = [f"{character}scene {i}, yujin walks along a rainy street, watercolor" for i in range(args.scenes)]
+    flagged = prompts[:round(args.scenes * args.nsfw_ratio)]
+    calls = []
+    for _ in range(args.repeats):
+        calls.append(prompts)
+        calls += [flagged] * args.nsfw_attempts if flagged else []
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프롬프트 임베딩 캐시 사용 여부별 텍스트 인코딩 시간 비교")
+    parser.add_argument("--scenes", type=int, default=8)
+    parser.add_argument("--nsfw-ratio", type=float, default=0.25)
+    parser.add_argument("--nsfw-attempts", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=2, help="같은 동화 재요청 횟수")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    pipe = build_text_encoder_pipe()
+    calls = workload(args)
+    encode_uncached(pipe, [NEGATIVE_PROMPT])  # 워밍업
+
+    start = time.perf_counter()
+    for prompts in calls:
+        encode_uncached(pipe, prompts)
+        encode_uncached(pipe, [NEGATIVE_PROMPT] * len(prompts))
+    uncached_seconds = time.perf_counter() - start
+
+    cache = PromptEmbeddingCache(max_entries=256)
+    start = time.perf_counter()
+    for prompts in calls:
+        cache.encode(pipe, prompts)
+        cache.encode(pipe, [NEGATIVE_PROMPT] * len(prompts))
+    cached_seconds = time.perf_counter() - start
+
+    texts = sum(2 * len(prompts) for prompts in calls)
+    stats = cache.stats()
+    print(f"{len(calls)} pipeline calls, {texts} texts encoded by the pipeline")
+    print(f"uncached: {uncached_seconds:.3f}s")
+    print(f"cached:   {cached_seconds:.3f}s ({uncached_seconds / cached_seconds:.1f}x), "
+          f"hit rate {stats['hit_rate']:.1%}, entries {stats['entries']}")
+
+
+if __name__ == "__main__":
+    main()
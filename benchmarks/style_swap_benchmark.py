@@ -0,0 +1,127 @@
+"""
+그림체 전환 벤치마크: 그림체별 파이프라인 두 개 vs SD1.5 base 하나 + UNet 교체 (CPU, random-weight 초소형 SD 파이프라인)
+
+seed만 다른 초소형 파이프라인 두 개를 임시 디렉터리에 저장해 두 그림체로 쓰고, 방식마다 새 프로세스에서
+- 두 그림체를 쓸 수 있는 상태까지의 상주 메모리 증가량(RSS, UNet 교체는 전환을 모두 마친 뒤라 CPU 캐시 포함)
+- 파이프라인 파라미터 바이트(GPU에서는 VRAM)와 CPU에 캐시한 교체용 UNet 바이트
+- 그림체 전환 시간 (두 파이프라인 방식은 다른 파이프라인을 새로 불러오는 시간, UNet 교체는 처음/이후 평균)
+를 측정한다. UNet 교체는 CPU 캐시 크기(--cache-sizes)별로 측정한다.
+초소형 모델은 UNet 비중이 SD1.5(파라미터의 약 80%)와 달라 절대값보다 방식 간 차이를 볼 것.
+
+사용법:
+    python -m benchmarks.style_swap_benchmark --switches 10
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import psutil
+
+
+def parameter_bytes(*modules) -> int:
+    return sum(p.numel() * p.element_size() for module in modules for p in module.parameters())
+
+
+def pipeline_bytes(pipe) -> int:
+    return parameter_bytes(pipe.text_encoder, pipe.unet, pipe.vae)
+
+
+def two_pipelines(model_dirs, switches):
+    from diffusers import StableDiffusionPipeline
+
+    process = psutil.Process()
+    rss = process.memory_info().rss
+    pipes = [StableDiffusionPipeline.from_pretrained(path) for path in model_dirs]
+    resident = process.memory_info().rss - rss
+
+    # 한 번에 하나만 두는 경우의 전환 = 다른 파이프라인을 새로 불러옴
+    start = time.perf_counter()
+    for i in range(switches):
+        StableDiffusionPipeline.from_pretrained(model_dirs[i % 2])
+    reload_seconds = (time.perf_counter() - start) / switches
+    return {
+        "resident_mb": resident / 1024 ** 2,
+        "pipeline_mb": sum(map(pipeline_bytes, pipes)) / 1024 ** 2,
+        "cache_mb": 0.0,
+        "switch_cold_s": reload_seconds,
+        "switch_warm_s": 0.0,
+    }
+
+
+def style_swap(model_dirs, switches, max_cached_unets):
+    from diffusers import StableDiffusionPipeline
+    from image_maker.style_adapters import StyleAdapter
+    from image_maker.style_swap_image_maker import StyleSwapImageMaker
+
+    process = psutil.Process()
+    rss = process.memory_info().rss
+    styles = {"base": StyleAdapter("base"), "other": StyleAdapter("other", unet=model_dirs[1])}
+    image_maker = StyleSwapImageMaker.from_pipe(
+        StableDiffusionPipeline.from_pretrained(model_dirs[0]), styles, "base", max_cached_unets=max_cached_unets
+    )
+
+    # 첫 전환은 교체용 UNet을 디스크에서 불러옴
+    start = time.perf_counter()
+    image_maker.apply_style("other")
+    cold_seconds = time.perf_counter() - start
+    image_maker.apply_style("base")
+
+    start = time.perf_counter()
+    for i in range(switches):
+        image_maker.apply_style("other" if i % 2 == 0 else "base")
+    warm_seconds = (time.perf_counter() - start) / switches
+    # 캐시가 찬 상태의 상주 메모리
+    resident = process.memory_info().rss - rss
+
+    cached = sum(t.numel() * t.element_size() for state in image_maker._unet_states.values() for t in state.values())
+    return {
+        "resident_mb": resident / 1024 ** 2,
+        "pipeline_mb": pipeline_bytes(image_maker.pipe) / 1024 ** 2,
+        "cache_mb": cached / 1024 ** 2,
+        "switch_cold_s": cold_seconds,
+        "switch_warm_s": warm_seconds,
+    }
+
+
+def run_isolated(fn, *args):
+    """메모리 측정이 섞이지 않도록 새 프로세스에서 실행"""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(fn, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="그림체 전환 방식별 상주 메모리와 전환 시간 비교")
+    parser.add_argument("--switches", type=int, default=10)
+    parser.add_argument("--sample-size", type=int, default=32, help="latent 해상도")
+    parser.add_argument("--cache-sizes", type=int, nargs="+", default=[0, 2], help="CPU에 캐시할 UNet 수")
+    args = parser.parse_args()
+
+    from benchmarks.tiny_diffusion import build_tiny_sd_pipeline
+
+    tmp_dir = tempfile.mkdtemp(prefix="style_swap_")
+    model_dirs = []
+    for seed in range(2):
+        path = os.path.join(tmp_dir, f"style_{seed}")
+        build_tiny_sd_pipeline(sample_size=args.sample_size, seed=seed).save_pretrained(path)
+        model_dirs.append(path)
+
+    runs = [("two_pipelines", two_pipelines, ())]
+    runs += [(f"style_swap/{size}", style_swap, (size,)) for size in args.cache_sizes]
+    print(
+        f"{'approach':<14} {'resident MB':>11} {'pipeline MB':>11} {'cpu cache MB':>12} "
+        f"{'switch first s':>14} {'switch avg s':>12}"
+    )
+    for name, fn, extra in runs:
+        result = run_isolated(fn, model_dirs, args.switches, *extra)
+        print(
+            f"{name:<14} {result['resident_mb']:>11.1f} {result['pipeline_mb']:>11.2f} {result['cache_mb']:>12.2f} "
+            f"{result['switch_cold_s']:>14.4f} {result['switch_warm_s']:>12.4f}"
+        )
+    print("two_pipelines: switch first = 다른 파이프라인을 다시 불러오는 시간 (두 개를 모두 상주시키면 전환 비용 없음)")
+    print("style_swap/N: CPU에 캐시하는 UNet 수 N (0이면 전환할 때마다 디스크에서 UNet만 불러옴)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+작업 큐 backend 처리량 벤치마크 (list vs stream)
+
+로컬 redis-server에 대해 consumer 수(기본 1, 4, 16)별로
+enqueue된 step을 claim → ack 하는 데 걸린 시간을 측정해 초당 처리량을 출력한다.
+
+사용법:
+    redis-server --port 6379 &
+    python -m benchmarks.task_queue_benchmark --tasks 20000 --consumers 1 4 16
+"""
+import argparse
+import threading
+import time
+import uuid
+
+import redis
+
+from task_queue.task_queue_selector import TaskQueueSelector
+
+
+def run_once(redis_url: str, backend: str, num_tasks: int, num_consumers: int) -> float:
+    r = redis.Redis.from_url(redis_url, decode_responses=True)
+    r.flushdb()
+
+    prefix = f"bench:{uuid.uuid4().hex[:8]}"
+    queue_kwargs = {"stream_name": f"{prefix}:stream"} if backend == "stream" else {"queue_name": f"{prefix}:list"}
+    producer = TaskQueueSelector.get_task_queue(backend, r, task_prefix=f"{prefix}:task:", **queue_kwargs)
+
+    # task 해시 + 큐 등록 (측정 대상 아님)
+    pipe = r.pipeline(transaction=False)
+    step_ids = [str(i) for i in range(num_tasks)]
+    for step_id in step_ids:
+        pipe.hset(f"{prefix}:task:{step_id}", mapping={"status": "queued", "payload": "x" * 256})
+    pipe.execute()
+    for step_id in step_ids:
+        producer.enqueue(step_id, stage=1)
+
+    processed = [0] * num_consumers
+    done = threading.Event()
+
+    def consume(index: int):
+        client = redis.Redis.from_url(redis_url, decode_responses=True)
+        queue = TaskQueueSelector.get_task_queue(
+            backend, client, stages=[1], worker_id=f"consumer-{index}", task_prefix=f"{prefix}:task:", **queue_kwargs
+        )
+        while not done.is_set():
+            step_id = queue.claim(timeout=0.2)
+            if step_id is None:
+                if sum(processed) >= num_tasks:
+                    done.set()
+                continue
+            queue.ack(step_id)
+            processed[index] += 1
+        queue.close()
+
+    threads = [threading.Thread(target=consume, args=(i,)) for i in range(num_consumers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while sum(processed) < num_tasks:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    r.flushdb()
+    return num_tasks / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 큐 backend 처리량 비교")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="벤치마크 전용 DB (실행 시 flush됨)")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--consumers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--backends", nargs="+", default=["list", "stream"])
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'consumers':>9} {'tasks/s':>12}")
+    for backend in args.backends:
+        for num_consumers in args.consumers:
+            throughput = run_once(args.redis_url, backend, args.tasks, num_consumers)
+            print(f"{backend:<8} {num_consumers:>9} {throughput:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
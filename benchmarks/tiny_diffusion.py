@@ -0,0 +1,145 @@
+"""
+벤치마크용 초소형 random-weight Stable Diffusion 파이프라인
+
+모델 다운로드 없이 CPU에서 이미지 생성 경로(batch, 스케줄러, VAE decode 등)의 상대적인 비용을 비교하기 위한 것으로,
+생성 결과 이미지는 의미가 없다.
+"""
+import json
+import os
+import string
+import tempfile
+
+import torch
+from diffusers import AutoencoderKL, DDIMScheduler, StableDiffusionPipeline, UNet2DConditionModel
+from transformers import CLIPTextConfig, CLIPTextModel, CLIPTokenizer
+
+
+def build_tiny_tokenizer() -> CLIPTokenizer:
+    """문자 단위 vocab으로 만든 CLIP tokenizer (BPE merge 없음)"""
+    special_tokens = ["<|startoftext|>", "<|endoftext|>"]
+    characters = list(string.ascii_lowercase + string.digits + string.punctuation)
+    vocab_tokens = special_tokens + characters + [f"{c}</w>" for c in characters]
+
+    tmp_dir = tempfile.mkdtemp(prefix="tiny_clip_")
+    vocab_file = os.path.join(tmp_dir, "vocab.json")
+    merges_file = os.path.join(tmp_dir, "merges.txt")
+    with open(vocab_file, "w", encoding="utf-8") as f:
+        json.dump({token: i for i, token in enumerate(vocab_tokens)}, f)
+    with open(merges_file, "w", encoding="utf-8") as f:
+        f.write("#version: 0.2\n")
+    return CLIPTokenizer(vocab_file, merges_file, pad_token="<|endoftext|>", model_max_length=77)
+
+
+def build_tiny_sd_pipeline(sample_size: int = 32, seed: int = 0) -> StableDiffusionPipeline:
+    """
+    random-weight SD1.5 구조 축소판 (UNet 2 block, 텍스트 인코더 2 layer, safety checker 없음)
+
+    Args:
+        sample_size (int): latent 해상도 (이미지 해상도 = sample_size × 2)
+    """
+    torch.manual_seed(seed)
+    tokenizer = build_tiny_tokenizer()
+    text_encoder = CLIPTextModel(CLIPTextConfig(
+        vocab_size=len(tokenizer),
+        hidden_size=32,
+        intermediate_size=37,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        max_position_embeddings=77,
+        bos_token_id=tokenizer.bos_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+        pad_token_id=tokenizer.pad_token_id
+    ))
+    unet = UNet2DConditionModel(
+        sample_size=sample_size,
+        in_channels=4,
+        out_channels=4,
+        block_out_channels=(32, 64),
+        layers_per_block=2,
+        down_block_types=("DownBlock2D", "CrossAttnDownBlock2D"),
+        up_block_types=("CrossAttnUpBlock2D", "UpBlock2D"),
+        cross_attention_dim=32,
+        attention_head_dim=8
+    )
+    vae = AutoencoderKL(
+        in_channels=3,
+        out_channels=3,
+        block_out_channels=(32,),
+        down_block_types=("DownEncoderBlock2D",),
+        up_block_types=("UpDecoderBlock2D",),
+        latent_channels=4,
+        sample_size=sample_size * 2
+    )
+    scheduler = DDIMScheduler(
+        beta_start=0.00085,
+        beta_end=0.012,
+        beta_schedule="scaled_linear",
+        clip_sample=False,
+        set_alpha_to_one=False,
+        steps_offset=1
+    )
+    pipe = StableDiffusionPipeline(
+        vae=vae,
+        text_encoder=text_encoder,
+        tokenizer=tokenizer,
+        unet=unet,
+        scheduler=scheduler,
+        safety_checker=None,
+        feature_extractor=None,
+        requires_safety_checker=False
+    )
+    pipe.set_progress_bar_config(disable=True)
+    return pipe.to("cpu")
+
+
+def build_small_sd_pipeline(
+    unet_channels: int = 160, vae_channels: int = 64, text_layers: int = 4, seed: int = 0
+) -> StableDiffusionPipeline:
+    """
+    random-weight SD1.5 구조 축소판 (UNet 4 block, VAE 4 block, CLIP hidden 768)
+
+    Args:
+        unet_channels (int): UNet 첫 block 채널 수 (SD1.5는 320)
+        vae_channels (int): VAE 첫 block 채널 수 (SD1.5는 128)
+        text_layers (int): 텍스트 인코더 layer 수 (SD1.5는 12)
+    """
+    torch.manual_seed(seed)
+    tokenizer = build_tiny_tokenizer()
+    text_encoder = CLIPTextModel(CLIPTextConfig(
+        vocab_size=len(tokenizer),
+        hidden_size=768,
+        intermediate_size=3072,
+        num_hidden_layers=text_layers,
+        num_attention_heads=12,
+        max_position_embeddings=77,
+        bos_token_id=tokenizer.bos_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+        pad_token_id=tokenizer.pad_token_id
+    ))
+    unet = UNet2DConditionModel(
+        sample_size=64,
+        block_out_channels=(unet_channels, unet_channels * 2, unet_channels * 4, unet_channels * 4),
+        layers_per_block=1,
+        cross_attention_dim=768,
+        attention_head_dim=8
+    )
+    vae = AutoencoderKL(
+        block_out_channels=(vae_channels, vae_channels * 2, vae_channels * 4, vae_channels * 4),
+        down_block_types=("DownEncoderBlock2D",) * 4,
+        up_block_types=("UpDecoderBlock2D",) * 4,
+        latent_channels=4,
+        layers_per_block=2,
+        sample_size=512
+    )
+    pipe = StableDiffusionPipeline(
+        vae=vae,
+        text_encoder=text_encoder,
+        tokenizer=tokenizer,
+        unet=unet,
+        scheduler=DDIMScheduler(),
+        safety_checker=None,
+        feature_extractor=None,
+        requires_safety_checker=False
+    )
+    pipe.set_progress_bar_config(disable=True)
+    return pipe.to("cpu")
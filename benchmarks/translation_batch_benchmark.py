@@ -0,0 +1,136 @@
+"""
+MarianTranslator 문장 batch 번역 벤치마크 (CPU, opus-mt 크기의 random-weight Marian 모델)
+
+--sentences 문장짜리 일기를 batch 크기(--batch-sizes)와 길이 정렬 여부별로 번역해 초당 번역 문장 수를 출력하고,
+결과가 문장마다 따로 번역한 것(batch 크기 1)과 같은지 확인한다. 모델 다운로드 없이 실행하기 위해
+단어 단위 tokenizer와 random-weight 모델을 쓰며, 실제 번역처럼 문장마다 번역 길이가 달라지도록
+원문 토큰 수 × --length-ratio에서 EOS가 나오게 한다 (batch는 가장 긴 번역이 끝날 때까지 generate를 계속함).
+
+사용법:
+    python -m benchmarks.translation_batch_benchmark --sentences 30 --batch-sizes 1,4,8,16
+"""
+import argparse
+import functools
+import random
+import time
+
+import torch
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+from tokenizers.processors import TemplateProcessing
+from transformers import LogitsProcessor, LogitsProcessorList, MarianConfig, MarianMTModel, PreTrainedTokenizerFast
+
+from translator.marian_translator import MarianTranslator
+
+WORDS = ["오늘", "나는", "친구와", "공원에", "갔다", "비가", "왔다", "강아지가", "뛰어", "놀았다", "엄마가", "맛있는",
+         "저녁을", "만들어", "주셨다", "학교에서", "그림을", "그렸다", "내일은", "소풍을", "간다", "정말", "기쁘다"]
+
+
+def build_diary(sentences: int, seed: int = 0) -> str:
+    """길이(3~24 단어)가 제각각인 문장으로 만든 일기"""
+    rng = random.Random(seed)
+    return " ".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 24))) + rng.choice([".", "!", "?"])
+        for _ in range(sentences)
+    )
+
+
+class SourceLengthEos(LogitsProcessor):
+    """원문 길이 × ratio 번째 토큰까지는 EOS를 막고, 그 뒤에는 EOS만 허용 (beam은 batch 행마다 num_beams개씩)"""
+
+    def __init__(self, source_lengths: torch.Tensor, ratio: float, num_beams: int, eos_token_id: int):
+        self.target_lengths = (source_lengths.float() * ratio).round().long().repeat_interleave(num_beams)
+        self.eos_token_id = eos_token_id
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        done = (input_ids.shape[1] >= self.target_lengths).unsqueeze(1)
+        eos = torch.zeros_like(scores, dtype=torch.bool)
+        eos[:, self.eos_token_id] = True
+        return scores.masked_fill(done & ~eos, float("-inf")).masked_fill(~done & eos, float("-inf"))
+
+
+def generate_with_source_length(generate, length_ratio: float, num_beams: int, eos_token_id: int, **inputs):
+    processor = SourceLengthEos(inputs["attention_mask"].sum(dim=1), length_ratio, num_beams, eos_token_id)
+    return generate(**inputs, logits_processor=LogitsProcessorList([processor]))
+
+
+def build_tiny_translator(length_ratio: float, max_new_tokens: int, num_beams: int, seed: int = 0) -> MarianTranslator:
+    """opus-mt-ko-en과 같은 크기(6+6 layer, d_model 512)의 random-weight Marian 번역기"""
+    torch.manual_seed(seed)
+    vocab = {token: i for i, token in enumerate(["<pad>", "</s>", "<unk>", ".", "!", "?", *WORDS])}
+    tokenizer_object = Tokenizer(WordLevel(vocab, unk_token="<unk>"))
+    tokenizer_object.pre_tokenizer = Whitespace()
+    tokenizer_object.post_processor = TemplateProcessing(single="$A </s>", special_tokens=[("</s>", vocab["</s>"])])
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer_object, pad_token="<pad>", eos_token="</s>", unk_token="<unk>", model_max_length=512
+    )
+
+    model = MarianMTModel(MarianConfig(
+        vocab_size=len(vocab),
+        d_model=512,
+        encoder_layers=6,
+        decoder_layers=6,
+        encoder_attention_heads=8,
+        decoder_attention_heads=8,
+        encoder_ffn_dim=2048,
+        decoder_ffn_dim=2048,
+        pad_token_id=vocab["<pad>"],
+        eos_token_id=vocab["</s>"],
+        decoder_start_token_id=vocab["<pad>"]
+    )).eval()
+    model.generation_config.num_beams = num_beams
+    model.generation_config.max_new_tokens = max_new_tokens
+    model.generation_config.bad_words_ids = [[vocab["<pad>"]]]
+
+    translator = MarianTranslator.__new__(MarianTranslator)
+    translator.model_name = "random-marian"
+    translator.tokenizer = tokenizer
+    translator.model = model
+    model.generate = functools.partial(
+        generate_with_source_length, model.generate, length_ratio, num_beams, vocab["</s>"]
+    )
+    return translator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MarianTranslator batch 크기/길이 정렬별 번역 속도 비교")
+    parser.add_argument("--sentences", type=int, default=30)
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    parser.add_argument("--num-beams", type=int, default=4, help="opus-mt 기본값과 같은 beam 수")
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--length-ratio", type=float, default=1.2, help="원문 토큰 수 대비 번역 토큰 수")
+    parser.add_argument("--repeat", type=int, default=2, help="설정마다 반복 횟수 (가장 빠른 결과 사용)")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    translator = build_tiny_translator(args.length_ratio, args.max_new_tokens, args.num_beams)
+    diary = build_diary(args.sentences)
+    sentences = translator.split_sentences(diary)
+    # 워밍업
+    translator.batch_size, translator.sort_by_length = 1, False
+    translator.translate_sentences(sentences[:2])
+
+    print(f"{len(sentences)} sentences, {args.num_beams} beams, {torch.get_num_threads()} torch threads")
+    print(f"{'batch':>5} {'sorted':>6} {'sentences/s':>12} {'speedup':>8}  identical")
+    baseline_rate = None
+    baseline_text = None
+    for batch_size in (int(value) for value in args.batch_sizes.split(",")):
+        for sort_by_length in ((False,) if batch_size == 1 else (False, True)):
+            translator.batch_size, translator.sort_by_length = batch_size, sort_by_length
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                text = translator.translate_text(diary)
+                timings.append(time.perf_counter() - start)
+            rate = len(sentences) / min(timings)
+            if baseline_rate is None:
+                baseline_rate, baseline_text = rate, text
+            print(f"{batch_size:>5} {str(sort_by_length):>6} {rate:>12.2f} {rate / baseline_rate:>7.2f}x  {text == baseline_text}")
+
+
+if __name__ == "__main__":
+    main()
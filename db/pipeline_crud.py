@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from .pipeline_models import PipelineResult, DatabaseEngine
+from .pipeline_models import PipelineResult, PipelineSceneImageVariant, DatabaseEngine
 
 class PipelineCRUD:
     """CRUD operations for pipeline data"""
@@ -40,6 +41,61 @@ class PipelineCRUD:
 
         db.commit()
 
+    def save_scene_image_urls(
+        self,
+        db: Session,
+        rows: List[Tuple[str, int, str, Optional[Dict[str, str]]]]
+    ) -> None:
+        """
+        Save or update several scene image URLs in one transaction.
+
+        Args:
+            rows: (pipeline_id, scene_number, image_url, variant_urls) tuples, possibly from different pipelines.
+                  variant_urls maps extra image sizes (e.g. "thumbnail") to their URLs, or is None.
+        """
+        now = datetime.utcnow()
+
+        for pipeline_id, scene_number, image_url, variant_urls in rows:
+            result = (
+                db.query(PipelineResult)
+                .filter_by(pipeline_id=pipeline_id, scene_number=scene_number)
+                .first()
+            )
+
+            if result:
+                result.scene_image_url = image_url
+            else:
+                db.add(PipelineResult(
+                    pipeline_id=pipeline_id,
+                    scene_number=scene_number,
+                    scene_image_url=image_url,
+                    created_at=now
+                ))
+
+            # IMAGE_VARIANTS를 쓰지 않으면 variant 테이블은 건드리지 않음
+            if variant_urls:
+                existing = {
+                    variant.variant: variant
+                    for variant in db.query(PipelineSceneImageVariant)
+                    .filter_by(pipeline_id=pipeline_id, scene_number=scene_number)
+                }
+                for name, url in variant_urls.items():
+                    if name in existing:
+                        existing[name].image_url = url
+                    else:
+                        db.add(PipelineSceneImageVariant(
+                            pipeline_id=pipeline_id,
+                            scene_number=scene_number,
+                            variant=name,
+                            image_url=url,
+                            created_at=now
+                        ))
+
+            # 같은 batch 안에서 같은 장면이 다시 나오면 위 조회에서 찾을 수 있도록 반영
+            db.flush()
+
+        db.commit()
+
     def save_scene_story(
         self,
         db: Session,
@@ -71,6 +127,42 @@ class PipelineCRUD:
 
         db.commit()
     
+    def save_scene_stories(
+        self,
+        db: Session,
+        pipeline_id: str,
+        stories: List[Tuple[int, str]]
+    ) -> None:
+        """
+        Save or update the scene stories (Korean translations) of one pipeline in one transaction.
+
+        Args:
+            stories: (scene_number, scene_story) tuples.
+        """
+        now = datetime.utcnow()
+        existing = {
+            result.scene_number: result
+            for result in db.query(PipelineResult).filter(
+                PipelineResult.pipeline_id == pipeline_id,
+                PipelineResult.scene_number.in_([scene_number for scene_number, _ in stories])
+            )
+        }
+
+        for scene_number, scene_story in stories:
+            result = existing.get(scene_number)
+            if result:
+                result.scene_story = scene_story
+            else:
+                existing[scene_number] = PipelineResult(
+                    pipeline_id=pipeline_id,
+                    scene_number=scene_number,
+                    scene_story=scene_story,
+                    created_at=now
+                )
+                db.add(existing[scene_number])
+
+        db.commit()
+
     def save_mood(
             
         self,
@@ -111,12 +203,17 @@ class PipelineCRUD:
             .all()
         )
 
+        variants: Dict[int, Dict[str, str]] = {}
+        for variant in db.query(PipelineSceneImageVariant).filter_by(pipeline_id=pipeline_id):
+            variants.setdefault(variant.scene_number, {})[variant.variant] = variant.image_url
+
         page_list = [
             {
                 "pageIndex": result.scene_number,
                 "mood": result.mood,
                 "story": result.scene_story,
-                "imageUrl": result.scene_image_url
+                "imageUrl": result.scene_image_url,
+                "imageVariants": variants.get(result.scene_number, {})
             }
             for result in results
         ]
@@ -19,6 +19,23 @@ class PipelineResult(Base):
         PrimaryKeyConstraint('pipeline_id', 'scene_number', name='pipeline_scene_pk'),
     )
 
+class PipelineSceneImageVariant(Base):
+    """
+    원본 외 장면 이미지 버전(썸네일, 모바일 등)의 URL
+    pipeline_result에 컬럼을 추가하지 않고 별도 테이블로 두어, 기존 DB에서도 create_all로 생성됨
+    """
+    __tablename__ = "pipeline_scene_image_variant"
+
+    pipeline_id = Column(String(64), nullable=False)
+    scene_number = Column(Integer, nullable=False)
+    variant = Column(String(50), nullable=False)
+    image_url = Column(String(2048), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('pipeline_id', 'scene_number', 'variant', name='pipeline_scene_variant_pk'),
+    )
+
 class DatabaseEngine:
     """Database engine and session management"""
 
@@ -1,10 +1,12 @@
 from emotion_classifier.emotion_classifier_interface import EmotionClassifierInterface
-from emotion_classifier.minilm_classifier import MiniLMClassifier
+from model_registry.plugin_registry import LazyPluginRegistry
+
+# 다른 분류기 추가 가능 (예: 'bert', 'roberta')
+EMOTION_CLASSIFIERS = LazyPluginRegistry({
+    "minilm": "emotion_classifier.minilm_classifier:MiniLMClassifier",
+}, error_message="Unsupported classifier type: {name}")
 
 class EmotionClassifierSelector:
     @staticmethod
     def get_emotion_classifier(classifier_type: str = 'minilm', **kwargs) -> EmotionClassifierInterface:
-        if classifier_type == 'minilm':
-            return MiniLMClassifier(**kwargs)
-        # 다른 분류기 추가 가능 (예: 'bert', 'roberta')
-        raise ValueError(f"Unsupported classifier type: {classifier_type}")
\ No newline at end of file
+        return EMOTION_CLASSIFIERS.create(classifier_type, **kwargs)
@@ -0,0 +1,602 @@
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+import torch
+from diffusers import DPMSolverMultistepScheduler, UniPCMultistepScheduler
+from diffusers.utils import is_accelerate_available
+from PIL import Image
+from prometheus_client import Counter
+
+from image_maker.image_cache import ImageCache
+from image_maker.preview_publisher import PreviewPublisher
+from image_maker.prompt_embedding_cache import PromptEmbeddingCache
+from image_maker.inference_profiles import get_inference_profile
+from image_maker.memory_saver import MEMORY_SAVER_AUTO, choose_memory_saver, get_memory_saver
+from image_maker.image_maker_interface import ImageMakerInterface
+
+NSFW_RETRY_STRATEGIES = ("serial", "parallel")
+
+# 장면별 NSFW 판정 결과 (safe: 첫 생성에서 통과 / retried: 재생성으로 통과 / unsafe: 재생성 후에도 판정됨)
+IMAGE_NSFW_OUTCOMES = Counter(
+    "image_nsfw_outcomes_total",
+    "Generated scenes by NSFW retry outcome",
+    ["strategy", "outcome"]
+)
+# NSFW 재생성으로 만든 후보 이미지 수
+IMAGE_NSFW_CANDIDATES = Counter(
+    "image_nsfw_candidates_total",
+    "Images generated to replace NSFW-flagged scenes",
+    ["strategy"]
+)
+
+
+class DiffusionImageMaker(ImageMakerInterface):
+    """
+    diffusers 파이프라인(self.pipe) 기반 이미지 생성기의 공통 부분
+
+    - generate_images: 여러 장면의 프롬프트를 파이프라인의 batch 차원으로 묶어 한 번에 생성
+      (step마다 UNet forward가 장면 수만큼이 아니라 batch 수만큼만 실행됨)
+    - batch 크기를 지정하지 않으면 남은 GPU/RAM 메모리로 자동 결정
+    - 한 장면의 실패가 다른 장면에 영향을 주지 않도록, batch가 실패하면 반으로 나눠 다시 시도하고
+      끝내 실패한 장면만 None으로 반환
+    - NSFW로 판정된 장면만 다시 모아 max_nsfw_attempts까지 재생성 (seed를 준 장면은 시도마다 seed + 시도 번호)
+      serial: 한 번에 한 후보씩 다시 생성 / parallel: 남은 시도 수만큼의 후보를 한 batch로 생성해 첫 번째 안전한 이미지 사용
+      (두 방식 모두 같은 seed 순서로 고르므로 seed를 준 장면의 결과는 같음)
+    - image_cache가 설정돼 있으면 seed를 준 장면은 생성 조건이 같을 때 캐시된 이미지를 재사용
+    - prompt_embedding_cache가 설정돼 있으면 프롬프트/negative prompt의 텍스트 인코더 출력을 재사용 (SD1.5 계열만)
+    - preview_publisher가 설정돼 있고 장면에 미리보기 키가 있으면 callback_on_step_end로 중간 미리보기를 보냄
+      (설정이 없으면 callback 자체를 넘기지 않아 추가 비용 없음). NSFW로 판정된 장면은 미리보기를 회수하고
+      재생성 후보의 미리보기는 보내지 않음
+    - inference profile(draft / standard / quality)로 스케줄러, step 수, guidance scale 등을 바꿔 속도와 품질을 조절
+    - pipelined_decode면 UNet은 latent까지만 만들고(output_type="latent"), VAE 디코드/safety checker/PIL 변환과
+      on_image 콜백(업로드용 인코딩 등)은 디코드 스레드에서 처리해 다음 batch의 denoising과 겹침 (SD1.5 계열만)
+    - memory saver(off / balanced / low, auto는 남은 메모리로 선택)로 VAE slicing/tiling, UNet 저정밀도 저장 등을 적용
+
+    하위 클래스는 __init__에서 super().__init__()을 호출하고 self.pipe, self.device를 설정한다.
+    """
+
+    negative_prompt = "low quality, blurry"
+    num_inference_steps = 25
+    # None이면 파이프라인 기본값
+    guidance_scale: Optional[float] = None
+    # 현재 적용된 inference profile (None이면 모델 기본 설정)
+    inference_profile: Optional[str] = None
+    # generate_images에 profile을 주지 않았을 때 쓸 profile (None이면 모델 기본 설정)
+    default_inference_profile: Optional[str] = None
+    # 적용된 memory saver 단계 (None이면 적용 전)
+    memory_saver: Optional[str] = None
+    # NSFW로 판정됐을 때 포함한 총 생성 시도 횟수 (1이면 재생성하지 않음)
+    max_nsfw_attempts = 1
+    # NSFW 재생성 방식 (serial / parallel)
+    nsfw_retry_strategy = "serial"
+    # denoising과 VAE 디코드를 겹쳐 실행할지 여부, 디코드를 기다리는 latent batch 최대 수
+    pipelined_decode = False
+    pipelined_decode_max_pending = 2
+    # 생성 해상도 (None이면 파이프라인 기본값)
+    height: Optional[int] = None
+    width: Optional[int] = None
+
+    # 자동 batch 크기 계산: 이미지 한 장의 추정 메모리 = 픽셀 수 × dtype 크기 × 계수, 남은 메모리 중 사용할 비율
+    memory_bytes_per_pixel_element = 1536
+    memory_headroom = 0.8
+    max_batch_size = 8
+
+    # 생성 결과 캐시 (seed를 지정한 장면에만 사용)
+    image_cache: Optional[ImageCache] = None
+    # 텍스트 인코더 출력 캐시
+    prompt_embedding_cache: Optional[PromptEmbeddingCache] = None
+    # 중간 미리보기 전송 (None이면 사용 안 함)
+    preview_publisher: Optional[PreviewPublisher] = None
+    # 생성 중인 호출의 장면별 미리보기 키, 디코드 직후 콜백 (_generate_lock 안에서만 설정)
+    _preview_keys: Optional[List[Optional[str]]] = None
+    _on_image: Optional[Callable[[int, Image.Image], None]] = None
+
+    def __init__(self):
+        # 스케줄러는 호출 중 상태를 가지므로 같은 파이프라인을 여러 스레드가 동시에 쓰지 않도록 생성 전체를 직렬화
+        # (파이프라인마다 따로 잠가 서로 다른 생성기는 동시에 생성할 수 있음)
+        self._generate_lock = threading.RLock()
+
+    @classmethod
+    def from_pipe(cls, pipe):
+        """이미 로드한 파이프라인으로 생성 (모델 다운로드 없이 테스트/벤치마크, 파이프라인 공유용)"""
+        image_maker = cls.__new__(cls)
+        DiffusionImageMaker.__init__(image_maker)
+        image_maker.pipe = pipe
+        image_maker.device = pipe.device
+        return image_maker
+
+    def _pipe_kwargs(self) -> Dict[str, Any]:
+        """파이프라인 호출 시 프롬프트 외에 넘길 인자"""
+        kwargs = {"num_inference_steps": self.num_inference_steps}
+        if self.guidance_scale is not None:
+            kwargs["guidance_scale"] = self.guidance_scale
+        if self.height and self.width:
+            kwargs.update(height=self.height, width=self.width)
+        return kwargs
+
+    def _make_scheduler(self, kind: Optional[str], default_scheduler):
+        if kind is None:
+            return default_scheduler
+        if kind == "dpm_solver_pp":
+            return DPMSolverMultistepScheduler.from_config(
+                default_scheduler.config, algorithm_type="dpmsolver++", solver_order=2, use_karras_sigmas=True
+            )
+        if kind == "unipc":
+            return UniPCMultistepScheduler.from_config(default_scheduler.config)
+        raise ValueError(f"지원되지 않는 스케줄러: {kind}")
+
+    def apply_inference_profile(self, name: Optional[str]) -> None:
+        """
+        inference profile 적용 (None이면 모델 기본 설정으로 되돌림)
+        torch.compile은 한 번 적용하면 되돌리지 않음
+        """
+        if name == self.inference_profile:
+            return
+        with self._generate_lock:
+            if not hasattr(self, "_default_settings"):
+                self._default_settings = (self.pipe.scheduler, self.num_inference_steps, self.guidance_scale)
+            default_scheduler, default_steps, default_guidance = self._default_settings
+
+            if name is None:
+                self.pipe.scheduler = default_scheduler
+                self.num_inference_steps, self.guidance_scale = default_steps, default_guidance
+                channels_last, compile_unet = False, False
+            else:
+                profile = get_inference_profile(name)
+                self.pipe.scheduler = self._make_scheduler(profile.scheduler, default_scheduler)
+                self.num_inference_steps, self.guidance_scale = profile.num_inference_steps, profile.guidance_scale
+                channels_last, compile_unet = profile.channels_last, profile.compile_unet
+
+            # CPU/CUDA 전용 최적화 (MPS는 지원이 불안정해 적용하지 않음)
+            if self.device.type != "mps":
+                memory_format = torch.channels_last if channels_last else torch.contiguous_format
+                self.pipe.unet.to(memory_format=memory_format)
+                if compile_unet and not getattr(self, "_unet_compiled", False):
+                    self.pipe.unet = torch.compile(self.pipe.unet)
+                    self._unet_compiled = True
+            self.inference_profile = name
+
+    def apply_memory_saver(self, name: str = MEMORY_SAVER_AUTO) -> str:
+        """
+        memory saver 적용 (auto면 남은 메모리로 단계 선택). 가중치 저장 방식을 바꾸므로 한 번만 적용하고,
+        이미 적용했으면 아무것도 하지 않음
+
+        Returns:
+            str: 적용된 단계
+        """
+        with self._generate_lock:
+            if self.memory_saver is not None:
+                return self.memory_saver
+            if name == MEMORY_SAVER_AUTO:
+                name = choose_memory_saver(self._available_memory_bytes(), self._per_image_bytes())
+            settings = get_memory_saver(name)
+
+            # CPU/CUDA의 SDPA는 이미 메모리 효율적인 attention이라 slicing은 느려지기만 함
+            if settings.attention_slicing and (
+                self.device.type == "mps" or not hasattr(torch.nn.functional, "scaled_dot_product_attention")
+            ):
+                self.pipe.enable_attention_slicing()
+            if settings.vae_slicing:
+                self.pipe.vae.enable_slicing()
+            if settings.vae_tile_size:
+                self.pipe.vae.enable_tiling()
+                self.pipe.vae.tile_sample_min_size = settings.vae_tile_size
+                self.pipe.vae.tile_latent_min_size = settings.vae_tile_size // self.pipe.vae_scale_factor
+            if settings.reduce_weight_precision:
+                # fp16으로 계산하는 CUDA는 fp8로, fp32로 계산하는 CPU/MPS는 bf16으로 저장 (정규화 layer 등은 diffusers가 제외)
+                compute_dtype = self.pipe.unet.dtype
+                if compute_dtype == torch.float16:
+                    storage_dtype = getattr(torch, "float8_e4m3fn", None)
+                else:
+                    storage_dtype = torch.bfloat16
+                if storage_dtype is not None:
+                    self.pipe.unet.enable_layerwise_casting(storage_dtype=storage_dtype, compute_dtype=compute_dtype)
+            if settings.sequential_cpu_offload and self.device.type == "cuda" and is_accelerate_available():
+                self.pipe.enable_sequential_cpu_offload(device=self.device)
+            if settings.max_batch_size is not None:
+                self.max_batch_size = min(self.max_batch_size, settings.max_batch_size)
+
+            self.memory_saver = name
+            return name
+
+    def _resolution(self):
+        if self.height and self.width:
+            return self.height, self.width
+        sample_size = self.pipe.unet.config.sample_size * self.pipe.vae_scale_factor
+        return sample_size, sample_size
+
+    def _available_memory_bytes(self) -> int:
+        if self.device.type == "cuda":
+            free_bytes, _ = torch.cuda.mem_get_info(self.device)
+            return free_bytes
+        # CPU와 MPS(통합 메모리)는 시스템 RAM 기준
+        return psutil.virtual_memory().available
+
+    def _per_image_bytes(self) -> int:
+        """이미지 한 장을 생성할 때 쓰는 추정 메모리"""
+        height, width = self._resolution()
+        return height * width * self.pipe.unet.dtype.itemsize * self.memory_bytes_per_pixel_element
+
+    def auto_batch_size(self) -> int:
+        """남은 메모리로 한 번에 생성할 장면 수 결정"""
+        batch_size = int(self._available_memory_bytes() * self.memory_headroom // self._per_image_bytes())
+        return max(1, min(self.max_batch_size, batch_size))
+
+    def model_id(self) -> str:
+        """캐시 키에 쓰는 모델 식별자 (가중치를 바꿔 끼우는 생성기는 재정의)"""
+        return getattr(self.pipe, "name_or_path", None) or type(self).__name__
+
+    def cache_key(self, prompt: str, seed: int) -> str:
+        """생성 결과에 영향을 주는 조건 전체로 만든 캐시 키"""
+        scheduler_config = {k: v for k, v in self.pipe.scheduler.config.items() if not k.startswith("_")}
+        height, width = self._resolution()
+        return ImageCache.make_key(
+            model=self.model_id(),
+            scheduler=type(self.pipe.scheduler).__name__,
+            scheduler_config=scheduler_config,
+            height=height,
+            width=width,
+            negative_prompt=self.negative_prompt,
+            prompt=prompt,
+            seed=seed,
+            max_nsfw_attempts=self.max_nsfw_attempts,
+            **self._output_settings(),
+            **self._pipe_kwargs()
+        )
+
+    def _output_settings(self) -> Dict[str, Any]:
+        """생성 결과를 바꾸는 memory saver 설정 (적용하지 않았으면 비워 두어 기존 캐시 키 유지)"""
+        if self.memory_saver is None or not get_memory_saver(self.memory_saver).changes_output:
+            return {}
+        return {"memory_saver": self.memory_saver}
+
+    @staticmethod
+    def _generators(seeds: List[Optional[int]]):
+        """장면별 seed로 만든 난수 생성기 (seed가 하나도 없으면 None). CPU 생성기라 장치와 관계없이 재현됨"""
+        if all(seed is None for seed in seeds):
+            return None
+        generators = []
+        for seed in seeds:
+            generator = torch.Generator("cpu")
+            if seed is not None:
+                generator.manual_seed(seed)
+            else:
+                generator.seed()
+            generators.append(generator)
+        return generators
+
+    def _prompt_inputs(self, prompts: List[str]) -> Dict[str, Any]:
+        """프롬프트 인자 (임베딩 캐시를 쓸 수 있으면 prompt_embeds / negative_prompt_embeds)"""
+        negative_prompts = [self.negative_prompt] * len(prompts)
+        # SDXL처럼 텍스트 인코더가 둘이고 pooled 임베딩이 필요한 파이프라인은 텍스트 그대로 전달
+        if self.prompt_embedding_cache is None or getattr(self.pipe, "text_encoder_2", None) is not None:
+            return {"prompt": prompts, "negative_prompt": negative_prompts}
+        namespace = self.model_id()
+        return {
+            "prompt_embeds": self.prompt_embedding_cache.encode(self.pipe, prompts, namespace),
+            "negative_prompt_embeds": self.prompt_embedding_cache.encode(self.pipe, negative_prompts, namespace)
+        }
+
+    def _preview_kwargs(self, preview_keys: Optional[List[Optional[str]]]) -> Dict[str, Any]:
+        if self.preview_publisher is None or not preview_keys or all(key is None for key in preview_keys):
+            return {}
+        return {
+            "callback_on_step_end": self.preview_publisher.step_callback(preview_keys, self.num_inference_steps),
+            "callback_on_step_end_tensor_inputs": ["latents"]
+        }
+
+    def _run_batch(self, prompts: List[str], seeds: List[Optional[int]], preview_keys: Optional[List[Optional[str]]] = None):
+        """
+        프롬프트 묶음을 파이프라인 한 번으로 생성
+
+        Returns:
+            tuple: (이미지 목록, NSFW 판정 목록)
+        """
+        with torch.no_grad():
+            result = self.pipe(
+                **self._prompt_inputs(prompts),
+                generator=self._generators(seeds),
+                **self._preview_kwargs(preview_keys),
+                **self._pipe_kwargs()
+            )
+        # safety_checker가 없으면 nsfw_content_detected가 없거나 None
+        nsfw = getattr(result, "nsfw_content_detected", None) or [False] * len(prompts)
+        return result.images, nsfw
+
+    def _supports_pipelined_decode(self) -> bool:
+        # SDXL은 디코드 전후 처리(VAE upcast, watermark 등)가 달라 제외,
+        # offload hook이 있으면 파이프라인 호출이 모듈을 옮기므로 디코드를 따로 실행하지 않음
+        return (
+            getattr(self.pipe, "text_encoder_2", None) is None
+            and hasattr(self.pipe, "run_safety_checker")
+            and not hasattr(self.pipe.unet, "_hf_hook")
+        )
+
+    def _denoise_batch(self, prompts: List[str], seeds: List[Optional[int]], preview_keys=None) -> torch.Tensor:
+        """VAE 디코드 전까지(latent)만 생성"""
+        with torch.no_grad():
+            return self.pipe(
+                **self._prompt_inputs(prompts),
+                generator=self._generators(seeds),
+                output_type="latent",
+                **self._preview_kwargs(preview_keys),
+                **self._pipe_kwargs()
+            ).images
+
+    def _decode_latents(self, latents: torch.Tensor):
+        """
+        latent batch를 파이프라인과 같은 방식으로 디코드 (VAE -> safety checker -> PIL)
+
+        Returns:
+            tuple: (이미지 목록, NSFW 판정 목록)
+        """
+        with torch.no_grad():
+            decoded = self.pipe.vae.decode(latents / self.pipe.vae.config.scaling_factor, return_dict=False)[0]
+            decoded, nsfw = self.pipe.run_safety_checker(decoded, self.pipe._execution_device, latents.dtype)
+        do_denormalize = [not nsfw_detected for nsfw_detected in nsfw] if nsfw is not None else [True] * len(decoded)
+        images = self.pipe.image_processor.postprocess(decoded, output_type="pil", do_denormalize=do_denormalize)
+        return images, nsfw or [False] * len(images)
+
+    def _generate_isolated(self, prompts: List[str], seeds: List[Optional[int]], preview_keys=None):
+        """
+        batch가 실패하면(OOM 등) 반으로 나눠 다시 시도해, 실패 원인이 된 장면만 None으로 남김
+
+        Returns:
+            tuple: (이미지 또는 None 목록, NSFW 판정 목록)
+        """
+        try:
+            return self._run_batch(prompts, seeds, preview_keys)
+        except Exception as e:
+            if self.device.type == "cuda":
+                torch.cuda.empty_cache()
+            if len(prompts) == 1:
+                print(f"Error in prompt: {e}")
+                return [None], [False]
+            print(f"Batch of {len(prompts)} failed ({e}), splitting...")
+            middle = len(prompts) // 2
+            left_keys, right_keys = (preview_keys[:middle], preview_keys[middle:]) if preview_keys else (None, None)
+            left_images, left_nsfw = self._generate_isolated(prompts[:middle], seeds[:middle], left_keys)
+            right_images, right_nsfw = self._generate_isolated(prompts[middle:], seeds[middle:], right_keys)
+            return list(left_images) + list(right_images), list(left_nsfw) + list(right_nsfw)
+
+    def _generate_rows(self, rows, batch_size: int):
+        """
+        (장면 index, 프롬프트, seed) 목록을 batch_size씩 생성
+
+        Returns:
+            list: (장면 index, 이미지 또는 None, NSFW 판정) 목록
+        """
+        if self.pipelined_decode and self._supports_pipelined_decode():
+            return self._generate_rows_pipelined(rows, batch_size)
+        results = []
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+            preview_keys = [self._preview_keys[row[0]] for row in chunk] if self._preview_keys else None
+            batch_images, batch_nsfw = self._generate_isolated(
+                [row[1] for row in chunk], [row[2] for row in chunk], preview_keys
+            )
+            results += [(row[0], image, nsfw) for row, image, nsfw in zip(chunk, batch_images, batch_nsfw)]
+        return results
+
+    def _generate_rows_pipelined(self, rows, batch_size: int):
+        """
+        _generate_rows와 같지만, 호출 스레드는 batch마다 latent까지만 만들어 대기열(최대 pipelined_decode_max_pending개)에
+        넣고 다음 batch의 denoising을 바로 시작하며, 디코드 스레드가 디코드와 on_image 콜백을 처리
+        """
+        results: Dict[int, tuple] = {}
+        pending: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=self.pipelined_decode_max_pending)
+
+        def decode_loop():
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                start, chunk, latents = item
+                try:
+                    batch_images, batch_nsfw = self._decode_latents(latents)
+                except Exception as e:
+                    print(f"Error in decode: {e}")
+                    batch_images, batch_nsfw = [None] * len(chunk), [False] * len(chunk)
+                for offset, (row, image, nsfw) in enumerate(zip(chunk, batch_images, batch_nsfw)):
+                    results[start + offset] = (row[0], image, nsfw)
+                    if self._on_image is not None and image is not None and not nsfw:
+                        self._on_image(row[0], image)
+
+        decoder = threading.Thread(target=decode_loop, name="image-decode", daemon=True)
+        decoder.start()
+        try:
+            for start in range(0, len(rows), batch_size):
+                chunk = rows[start:start + batch_size]
+                prompts, seeds = [row[1] for row in chunk], [row[2] for row in chunk]
+                preview_keys = [self._preview_keys[row[0]] for row in chunk] if self._preview_keys else None
+                try:
+                    latents = self._denoise_batch(prompts, seeds, preview_keys)
+                except Exception as e:
+                    # 실패한 batch는 기존 방식(반으로 나눠 재시도)으로 생성
+                    print(f"Pipelined batch of {len(chunk)} failed ({e}), generating without pipelining...")
+                    batch_images, batch_nsfw = self._generate_isolated(prompts, seeds, preview_keys)
+                    for offset, (row, image, nsfw) in enumerate(zip(chunk, batch_images, batch_nsfw)):
+                        results[start + offset] = (row[0], image, nsfw)
+                    continue
+                pending.put((start, chunk, latents))
+        finally:
+            pending.put(None)
+            decoder.join()
+        # 행 순서 유지 (parallel NSFW 재생성은 seed 순서로 후보를 고름)
+        return [results[position] for position in range(len(rows))]
+
+    @staticmethod
+    def _attempt_seed(seed: Optional[int], attempt: int) -> Optional[int]:
+        return seed + attempt if seed is not None else None
+
+    def _retry_nsfw_serial(self, prompts, seeds, images, nsfw_indices, batch_size) -> List[int]:
+        """NSFW로 판정된 장면을 시도마다 한 후보씩 다시 생성 (최악의 경우 전체 생성 시간이 시도 횟수배)"""
+        for attempt in range(1, self.max_nsfw_attempts):
+            rows = [(i, prompts[i], self._attempt_seed(seeds[i], attempt)) for i in nsfw_indices]
+            IMAGE_NSFW_CANDIDATES.labels("serial").inc(len(rows))
+            nsfw_indices = []
+            for i, image, nsfw_detected in self._generate_rows(rows, batch_size):
+                images[i] = image
+                if image is not None and nsfw_detected:
+                    nsfw_indices.append(i)
+            if not nsfw_indices:
+                break
+        return nsfw_indices
+
+    def _retry_nsfw_parallel(self, prompts, seeds, images, nsfw_indices, batch_size) -> List[int]:
+        """
+        NSFW로 판정된 장면마다 남은 시도 수만큼의 후보(seed + 1, seed + 2, ...)를 한 batch로 생성하고
+        seed 순서상 첫 번째 안전한 후보를 사용 (모두 판정되면 마지막 후보)
+        """
+        rows = [
+            (i, prompts[i], self._attempt_seed(seeds[i], attempt))
+            for i in nsfw_indices
+            for attempt in range(1, self.max_nsfw_attempts)
+        ]
+        IMAGE_NSFW_CANDIDATES.labels("parallel").inc(len(rows))
+        # 후보도 batch_size 안에서 생성해 메모리 예산을 넘지 않음 (장면 수 × 후보 수가 크면 여러 batch)
+        candidates: Dict[int, List[tuple]] = {}
+        for i, image, nsfw_detected in self._generate_rows(rows, batch_size):
+            candidates.setdefault(i, []).append((image, nsfw_detected))
+
+        remaining = []
+        for i in nsfw_indices:
+            safe = [image for image, nsfw_detected in candidates[i] if image is not None and not nsfw_detected]
+            if safe:
+                images[i] = safe[0]
+                continue
+            # serial과 같이 마지막 시도 결과를 반환
+            images[i] = candidates[i][-1][0]
+            if images[i] is not None:
+                remaining.append(i)
+        return remaining
+
+    def generate_images(
+        self,
+        prompts: List[str],
+        batch_size: Optional[int] = None,
+        seeds: Optional[List[Optional[int]]] = None,
+        profile: Optional[str] = None,
+        preview_keys: Optional[List[Optional[str]]] = None,
+        on_image: Optional[Callable[[int, Image.Image], None]] = None
+    ) -> List[Optional[Image.Image]]:
+        """
+        여러 프롬프트를 batch로 묶어 생성
+
+        Args:
+            prompts (list): 장면별 프롬프트
+            batch_size (int, optional): 한 번에 생성할 장면 수 (생략 시 남은 메모리로 자동 결정, 어느 쪽이든 max_batch_size 이하)
+            seeds (list, optional): 장면별 seed (None인 장면은 매번 다른 결과, 캐시 사용 안 함)
+            profile (str, optional): 이번 호출에 적용할 inference profile (생략 시 default_inference_profile,
+                이전 호출의 profile이 남지 않도록 호출마다 적용)
+            preview_keys (list, optional): 장면별 미리보기 키 "{pipeline id}:{장면 번호}" (None인 장면은 보내지 않음)
+            on_image (callable, optional): pipelined_decode일 때 디코드 스레드에서 NSFW가 아닌 장면마다 최대 한 번
+                (장면 index, 반환될 이미지)로 호출 (캐시 hit, 재시도 등으로 호출되지 않을 수 있으므로 반환된 이미지와
+                같은 객체인지 확인해서 사용, 콜백의 예외는 출력만 하고 생성은 계속)
+
+        Returns:
+            list: 프롬프트 순서대로의 이미지. 생성에 실패한 장면은 None
+        """
+        with self._generate_lock:
+            self.apply_inference_profile(profile if profile is not None else self.default_inference_profile)
+            # NSFW로 판정된 장면은 미리보기 키를 지우므로 복사해서 사용
+            self._preview_keys = list(preview_keys) if preview_keys else None
+            self._on_image = self._once_per_scene(on_image) if on_image is not None else None
+            try:
+                return self._generate_images(prompts, batch_size, seeds)
+            finally:
+                self._preview_keys = None
+                self._on_image = None
+                if self.preview_publisher is not None and preview_keys:
+                    for key in preview_keys:
+                        if key is not None:
+                            self.preview_publisher.forget(key)
+
+    @staticmethod
+    def _once_per_scene(on_image: Callable[[int, Image.Image], None]) -> Callable[[int, Image.Image], None]:
+        """
+        장면마다 첫 번째 안전한 이미지로만 on_image 호출 (parallel NSFW 재생성은 한 장면의 안전한 후보가 여러 개일 수 있지만
+        seed 순서상 첫 후보를 사용하고, 디코드도 같은 순서라 첫 호출 이미지가 반환될 이미지)
+        """
+        delivered = set()
+
+        def deliver(i: int, image: Image.Image) -> None:
+            if i in delivered:
+                return
+            delivered.add(i)
+            try:
+                on_image(i, image)
+            except Exception as e:
+                # 디코드 스레드가 멈추지 않도록 콜백 실패는 출력만 함
+                print(f"Error in on_image for scene {i + 1}: {e}")
+
+        return deliver
+
+    def _retract_previews(self, indices: List[int]) -> None:
+        """NSFW로 판정된 장면의 미리보기를 회수하고, 이번 호출의 나머지(재생성 후보)는 미리보기를 보내지 않음"""
+        if self.preview_publisher is None or not self._preview_keys:
+            return
+        for i in indices:
+            if self._preview_keys[i] is not None:
+                self.preview_publisher.retract(self._preview_keys[i])
+                self._preview_keys[i] = None
+
+    def _generate_images(self, prompts, batch_size, seeds) -> List[Optional[Image.Image]]:
+        seeds = list(seeds) if seeds is not None else [None] * len(prompts)
+        images: List[Optional[Image.Image]] = [None] * len(prompts)
+        cache_keys: List[Optional[str]] = [None] * len(prompts)
+        pending = []
+        for i, (prompt, seed) in enumerate(zip(prompts, seeds)):
+            if self.image_cache is not None and seed is not None:
+                cache_keys[i] = self.cache_key(prompt, seed)
+                images[i] = self.image_cache.get(cache_keys[i])
+            if images[i] is None:
+                pending.append(i)
+        if not pending:
+            return images
+
+        # 지정한 batch 크기도 memory saver 등이 정한 max_batch_size를 넘지 않음
+        auto = not batch_size
+        batch_size = min(batch_size or self.auto_batch_size(), self.max_batch_size)
+        if auto and self.pipelined_decode:
+            # batch가 하나뿐이면 겹칠 denoising이 없으므로 최소 두 batch로 나눔
+            batch_size = min(batch_size, max(1, (len(pending) + 1) // 2))
+        flagged = []
+        for i, image, nsfw_detected in self._generate_rows([(i, prompts[i], seeds[i]) for i in pending], batch_size):
+            images[i] = image
+            if image is not None and nsfw_detected:
+                flagged.append(i)
+        self._retract_previews(flagged)
+
+        nsfw_indices = flagged
+        if flagged and self.max_nsfw_attempts > 1:
+            print(f"NSFW content detected in {len(flagged)} scene(s), regenerating ({self.nsfw_retry_strategy})...")
+            if self.nsfw_retry_strategy == "parallel":
+                nsfw_indices = self._retry_nsfw_parallel(prompts, seeds, images, flagged, batch_size)
+            elif self.nsfw_retry_strategy == "serial":
+                nsfw_indices = self._retry_nsfw_serial(prompts, seeds, images, flagged, batch_size)
+            else:
+                raise ValueError(f"지원되지 않는 NSFW 재생성 방식: {self.nsfw_retry_strategy} (가능한 값: {NSFW_RETRY_STRATEGIES})")
+        if nsfw_indices:
+            print("Max NSFW retries reached, returning last generated images.")
+
+        strategy = self.nsfw_retry_strategy
+        IMAGE_NSFW_OUTCOMES.labels(strategy, "safe").inc(sum(1 for i in pending if images[i] is not None and i not in flagged))
+        IMAGE_NSFW_OUTCOMES.labels(strategy, "retried").inc(sum(1 for i in flagged if images[i] is not None and i not in nsfw_indices))
+        IMAGE_NSFW_OUTCOMES.labels(strategy, "unsafe").inc(len(nsfw_indices))
+
+        # NSFW 재시도 끝에도 판정된 이미지는 캐시하지 않음
+        if self.image_cache is not None:
+            for i, cache_key in enumerate(cache_keys):
+                if cache_key is not None and images[i] is not None and i not in nsfw_indices:
+                    self.image_cache.put(cache_key, images[i])
+
+        return images
+
+    def generate_image(self, prompt: str, seed: Optional[int] = None, profile: Optional[str] = None) -> Image.Image:
+        image = self.generate_images([prompt], batch_size=1, seeds=[seed], profile=profile)[0]
+        if image is None:
+            raise RuntimeError("이미지 생성 실패")
+        return image
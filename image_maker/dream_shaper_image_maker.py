@@ -1,11 +1,14 @@
 import torch
 from diffusers import StableDiffusionPipeline
-from PIL import Image
-from image_maker.image_maker_interface import ImageMakerInterface
+from image_maker.diffusion_image_maker import DiffusionImageMaker
 
 
-class DreamShaperImageMaker(ImageMakerInterface):
+class DreamShaperImageMaker(DiffusionImageMaker):
+    negative_prompt = "low quality, blurry, nsfw"
+    max_nsfw_attempts = 3
+
     def __init__(self, model_name='Lykon/dreamshaper-8'):
+        super().__init__()
         # 디바이스 설정
         if torch.cuda.is_available():
             self.device = torch.device("cuda")
@@ -20,31 +23,3 @@ class DreamShaperImageMaker(ImageMakerInterface):
         # DreamShaper 모델 로드
         self.pipe = StableDiffusionPipeline.from_pretrained(model_name, torch_dtype=dtype)
         self.pipe = self.pipe.to(self.device)
-
-    def generate_image(self, prompt: str) -> Image.Image:
-        max_attempts = 3
-        attempt = 0
-
-        while attempt < max_attempts:
-            with torch.no_grad():
-                result = self.pipe(
-                    prompt,
-                    negative_prompt="low quality, blurry, nsfw",
-                    num_inference_steps=25
-                )
-                image = result.images[0]
-
-                # NSFW 체크 (diffusers의 safety_checker가 결과에 NSFW 판단 여부 포함)
-                if hasattr(result, 'nsfw_content_detected'):
-                    nsfw_detected = result.nsfw_content_detected[0]
-                else:
-                    nsfw_detected = False  # safety_checker 없으면 false로 간주
-
-                if nsfw_detected:
-                    print(f"NSFW content detected on attempt {attempt + 1}, regenerating...")
-                    attempt += 1
-                else:
-                    return image
-
-        print("Max NSFW retries reached, returning last generated image.")
-        return image
@@ -0,0 +1,180 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+from prometheus_client import Histogram
+
+from image_maker.image_maker_interface import ImageMakerInterface
+
+# 한 번의 diffusion 호출로 묶인 장면 수
+IMAGE_BATCH_SIZE = Histogram(
+    "image_batch_size",
+    "Number of scenes rendered in one batched diffusion call",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16)
+)
+
+
+class DynamicImageBatcher:
+    """
+    여러 파이프라인에서 동시에 들어오는 이미지 생성 요청을 모아 한 번의 batch로 생성하는 동적 batcher
+
+    - 요청 스레드는 submit으로 프롬프트를 넣고 Future를 받음 (장면별 step이 각자 자기 결과를 기다림)
+    - 첫 요청이 들어온 뒤 max_batch_size가 차거나 max_wait_seconds가 지나면 generate_images 한 번으로 생성
+    - 생성된 이미지는 요청 순서대로 각 Future에 돌려주므로 파이프라인/장면 매핑은 호출 측에 그대로 남음
+    - inference profile이나 그림체(style)가 다른 요청은 같은 batch 안에서 (profile, style)별로 나눠 생성
+    - preview_key가 있는 요청은 생성기에 미리보기 키로 넘김 (생성기에 preview_publisher가 있을 때만 전송)
+    - 생성기가 pipelined_decode면 batch를 최소 두 sub-batch로 나누고 요청별 on_image(이미지)를 디코드 스레드에서 호출해,
+      앞 sub-batch의 디코드와 on_image(인코딩/업로드 등)가 다음 sub-batch의 denoising과 겹침
+    """
+
+    def __init__(
+        self,
+        get_image_maker: Callable[[], ImageMakerInterface],
+        max_batch_size: int = 8,
+        max_wait_seconds: float = 0.2
+    ):
+        """
+        Args:
+            get_image_maker: batch마다 호출해 생성기를 가져오는 함수 (모델 레지스트리 조회 등)
+            max_batch_size (int): 한 번에 생성할 최대 장면 수
+            max_wait_seconds (float): 첫 요청 이후 batch를 채우기 위해 기다리는 최대 시간(초)
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size는 1 이상이어야 합니다: {max_batch_size}")
+        self.get_image_maker = get_image_maker
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        # (prompt, seed, profile, style, preview_key, on_image, future)
+        self._requests: "queue.Queue[tuple]" = queue.Queue()
+        self._batches = 0
+        self._images = 0
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name="image-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        prompt: str,
+        seed: Optional[int] = None,
+        profile: Optional[str] = None,
+        style: Optional[str] = None,
+        preview_key: Optional[str] = None,
+        on_image: Optional[Callable[[Image.Image], None]] = None
+    ) -> Future:
+        """
+        프롬프트 하나를 다음 batch에 추가. Future의 결과는 PIL 이미지
+
+        on_image를 주면 pipelined_decode인 생성기에서 디코드 직후 디코드 스레드에서 호출됨
+        (DiffusionImageMaker.generate_images의 on_image와 같이, Future의 이미지와 같은 객체인지 확인해서 사용)
+        """
+        future = Future()
+        self._requests.put((prompt, seed, profile, style, preview_key, on_image, future))
+        return future
+
+    def generate(
+        self,
+        prompt: str,
+        seed: Optional[int] = None,
+        profile: Optional[str] = None,
+        style: Optional[str] = None,
+        timeout: float = None,
+        preview_key: Optional[str] = None,
+        on_image: Optional[Callable[[Image.Image], None]] = None
+    ) -> Image.Image:
+        """submit 후 결과를 기다림 (생성 실패 시 예외)"""
+        return self.submit(prompt, seed, profile, style, preview_key, on_image).result(timeout=timeout)
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "images": self._images,
+                "mean_batch_size": self._images / self._batches if self._batches else 0.0
+            }
+
+    def _collect(self) -> List[tuple]:
+        """첫 요청을 기다린 뒤, batch가 차거나 대기 시간이 지날 때까지 요청을 모음"""
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = []
+            try:
+                batch = self._collect()
+                # 대기 중에 취소된 요청은 제외
+                batch = [request for request in batch if request[6].set_running_or_notify_cancel()]
+
+                groups: Dict[Tuple[Optional[str], Optional[str]], list] = {}
+                for request in batch:
+                    groups.setdefault((request[2], request[3]), []).append(request)
+                for (profile, style), requests in groups.items():
+                    self._generate(requests, profile, style)
+            except Exception as e:
+                # batcher 스레드는 하나뿐이므로 멈추지 않고, 이 batch에서 아직 끝나지 않은 요청만 실패 처리
+                print(f"[image batcher] batch 처리 실패: {e}")
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    @staticmethod
+    def _options(image_maker, requests, profile: Optional[str], style: Optional[str]) -> Dict[str, Any]:
+        """generate_images에 넘길 인자"""
+        options = {"batch_size": len(requests), "seeds": [request[1] for request in requests]}
+        if getattr(image_maker, "pipelined_decode", False):
+            # 한 batch면 디코드와 겹칠 denoising이 없으므로 최소 두 sub-batch로 나눔
+            options["batch_size"] = max(1, (len(requests) + 1) // 2)
+            hooks = [request[5] for request in requests]
+
+            def on_image(i: int, image: Image.Image) -> None:
+                if hooks[i] is not None:
+                    hooks[i](image)
+
+            if any(hook is not None for hook in hooks):
+                options["on_image"] = on_image
+        if profile is not None:
+            options["profile"] = profile
+        if style is not None:
+            options["style"] = style
+        preview_keys = [request[4] for request in requests]
+        if any(key is not None for key in preview_keys):
+            options["preview_keys"] = preview_keys
+        return options
+
+    def _generate(self, requests, profile: Optional[str], style: Optional[str] = None) -> None:
+        try:
+            image_maker = self.get_image_maker()
+            images = image_maker.generate_images(
+                [request[0] for request in requests], **self._options(image_maker, requests, profile, style)
+            )
+        except Exception as e:
+            for *_, future in requests:
+                future.set_exception(e)
+            return
+
+        IMAGE_BATCH_SIZE.observe(len(requests))
+        with self._stats_lock:
+            self._batches += 1
+            self._images += len(requests)
+
+        # 장면별 실패는 해당 요청에만 전달
+        for (prompt, *_, future), image in zip(requests, images):
+            if image is None:
+                future.set_exception(RuntimeError(f"이미지 생성 실패: {prompt[:60]}"))
+            else:
+                future.set_result(image)
+        # 생성기가 프롬프트보다 적은 이미지를 돌려주면 남은 요청이 영원히 기다리지 않도록 실패 처리
+        for prompt, *_, future in requests[len(images):]:
+            future.set_exception(RuntimeError(f"이미지 {len(images)}장만 반환됨 (요청 {len(requests)}장): {prompt[:60]}"))
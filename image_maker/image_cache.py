@@ -0,0 +1,174 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import redis
+from PIL import Image
+from prometheus_client import Counter
+
+# 이미지 캐시 조회 결과 (hit / miss)
+IMAGE_CACHE_REQUESTS = Counter(
+    "image_cache_requests_total",
+    "Image cache lookups by result",
+    ["result"]
+)
+
+
+def prompt_seed(prompt: str) -> int:
+    """프롬프트에서 만든 고정 seed (같은 프롬프트를 다시 생성하면 같은 seed → 캐시 hit)"""
+    return int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+
+
+class ImageCache:
+    """
+    생성 조건(모델, 스케줄러, step 수, 해상도, negative prompt, prompt, seed 등)의 해시를 키로 하는 디스크 이미지 캐시
+
+    - 이미지는 cache_dir/<키 앞 2자리>/<키>.png 로 저장 (무손실)
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 조회되지 않은 이미지부터 삭제 (LRU)
+    - r을 주면 LRU 순서/크기 인덱스를 Redis에 두어, 같은 디렉터리(공유 볼륨)를 쓰는 워커들이 함께 관리
+      (없으면 프로세스 안에서 관리하고, 시작 시 파일 수정 시각으로 순서를 복원)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "outputs/image_cache",
+        max_bytes: int = 2 * 1024 ** 3,
+        r: Optional[redis.Redis] = None,
+        key_prefix: str = "image_cache:"
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.r = r
+        self.key_prefix = key_prefix
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        if r is None:
+            self._load_local_index()
+
+    @staticmethod
+    def make_key(**fields: Any) -> str:
+        """생성 조건으로 캐시 키 생성 (필드 순서와 무관)"""
+        encoded = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+
+    def _load_local_index(self) -> None:
+        files = []
+        for dir_path, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if file_name.endswith(".png"):
+                    stat = os.stat(os.path.join(dir_path, file_name))
+                    files.append((stat.st_mtime, file_name[:-len(".png")], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    # LRU 인덱스 (Redis 또는 프로세스 내부)
+    def _touch(self, key: str) -> None:
+        if self.r is not None:
+            self.r.zadd(f"{self.key_prefix}lru", {key: time.time()}, xx=True)
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def _add(self, key: str, size: int) -> None:
+        if self.r is not None:
+            # 같은 키를 다시 저장하면 크기 차이만 반영
+            previous_size = int(self.r.hget(f"{self.key_prefix}sizes", key) or 0)
+            pipe = self.r.pipeline(transaction=True)
+            pipe.zadd(f"{self.key_prefix}lru", {key: time.time()})
+            pipe.hset(f"{self.key_prefix}sizes", key, size)
+            pipe.incrby(f"{self.key_prefix}bytes", size - previous_size)
+            pipe.execute()
+            return
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+
+    def _pop_oldest(self) -> Optional[str]:
+        """전체 크기가 예산을 넘었으면 가장 오래된 키를 인덱스에서 빼서 반환"""
+        if self.r is not None:
+            if int(self.r.get(f"{self.key_prefix}bytes") or 0) <= self.max_bytes:
+                return None
+            popped = self.r.zpopmin(f"{self.key_prefix}lru")
+            if not popped:
+                return None
+            key = popped[0][0]
+            size = int(self.r.hget(f"{self.key_prefix}sizes", key) or 0)
+            pipe = self.r.pipeline(transaction=True)
+            pipe.hdel(f"{self.key_prefix}sizes", key)
+            pipe.decrby(f"{self.key_prefix}bytes", size)
+            pipe.execute()
+            return key
+        with self._lock:
+            if self._total_bytes <= self.max_bytes or not self._entries:
+                return None
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            return key
+
+    def get(self, key: str) -> Optional[Image.Image]:
+        """캐시된 이미지 (없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                image = Image.open(io.BytesIO(f.read()))
+                image.load()
+        except (FileNotFoundError, OSError):
+            IMAGE_CACHE_REQUESTS.labels(result="miss").inc()
+            with self._lock:
+                self._misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self._touch(key)
+        IMAGE_CACHE_REQUESTS.labels(result="hit").inc()
+        with self._lock:
+            self._hits += 1
+        return image
+
+    def put(self, key: str, image: Image.Image) -> None:
+        """이미지 저장 후 예산을 넘은 만큼 오래된 이미지 삭제"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with io.BytesIO() as output:
+            image.save(output, format="PNG")
+            data = output.getvalue()
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._add(key, len(data))
+
+        while True:
+            evicted = self._pop_oldest()
+            if evicted is None:
+                break
+            try:
+                os.remove(self._path(evicted))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,113 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+# 포맷 이름 -> (PIL 포맷, Content-Type, 확장자)
+IMAGE_FORMATS = {
+    "png": ("PNG", "image/png", "png"),
+    "webp": ("WEBP", "image/webp", "webp"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+}
+
+ORIGINAL_VARIANT = "original"
+
+
+@dataclass(frozen=True)
+class EncodedImage:
+    variant: str
+    data: bytes
+    content_type: str
+    extension: str
+    width: int
+    height: int
+
+
+def parse_variants(value: Optional[str]) -> Dict[str, int]:
+    """'thumbnail:256,mobile:768' 형태의 문자열을 {이름: 최대 너비}로 변환"""
+    variants = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        name, _, width = item.partition(":")
+        if not width.strip().isdigit() or name.strip() == ORIGINAL_VARIANT:
+            raise ValueError(f"잘못된 이미지 variant 설정: {item} (예: thumbnail:256)")
+        variants[name.strip()] = int(width)
+    return variants
+
+
+class ImageEncoder:
+    """
+    생성된 이미지를 업로드용 바이트로 인코딩 (PNG / WebP / JPEG)
+
+    variants를 주면 원본과 함께 너비를 줄인 버전(썸네일, 모바일 등)을 스레드 풀에서 병렬로 인코딩한다.
+    (PIL의 인코더는 GIL을 풀고 동작하므로 스레드로도 병렬 처리됨)
+    """
+
+    def __init__(
+        self,
+        image_format: str = "png",
+        quality: int = 85,
+        variants: Optional[Dict[str, int]] = None,
+        max_workers: Optional[int] = None,
+        optimize: bool = False
+    ):
+        """
+        Args:
+            image_format (str): png / webp / jpeg
+            quality (int): WebP/JPEG 품질 (1~100, PNG는 무손실이라 사용하지 않음)
+            variants (dict, optional): 추가로 만들 버전 이름 -> 최대 너비(px)
+            max_workers (int, optional): 병렬 인코딩 스레드 수 (기본: 버전 수 + 1)
+            optimize (bool): PNG/JPEG 최적화 인코딩 (PNG optimize, JPEG optimize + progressive)
+                크기가 조금 줄지만 인코딩이 크게 느려지므로(512px PNG 기준 약 2배, 크기는 2% 미만 감소) 기본은 끔
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"지원되지 않는 이미지 포맷: {image_format} (가능한 값: {list(IMAGE_FORMATS)})")
+        self.image_format = image_format
+        self.quality = quality
+        self.optimize = optimize
+        self.variants = dict(variants or {})
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.variants) + 1,
+            thread_name_prefix="image-encode"
+        ) if self.variants else None
+
+    def _save_options(self) -> dict:
+        if self.image_format == "png":
+            return {"optimize": True} if self.optimize else {}
+        if self.image_format == "webp":
+            return {"quality": self.quality, "method": 4}
+        if self.optimize:
+            return {"quality": self.quality, "optimize": True, "progressive": True}
+        return {"quality": self.quality}
+
+    def encode(self, image: Image.Image, max_width: Optional[int] = None, variant: str = ORIGINAL_VARIANT) -> EncodedImage:
+        """이미지 하나 인코딩 (max_width보다 넓으면 비율을 유지해 축소)"""
+        if max_width and image.width > max_width:
+            image = image.resize((max_width, round(image.height * max_width / image.width)), Image.LANCZOS)
+        if self.image_format == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        pil_format, content_type, extension = IMAGE_FORMATS[self.image_format]
+        with io.BytesIO() as output:
+            image.save(output, format=pil_format, **self._save_options())
+            data = output.getvalue()
+        return EncodedImage(variant, data, content_type, extension, image.width, image.height)
+
+    def encode_variants(self, image: Image.Image) -> List[EncodedImage]:
+        """원본과 설정된 모든 축소 버전 인코딩 (원본이 첫 번째)"""
+        if self._executor is None:
+            return [self.encode(image)]
+        # 원본보다 작아지지 않는 버전은 원본 인코딩 결과를 그대로 사용
+        resized = {name: width for name, width in self.variants.items() if width < image.width}
+        # PIL 이미지는 스레드 간 동시 접근이 안전하지 않으므로 작업마다 복사본 사용
+        futures = {ORIGINAL_VARIANT: self._executor.submit(self.encode, image.copy())}
+        for name, max_width in resized.items():
+            futures[name] = self._executor.submit(self.encode, image.copy(), max_width, name)
+        original = futures[ORIGINAL_VARIANT].result()
+        return [original] + [
+            futures[name].result() if name in resized else replace(original, variant=name)
+            for name in self.variants
+        ]
@@ -4,4 +4,18 @@ from abc import ABC, abstractmethod
 class ImageMakerInterface(ABC):
     @abstractmethod
     def generate_image(self, prompts: list[str], output_dir: str):
-        pass
\ No newline at end of file
+        pass
+
+    def generate_images(self, prompts: list[str], batch_size: int = None, seeds: list = None, profile: str = None) -> list:
+        """
+        여러 프롬프트 생성 (기본 구현은 한 장씩이며 seed/profile을 지원하지 않음, 지원하는 생성기는 재정의)
+        실패한 장면은 None으로 반환해 다른 장면에 영향을 주지 않음
+        """
+        images = []
+        for i, prompt in enumerate(prompts, 1):
+            try:
+                images.append(self.generate_image(prompt))
+            except Exception as e:
+                print(f"Error in prompt {i}: {e}")
+                images.append(None)
+        return images
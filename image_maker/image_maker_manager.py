@@ -1,11 +1,14 @@
-from typing import List
+from typing import Callable, List, Optional
 from image_maker.image_maker_interface import ImageMakerInterface
+from image_maker.image_encoder import ImageEncoder
 from PIL import Image
 import json, os, io
 
 class ImageMakerManager:
-    def __init__(self, image_maker: ImageMakerInterface):
+    def __init__(self, image_maker: ImageMakerInterface, encoder: Optional[ImageEncoder] = None):
         self.image_maker = image_maker
+        # None이면 기존과 같이 원본 PNG로 인코딩
+        self.encoder = encoder
 
     @staticmethod
     def image_to_bytes(image: Image.Image, format: str = "PNG") -> bytes:
@@ -13,18 +16,70 @@ class ImageMakerManager:
             image.save(output, format=format)
             return output.getvalue()
 
-    def process(self, prompts: str) -> List[bytes]:
+    def _encode(self, image: Image.Image) -> bytes:
+        if self.encoder is not None:
+            return self.encoder.encode(image).data
+        return self.image_to_bytes(image)
+
+    def process(self, prompts: str, batch_size: int = None, profile: str = None) -> List[bytes]:
         """
         Generate images from a list of prompt strings and return as byte data.
 
         Args:
             prompts: A JSON-serialized list of dicts, each with a 'generated_prompt' field.
+            batch_size: Scenes per diffusion call (None picks it from available memory).
+            profile: Inference profile name ("draft" / "standard" / "quality"), None uses the maker's default profile.
 
         Returns:
-            List of image bytes (e.g., PNG format).
+            List of image bytes (PNG, or the encoder's format when one is set).
         """
+        # pipelined_decode인 생성기는 디코드 스레드에서 바로 인코딩 (다음 batch의 denoising과 겹침)
+        encoded = {}
+        on_image = None
+        if getattr(self.image_maker, "pipelined_decode", False):
+            def on_image(i, image):
+                try:
+                    encoded[i] = (image, self._encode(image))
+                except Exception as e:
+                    print(f"Error in prompt {i + 1}: {e}")
+
         results = []
+        images = self.generate(prompts, batch_size=batch_size, profile=profile, on_image=on_image)
+        for i, image in enumerate(images):
+            if image is None:
+                results.append(None)
+                continue
+            # NSFW 재생성으로 바뀐 이미지나 캐시에서 가져온 이미지는 여기서 인코딩
+            if i in encoded and encoded[i][0] is image:
+                results.append(encoded[i][1])
+                continue
+            try:
+                results.append(self._encode(image))
+            except Exception as e:
+                print(f"Error in prompt {i + 1}: {e}")
+                results.append(None)
+
+        return results
+
+    def generate(
+        self,
+        prompts: str,
+        batch_size: int = None,
+        profile: str = None,
+        style: str = None,
+        on_image: Optional[Callable[[int, Image.Image], None]] = None
+    ) -> List[Optional[Image.Image]]:
+        """
+        Generate PIL images from a list of prompt strings (failed scenes are None).
 
+        Args:
+            prompts: A JSON-serialized list of dicts, each with a 'generated_prompt' field (and optional 'seed').
+            style: Style name for image makers that share one base model across styles (StyleSwapImageMaker).
+            on_image: Called as on_image(index, image) from the decode thread of pipelined image makers.
+
+        Items may also carry a 'preview_key' ("{pipeline id}:{scene number}") to stream intermediate previews
+        when the image maker has a preview publisher.
+        """
         if not isinstance(prompts, str):
             raise TypeError(f"Expected prompts to be str, got {type(prompts)}")
 
@@ -35,8 +90,10 @@ class ImageMakerManager:
             print("JSONDecodeError:", e)
             raise
 
-        # 3) 'generated_prompt' 키 존재 및 값 타입 점검
+        # 3) 'generated_prompt' 키 존재 및 값 타입 점검 (선택: 'seed'가 있으면 재현 가능한 생성 + 캐시 사용)
         extracted_prompts = []
+        seeds = []
+        preview_keys = []
         for i, item in enumerate(parsed_prompts, 1):
             if not isinstance(item, dict):
                 raise TypeError(f"Item {i} is not a dict: {item}")
@@ -46,18 +103,22 @@ class ImageMakerManager:
             if not isinstance(prompt_value, str):
                 raise TypeError(f"Item {i} 'generated_prompt' is not a string: {prompt_value}")
             extracted_prompts.append(prompt_value)
-
-        # 4) 이미지 생성 루프
-        for i, prompt in enumerate(extracted_prompts, 1):
-            try:
-                image = self.image_maker.generate_image(prompt)
-                image_bytes = self.image_to_bytes(image)
-                results.append(image_bytes)
-            except Exception as e:
-                print(f"Error in prompt {i}: {e}")
-                results.append(None)
-
-        return results
+            seeds.append(item.get('seed'))
+            preview_keys.append(item.get('preview_key'))
+
+        # 4) 이미지 생성 (장면들을 batch로 묶어 생성, 실패한 장면은 None)
+        options = {"batch_size": batch_size}
+        if any(seed is not None for seed in seeds):
+            options["seeds"] = seeds
+        if profile is not None:
+            options["profile"] = profile
+        if style is not None:
+            options["style"] = style
+        if any(key is not None for key in preview_keys):
+            options["preview_keys"] = preview_keys
+        if on_image is not None:
+            options["on_image"] = on_image
+        return self.image_maker.generate_images(extracted_prompts, **options)
     
     def process_from_path(self, input_path: str, image_output_path: str) -> List[Image.Image]:
         """
@@ -1,16 +1,15 @@
-from image_maker.dream_shaper_image_maker import DreamShaperImageMaker
-from image_maker.ghibli_diffusion_image_maker import GhibliDiffusionImageMaker
-from image_maker.sdxl_image_maker import SDXLImageMaker
 from image_maker.image_maker_interface import ImageMakerInterface
+from model_registry.plugin_registry import LazyPluginRegistry
+
+# diffusers/torch는 이미지 생성기를 처음 만들 때 import
+IMAGE_MAKERS = LazyPluginRegistry({
+    "ghibli_diffusion": "image_maker.ghibli_diffusion_image_maker:GhibliDiffusionImageMaker",
+    "dream_shaper": "image_maker.dream_shaper_image_maker:DreamShaperImageMaker",
+    "sdxl": "image_maker.sdxl_image_maker:SDXLImageMaker",
+    "sd15_styles": "image_maker.style_swap_image_maker:StyleSwapImageMaker",
+}, error_message="지원하지 않는 이미지 생성기: {name}")
 
 class ImageMakerSelector:
     @staticmethod
     def get_image_maker(model_name: str = "dream_shaper") -> ImageMakerInterface:
-        if model_name == "ghibli_diffusion":
-            return GhibliDiffusionImageMaker()
-        if model_name == "dream_shaper":
-            return DreamShaperImageMaker()
-        if model_name == "sdxl":
-            return SDXLImageMaker()
-        else:
-            raise ValueError(f"지원하지 않는 이미지 생성기: {model_name}")
+        return IMAGE_MAKERS.create(model_name)
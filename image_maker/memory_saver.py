@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# "auto"는 남은 메모리로 아래 단계 중 하나를 고름
+MEMORY_SAVER_AUTO = "auto"
+
+
+@dataclass(frozen=True)
+class MemorySaverSettings:
+    """
+    이미지 생성 메모리 절약 설정 묶음 (생성기를 불러온 뒤 한 번 적용)
+
+    attention_slicing: attention을 나눠 계산 (PyTorch SDPA가 없거나 MPS일 때만 적용, CPU/CUDA의 SDPA보다 느리고 메모리도 더 씀)
+    vae_slicing: batch의 이미지를 한 장씩 VAE 디코드
+    vae_tile_size: VAE를 이 크기(px)의 겹치는 타일로 나눠 디코드 (None이면 사용 안 함, 타일 경계가 미세하게 달라짐)
+    reduce_weight_precision: UNet 가중치를 낮은 정밀도(fp32 -> bf16, fp16 -> fp8)로 저장하고 layer마다 올려서 계산
+    sequential_cpu_offload: CUDA에서 sub-module 단위로 가중치를 GPU에 올렸다 내림 (accelerate 필요, CPU에서는 무시)
+    max_batch_size: 한 번에 생성할 최대 장면 수 (None이면 생성기 설정 유지)
+    """
+    name: str
+    attention_slicing: bool = False
+    vae_slicing: bool = False
+    vae_tile_size: Optional[int] = None
+    reduce_weight_precision: bool = False
+    sequential_cpu_offload: bool = False
+    max_batch_size: Optional[int] = None
+
+    @property
+    def changes_output(self) -> bool:
+        """같은 seed라도 생성 결과가 달라지는 설정인지 (이미지 캐시 키에 포함)"""
+        return self.vae_tile_size is not None or self.reduce_weight_precision
+
+
+MEMORY_SAVER_LEVELS = {
+    "off": MemorySaverSettings("off"),
+    "balanced": MemorySaverSettings("balanced", attention_slicing=True, vae_slicing=True),
+    "low": MemorySaverSettings(
+        "low",
+        attention_slicing=True,
+        vae_slicing=True,
+        vae_tile_size=256,
+        reduce_weight_precision=True,
+        sequential_cpu_offload=True,
+        max_batch_size=1
+    ),
+}
+
+# auto 선택 기준: 남은 메모리가 이미지 한 장 추정 메모리의 몇 배 이상이면 해당 단계를 쓰는지
+AUTO_OFF_RATIO = 4.0
+AUTO_BALANCED_RATIO = 1.0
+
+
+def get_memory_saver(name: str) -> MemorySaverSettings:
+    if name not in MEMORY_SAVER_LEVELS:
+        raise ValueError(
+            f"지원되지 않는 memory saver 단계: {name} (가능한 값: {[MEMORY_SAVER_AUTO, *MEMORY_SAVER_LEVELS]})"
+        )
+    return MEMORY_SAVER_LEVELS[name]
+
+
+def choose_memory_saver(available_bytes: int, per_image_bytes: int) -> str:
+    """
+    남은 메모리로 memory saver 단계 선택
+
+    Args:
+        available_bytes (int): 모델을 불러온 뒤 남은 메모리 (CPU는 psutil available, CUDA는 남은 VRAM)
+        per_image_bytes (int): 이미지 한 장을 생성할 때 쓰는 추정 메모리
+    """
+    if available_bytes >= per_image_bytes * AUTO_OFF_RATIO:
+        return "off"
+    if available_bytes >= per_image_bytes * AUTO_BALANCED_RATIO:
+        return "balanced"
+    return "low"
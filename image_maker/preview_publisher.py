@@ -0,0 +1,202 @@
+import base64
+import io
+import json
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import redis
+import torch
+from PIL import Image
+from prometheus_client import Counter
+
+# 중간 미리보기 처리 결과 (published: 전송 / dropped: 전송 대기열이 가득 차 버림 / retracted: NSFW 판정으로 회수)
+IMAGE_PREVIEWS = Counter(
+    "image_previews_total",
+    "Intermediate diffusion previews by result",
+    ["result"]
+)
+
+# latent(4채널) -> RGB 선형 근사 계수와 bias (VAE 없이 대략적인 색/구도만 복원), VAE가 다른 SD1.5와 SDXL은 계수가 다름
+SD15_LATENT_RGB_FACTORS = torch.tensor([
+    [0.3512, 0.2297, 0.3227],
+    [0.3250, 0.4974, 0.2350],
+    [-0.2829, 0.1762, 0.2721],
+    [-0.2120, -0.2616, -0.7177],
+])
+SDXL_LATENT_RGB_FACTORS = torch.tensor([
+    [0.3651, 0.4232, 0.4341],
+    [-0.2533, -0.0042, 0.1068],
+    [0.1076, 0.1111, -0.0362],
+    [-0.3165, -0.2492, -0.2188],
+])
+SDXL_LATENT_RGB_BIAS = torch.tensor([0.1084, -0.0175, -0.0011])
+
+LATENT_RGB_FACTORS = {
+    "sd15": (SD15_LATENT_RGB_FACTORS, torch.zeros(3)),
+    "sdxl": (SDXL_LATENT_RGB_FACTORS, SDXL_LATENT_RGB_BIAS),
+}
+
+
+def latent_format(pipe) -> str:
+    """파이프라인의 latent 종류 (텍스트 인코더가 둘인 SDXL 계열 / 그 외 SD1.5 계열)"""
+    return "sdxl" if getattr(pipe, "text_encoder_2", None) is not None else "sd15"
+
+
+def preview_channel(preview_key: str) -> str:
+    """미리보기 pub/sub 채널 겸 최신 미리보기 키 (preview_key는 "{pipeline id}:{장면 번호}")"""
+    return f"image_preview:{preview_key}"
+
+
+class PreviewPublisher:
+    """
+    diffusion 중간 결과(latent)를 대략적인 미리보기 이미지로 바꿔 Redis로 보내는 publisher
+
+    - 파이프라인의 callback_on_step_end로 every_n_steps step마다 호출되며, denoising loop 안에서는
+      보낼 장면의 latent를 CPU로 복사하는 것만 하고 디코드/JPEG 인코딩/전송은 백그라운드 스레드에서 처리
+    - 같은 장면은 min_interval_seconds에 한 번까지만 보내고, 전송 대기열(max_pending)이 차 있으면 버림
+    - 디코드는 latent -> RGB 선형 근사(기본, 가중치 없음, 파이프라인 종류별 계수) 또는 TAESD(AutoencoderTiny, taesd_model 지정 시,
+      SDXL은 taesdxl 필요)
+    - preview_channel(key)로 PUBLISH하고, 늦게 구독한 클라이언트를 위해 같은 이름의 키에 최신 미리보기를 ttl_seconds 동안 저장
+      메시지: {"step": 10, "total_steps": 20, "width": 64, "height": 64, "image": base64 JPEG}
+    - 미리보기는 safety checker 전 결과이므로, NSFW로 판정된 장면은 retract로 저장된 미리보기를 지우고
+      {"retracted": true}를 PUBLISH (미리보기와 같은 대기열을 거쳐 먼저 보낸 미리보기보다 늦게 처리됨)
+    """
+
+    def __init__(
+        self,
+        r: redis.Redis,
+        every_n_steps: int = 5,
+        min_interval_seconds: float = 1.0,
+        max_width: int = 256,
+        taesd_model: Optional[str] = None,
+        ttl_seconds: int = 600,
+        max_pending: int = 8
+    ):
+        if every_n_steps < 1:
+            raise ValueError(f"every_n_steps는 1 이상이어야 합니다: {every_n_steps}")
+        self.r = r
+        self.every_n_steps = every_n_steps
+        self.min_interval_seconds = min_interval_seconds
+        self.max_width = max_width
+        self.taesd_model = taesd_model
+        self.ttl_seconds = ttl_seconds
+        self._taesd = None
+        self._last_published: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # (처리 함수, 인자) 대기열: 미리보기 전송과 회수를 한 스레드에서 순서대로 처리
+        self._pending: "queue.Queue[tuple]" = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._loop, name="image-preview", daemon=True)
+        self._thread.start()
+
+    def _due(self, preview_key: str, now: float) -> bool:
+        with self._lock:
+            if now - self._last_published.get(preview_key, float("-inf")) < self.min_interval_seconds:
+                return False
+            self._last_published[preview_key] = now
+            return True
+
+    def step_callback(self, preview_keys: List[Optional[str]], total_steps: int) -> Callable:
+        """
+        batch 한 번에 쓸 callback_on_step_end 함수
+
+        Args:
+            preview_keys (list): batch 행별 미리보기 키 (None인 행은 보내지 않음)
+            total_steps (int): 메시지에 담을 전체 step 수
+        """
+        def callback(pipe, step_index, timestep, callback_kwargs):
+            step = step_index + 1
+            # 마지막 step은 최종 이미지가 곧 올라가므로 보내지 않음
+            if step % self.every_n_steps or step >= total_steps:
+                return callback_kwargs
+            now = time.monotonic()
+            rows = [i for i, key in enumerate(preview_keys) if key is not None and self._due(key, now)]
+            if rows:
+                latents = callback_kwargs["latents"][rows].detach().to("cpu", torch.float32)
+                try:
+                    self._pending.put_nowait(
+                        (self._publish, ([preview_keys[i] for i in rows], latents, latent_format(pipe), step, total_steps))
+                    )
+                except queue.Full:
+                    IMAGE_PREVIEWS.labels("dropped").inc(len(rows))
+            return callback_kwargs
+
+        return callback
+
+    def decode(self, latents: torch.Tensor, latent_format: str = "sd15") -> List[Image.Image]:
+        """latent batch -> 미리보기 이미지 (선형 근사는 latent 해상도, TAESD는 원본 해상도)"""
+        if self.taesd_model:
+            if self._taesd is None:
+                from diffusers import AutoencoderTiny
+                self._taesd = AutoencoderTiny.from_pretrained(self.taesd_model).eval()
+            with torch.no_grad():
+                rgb = self._taesd.decode(latents).sample
+        else:
+            factors, bias = LATENT_RGB_FACTORS[latent_format]
+            rgb = torch.einsum("bchw,cr->brhw", latents, factors) + bias.view(1, 3, 1, 1)
+        pixels = ((rgb.clamp(-1, 1) + 1) * 127.5).round().to(torch.uint8).permute(0, 2, 3, 1).numpy()
+        images = [Image.fromarray(array) for array in pixels]
+        if self.max_width:
+            # 선형 근사는 latent 해상도(1/8)라 작으므로 max_width까지 확대, TAESD 결과는 축소
+            images = [
+                image.resize((self.max_width, round(image.height * self.max_width / image.width)), Image.BILINEAR)
+                for image in images
+            ]
+        return images
+
+    def _publish(self, preview_keys, latents, latent_format, step, total_steps) -> None:
+        with self.r.pipeline(transaction=False) as pipe:
+            for preview_key, image in zip(preview_keys, self.decode(latents, latent_format)):
+                with io.BytesIO() as output:
+                    image.save(output, format="JPEG", quality=70)
+                    data = base64.b64encode(output.getvalue()).decode("ascii")
+                message = json.dumps({
+                    "step": step,
+                    "total_steps": total_steps,
+                    "width": image.width,
+                    "height": image.height,
+                    "image": data
+                })
+                pipe.publish(preview_channel(preview_key), message)
+                pipe.set(preview_channel(preview_key), message, ex=self.ttl_seconds)
+            pipe.execute()
+        IMAGE_PREVIEWS.labels("published").inc(len(preview_keys))
+
+    def _retract(self, preview_key: str) -> None:
+        with self.r.pipeline(transaction=False) as pipe:
+            pipe.delete(preview_channel(preview_key))
+            pipe.publish(preview_channel(preview_key), json.dumps({"retracted": True}))
+            pipe.execute()
+        IMAGE_PREVIEWS.labels("retracted").inc()
+
+    def _loop(self) -> None:
+        while True:
+            handler, args = self._pending.get()
+            try:
+                handler(*args)
+            except Exception as e:
+                # 미리보기 실패는 생성에 영향을 주지 않음
+                print(f"[preview] 전송 실패: {e}")
+            finally:
+                self._pending.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """대기 중인 미리보기를 모두 보낼 때까지 대기 (벤치마크/종료용)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+
+    def retract(self, preview_key: str) -> None:
+        """
+        NSFW로 판정된 장면의 미리보기 회수 (저장된 미리보기 삭제 + 회수 메시지 PUBLISH)
+        미리보기와 달리 대기열이 차 있어도 버리지 않고 기다림
+        """
+        self._pending.put((self._retract, (preview_key,)))
+
+    def forget(self, preview_key: str) -> None:
+        """장면 생성이 끝나면 rate limit 기록 삭제"""
+        with self._lock:
+            self._last_published.pop(preview_key, None)
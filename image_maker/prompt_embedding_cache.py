@@ -0,0 +1,108 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Tuple
+
+import torch
+from prometheus_client import Counter
+
+# 프롬프트 임베딩 캐시 조회 결과 (hit / miss)
+PROMPT_EMBEDDING_CACHE_REQUESTS = Counter(
+    "prompt_embedding_cache_requests_total",
+    "Prompt embedding cache lookups by result",
+    ["result"]
+)
+
+
+class PromptEmbeddingCache:
+    """
+    텍스트 인코더(CLIP) 출력 LRU 캐시
+
+    - 키는 토큰화된 입력(token id)과 namespace(모델/그림체)라 공백 차이나 77 토큰 이후 잘린 부분만 다른 프롬프트도 같은 항목을 씀
+    - 항상 같은 negative prompt, NSFW 재생성/재시도로 다시 생성하는 장면의 프롬프트는 텍스트 인코더를 다시 실행하지 않음
+    - encode는 diffusers StableDiffusionPipeline.encode_prompt와 같은 방식(max_length padding, attention mask 설정)으로
+      캐시에 없는 텍스트만 한 번에 인코딩하고, 결과를 prompt_embeds / negative_prompt_embeds로 넘길 수 있게 돌려줌
+    - 임베딩은 파이프라인 장치에 두므로 항목 하나가 77 × hidden 크기 (SD1.5 fp16 기준 약 118KB)
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, Tuple[int, ...]], torch.Tensor]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _lookup(self, key) -> torch.Tensor:
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        PROMPT_EMBEDDING_CACHE_REQUESTS.labels("hit" if embedding is not None else "miss").inc()
+        return embedding
+
+    def _store(self, key, embedding: torch.Tensor) -> None:
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def encode(self, pipe, texts: List[str], namespace: Hashable = None) -> torch.Tensor:
+        """
+        텍스트 목록을 텍스트 인코더 출력으로 변환 (캐시에 없는 것만 인코딩)
+
+        Args:
+            pipe: tokenizer, text_encoder를 가진 SD1.5 계열 파이프라인
+            texts (list): 프롬프트 목록
+            namespace: 같은 토큰이라도 임베딩이 달라지는 조건 (모델, 텍스트 인코더 LoRA 등)
+
+        Returns:
+            torch.Tensor: (len(texts), 77, hidden) 크기의 임베딩 (텍스트 인코더 dtype, 파이프라인 장치)
+        """
+        text_inputs = pipe.tokenizer(
+            texts,
+            padding="max_length",
+            max_length=pipe.tokenizer.model_max_length,
+            truncation=True,
+            return_tensors="pt"
+        )
+        keys = [(namespace, tuple(ids)) for ids in text_inputs.input_ids.tolist()]
+
+        # 같은 호출 안에서 반복되는 텍스트(batch의 negative prompt 등)는 한 번만 조회/인코딩
+        embeddings: Dict[tuple, torch.Tensor] = {}
+        pending: Dict[tuple, int] = {}
+        for i, key in enumerate(keys):
+            if key in embeddings or key in pending:
+                continue
+            embedding = self._lookup(key)
+            if embedding is not None:
+                embeddings[key] = embedding
+            else:
+                pending[key] = i
+
+        if pending:
+            missing = list(pending.values())
+            device = pipe._execution_device
+            use_attention_mask = getattr(pipe.text_encoder.config, "use_attention_mask", False)
+            attention_mask = text_inputs.attention_mask[missing].to(device) if use_attention_mask else None
+            with torch.no_grad():
+                encoded = pipe.text_encoder(text_inputs.input_ids[missing].to(device), attention_mask=attention_mask)[0]
+            encoded = encoded.to(dtype=pipe.text_encoder.dtype, device=device)
+            for row, i in enumerate(missing):
+                # batch 텐서 전체가 캐시에 붙잡히지 않도록 행마다 복사
+                embeddings[keys[i]] = encoded[row].clone()
+                self._store(keys[i], embeddings[keys[i]])
+
+        return torch.stack([embeddings[key] for key in keys])
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "entries": len(self._entries)
+            }
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class StyleAdapter:
+    """
+    공유 SD1.5 base 파이프라인 위에서 바꿔 끼우는 그림체
+
+    unet: 교체할 UNet 가중치 (diffusers 모델 id 또는 경로, unet 하위 폴더 사용). None이면 base 모델의 UNet
+    lora: base UNet 위에 얹을 LoRA 가중치 (모델 id 또는 경로, peft 필요). unet과 함께 쓸 수 없음
+    negative_prompt, max_nsfw_attempts: None이면 생성기 기본값
+    """
+    name: str
+    unet: Optional[str] = None
+    lora: Optional[str] = None
+    lora_scale: float = 1.0
+    negative_prompt: Optional[str] = None
+    max_nsfw_attempts: Optional[int] = None
+
+    def __post_init__(self):
+        if self.unet and self.lora:
+            raise ValueError(f"style {self.name}: unet 교체와 LoRA는 함께 지정할 수 없습니다")
+
+
+# base는 DreamShaper 8, Ghibli는 UNet만 교체 (텍스트 인코더/VAE는 base 것을 공유)
+STYLE_ADAPTERS = {
+    "dream_shaper": StyleAdapter("dream_shaper", negative_prompt="low quality, blurry, nsfw", max_nsfw_attempts=3),
+    "ghibli_diffusion": StyleAdapter("ghibli_diffusion", unet="nitrosocke/Ghibli-Diffusion", negative_prompt="low quality, blurry"),
+}
+
+
+def get_style_adapter(name: str) -> StyleAdapter:
+    if name not in STYLE_ADAPTERS:
+        raise ValueError(f"지원되지 않는 이미지 style: {name} (가능한 값: {list(STYLE_ADAPTERS)})")
+    return STYLE_ADAPTERS[name]
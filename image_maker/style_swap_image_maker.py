@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import torch
+from diffusers import StableDiffusionPipeline, UNet2DConditionModel
+from PIL import Image
+
+from image_maker.diffusion_image_maker import DiffusionImageMaker
+from image_maker.style_adapters import STYLE_ADAPTERS, StyleAdapter, get_style_adapter
+
+
+class StyleSwapImageMaker(DiffusionImageMaker):
+    """
+    SD1.5 base 파이프라인 하나를 여러 그림체가 공유하는 이미지 생성기
+
+    - 텍스트 인코더, VAE, 토크나이저, 스케줄러는 base 것을 그대로 쓰고 그림체마다 UNet만 바꿈
+    - UNet 교체는 새 모듈을 만들지 않고 기존 UNet에 가중치를 복사(load_state_dict)하므로 장치 메모리는 UNet 하나분
+    - 교체용 UNet 가중치(base 포함)는 CPU에 최대 max_cached_unets개까지 두고(LRU), 그 밖의 것은 디스크에서 다시 불러옴
+      (기본값 0: 캐시한 UNet은 모두 상주 메모리라 2개만 두어도 그림체별 파이프라인 두 개보다 RSS가 커짐,
+      전환이 잦고 RAM이 남을 때만 늘릴 것)
+    - LoRA style은 base UNet 위에 adapter를 얹고 set_adapters로 전환 (한 번 불러온 adapter는 계속 둠)
+    - generate_images(style=...)로 요청마다 그림체를 고를 수 있고, 같은 style끼리는 교체 없이 이어서 생성
+    """
+
+    def __init__(
+        self,
+        base_model: str = 'Lykon/dreamshaper-8',
+        styles: Optional[Dict[str, StyleAdapter]] = None,
+        default_style: str = "dream_shaper",
+        max_cached_unets: int = 0
+    ):
+        super().__init__()
+        # 디바이스 설정
+        if torch.cuda.is_available():
+            self.device = torch.device("cuda")
+            dtype = torch.float16
+        elif torch.backends.mps.is_available():
+            self.device = torch.device("mps")
+            dtype = torch.float32
+        else:
+            self.device = torch.device("cpu")
+            dtype = torch.float32
+
+        self.pipe = StableDiffusionPipeline.from_pretrained(base_model, torch_dtype=dtype)
+        self.pipe = self.pipe.to(self.device)
+        self._init_styles(base_model, styles, default_style, max_cached_unets)
+
+    @classmethod
+    def from_pipe(
+        cls,
+        pipe,
+        styles: Optional[Dict[str, StyleAdapter]] = None,
+        default_style: str = "dream_shaper",
+        max_cached_unets: int = 0
+    ):
+        image_maker = super().from_pipe(pipe)
+        image_maker._init_styles(getattr(pipe, "name_or_path", None), styles, default_style, max_cached_unets)
+        return image_maker
+
+    def _init_styles(self, base_model: Optional[str], styles, default_style: str, max_cached_unets: int) -> None:
+        self.base_model = base_model
+        self.styles = dict(styles if styles is not None else STYLE_ADAPTERS)
+        self.max_cached_unets = max_cached_unets
+        self.style: Optional[str] = None
+        # 현재 UNet에 들어 있는 가중치 (None이면 base)
+        self._unet_source: Optional[str] = None
+        # 디스크에서 다시 불러올 수 없는 base UNet 가중치 (from_pipe로 만든 경우에만 CPU에 복사해 둠)
+        self._base_unet_state = None
+        self._unet_states: "OrderedDict[str, Dict[str, torch.Tensor]]" = OrderedDict()
+        self._loaded_loras = set()
+        self._switch_stats = {"switches": 0, "unet_loads": 0, "switch_seconds": 0.0}
+        self._stats_lock = threading.Lock()
+        self.apply_style(default_style)
+
+    def _style(self, name: str) -> StyleAdapter:
+        if name in self.styles:
+            return self.styles[name]
+        return get_style_adapter(name)
+
+    def model_id(self) -> str:
+        return f"{super().model_id()}:{self.style}"
+
+    def _unet_module(self):
+        # torch.compile로 감싼 경우 원래 모듈의 state dict 키를 사용
+        return getattr(self.pipe.unet, "_orig_mod", self.pipe.unet)
+
+    def _load_unet_state(self, source: str) -> Dict[str, torch.Tensor]:
+        """교체용 UNet 가중치를 CPU에 불러옴 (LRU, 가장 오래 안 쓴 것부터 버림)"""
+        if source in self._unet_states:
+            self._unet_states.move_to_end(source)
+            return self._unet_states[source]
+        unet = UNet2DConditionModel.from_pretrained(source, subfolder="unet", torch_dtype=self.pipe.unet.dtype)
+        state = unet.state_dict()
+        self._unet_states[source] = state
+        # 방금 불러온 가중치는 호출 측에서 바로 쓰므로 캐시 크기가 0이어도 반환 후 버려짐
+        while len(self._unet_states) > self.max_cached_unets:
+            self._unet_states.popitem(last=False)
+        with self._stats_lock:
+            self._switch_stats["unet_loads"] += 1
+        return state
+
+    def _swap_unet(self, source: Optional[str]) -> None:
+        if source == self._unet_source:
+            return
+        if self._loaded_loras:
+            # LoRA가 주입된 UNet은 state dict 키가 달라지므로 교체 전에 제거 (다음 LoRA style에서 다시 불러옴)
+            self.pipe.unload_lora_weights()
+            self._loaded_loras.clear()
+        unet = self._unet_module()
+        if not self.base_model and self._base_unet_state is None:
+            self._base_unet_state = {k: v.detach().to("cpu", copy=True) for k, v in unet.state_dict().items()}
+        if source is None:
+            state = self._base_unet_state if not self.base_model else self._load_unet_state(self.base_model)
+        else:
+            state = self._load_unet_state(source)
+        # 같은 구조의 UNet에 가중치만 복사 (장치/dtype/memory format은 기존 모듈 그대로)
+        unet.load_state_dict(state)
+        self._unet_source = source
+
+    def _apply_lora(self, style: StyleAdapter) -> None:
+        if style.lora is None:
+            if self._loaded_loras:
+                self.pipe.disable_lora()
+            return
+        if style.name not in self._loaded_loras:
+            self.pipe.load_lora_weights(style.lora, adapter_name=style.name)
+            self._loaded_loras.add(style.name)
+        self.pipe.enable_lora()
+        self.pipe.set_adapters([style.name], adapter_weights=[style.lora_scale])
+
+    def apply_style(self, name: str) -> None:
+        """그림체 전환 (UNet 가중치 교체 또는 LoRA adapter 전환)"""
+        if name == self.style:
+            return
+        style = self._style(name)
+        with self._generate_lock:
+            start = time.perf_counter()
+            self._swap_unet(style.unet)
+            self._apply_lora(style)
+            # 그림체별 생성 설정 (지정하지 않은 값은 클래스 기본값)
+            self.negative_prompt = style.negative_prompt or type(self).negative_prompt
+            self.max_nsfw_attempts = style.max_nsfw_attempts or type(self).max_nsfw_attempts
+            if self.device.type == "cuda":
+                torch.cuda.synchronize(self.device)
+            elapsed = time.perf_counter() - start
+            previous, self.style = self.style, name
+        with self._stats_lock:
+            self._switch_stats["switches"] += 1
+            self._switch_stats["switch_seconds"] += elapsed
+        if previous is not None:
+            print(f"[style] {previous} -> {name} ({elapsed:.3f}s)")
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            stats = dict(self._switch_stats)
+        stats["cached_unets"] = len(self._unet_states)
+        return stats
+
+    def generate_images(
+        self,
+        prompts: List[str],
+        batch_size: Optional[int] = None,
+        seeds: Optional[List[Optional[int]]] = None,
+        profile: Optional[str] = None,
+        style: Optional[str] = None,
+        preview_keys: Optional[List[Optional[str]]] = None,
+        on_image: Optional[Callable[[int, Image.Image], None]] = None
+    ) -> List[Optional[Image.Image]]:
+        """
+        DiffusionImageMaker.generate_images와 같으며, style을 주면 해당 그림체로 전환한 뒤 생성
+        """
+        with self._generate_lock:
+            if style is not None:
+                self.apply_style(style)
+            return super().generate_images(
+                prompts, batch_size=batch_size, seeds=seeds, profile=profile, preview_keys=preview_keys, on_image=on_image
+            )
+
+    def generate_image(
+        self,
+        prompt: str,
+        seed: Optional[int] = None,
+        profile: Optional[str] = None,
+        style: Optional[str] = None
+    ) -> Image.Image:
+        image = self.generate_images([prompt], batch_size=1, seeds=[seed], profile=profile, style=style)[0]
+        if image is None:
+            raise RuntimeError("이미지 생성 실패")
+        return image
@@ -0,0 +1,164 @@
+import gc
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import psutil
+
+
+class ModelRegistry:
+    """
+    프로세스 전역 모델 레지스트리
+
+    각 백엔드(번역기, 감정 분류기, 이미지 생성기 등)를 최초 요청 시 한 번만 로드하고,
+    이후에는 메모리에 상주하는 인스턴스를 그대로 반환한다.
+    RAM 예산(max_memory_bytes)을 넘으면 가장 오래 사용되지 않은 모델부터 내린다.
+    """
+
+    def __init__(self, max_memory_bytes: Optional[int] = None):
+        """
+        Args:
+            max_memory_bytes (int, optional): 상주 모델 전체의 RAM 예산. None이면 무제한
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self._models: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._process = psutil.Process()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_times: Dict[str, float] = {}
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        key에 해당하는 모델을 반환. 없으면 loader로 로드 후 등록
+
+        Args:
+            key (str): 모델 식별자 (예: "translator:marian")
+            loader (Callable): 모델 인스턴스를 생성하는 함수
+
+        Returns:
+            로드된(혹은 캐시된) 모델 인스턴스
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return entry["model"]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # 같은 모델을 여러 스레드가 동시에 로드하지 않도록 키 단위로 잠금
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return entry["model"]
+                self.misses += 1
+
+            rss_before = self._process.memory_info().rss
+            start = time.perf_counter()
+            model = loader()
+            elapsed = time.perf_counter() - start
+            size = max(self._process.memory_info().rss - rss_before, self._estimate_size(model))
+
+            with self._lock:
+                self._models[key] = {"model": model, "size": size}
+                self.load_times[key] = elapsed
+                self._evict_if_needed(keep=key)
+
+        print(f"[모델 레지스트리] {key} 로드 완료 ({elapsed:.2f}s, {size / 1024 ** 2:.1f}MB)")
+        return model
+
+    def evict(self, key: str) -> None:
+        """지정한 모델을 레지스트리에서 내림"""
+        with self._lock:
+            entry = self._models.pop(key, None)
+        if entry is not None:
+            self._release(key, entry)
+
+    def clear(self) -> None:
+        """상주 중인 모든 모델을 내림"""
+        with self._lock:
+            entries = list(self._models.items())
+            self._models.clear()
+        for key, entry in entries:
+            self._release(key, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """로드 시간, 적중/미스 횟수, 상주 메모리 등 현황 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "resident": list(self._models.keys()),
+                "resident_bytes": sum(entry["size"] for entry in self._models.values()),
+                "max_memory_bytes": self.max_memory_bytes,
+                "load_times": dict(self.load_times),
+            }
+
+    def _evict_if_needed(self, keep: str) -> None:
+        """RAM 예산 초과 시 LRU 순서로 모델 제거 (방금 로드한 모델은 유지)"""
+        if self.max_memory_bytes is None:
+            return
+
+        resident = sum(entry["size"] for entry in self._models.values())
+        for key in list(self._models.keys()):
+            if resident <= self.max_memory_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._models.pop(key)
+            resident -= entry["size"]
+            self.evictions += 1
+            self._release(key, entry)
+
+    @staticmethod
+    def _release(key: str, entry: Dict[str, Any]) -> None:
+        del entry["model"]
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        print(f"[모델 레지스트리] {key} 메모리에서 제거")
+
+    @staticmethod
+    def _estimate_size(model: Any) -> int:
+        """torch 모듈이 포함된 경우 파라미터/버퍼 크기로 메모리 사용량 추정"""
+        try:
+            import torch
+        except ImportError:
+            return 0
+
+        seen = set()
+        total = 0
+        candidates = [model] + list(vars(model).values()) if hasattr(model, "__dict__") else [model]
+        for candidate in candidates:
+            modules = []
+            if isinstance(candidate, torch.nn.Module):
+                modules.append(candidate)
+            elif hasattr(candidate, "components"):
+                # diffusers pipeline
+                modules.extend(c for c in candidate.components.values() if isinstance(c, torch.nn.Module))
+            elif hasattr(candidate, "model") and isinstance(candidate.model, torch.nn.Module):
+                # transformers pipeline
+                modules.append(candidate.model)
+
+            for module in modules:
+                for tensor in list(module.parameters()) + list(module.buffers()):
+                    if id(tensor) in seen:
+                        continue
+                    seen.add(id(tensor))
+                    total += tensor.numel() * tensor.element_size()
+        return total
@@ -0,0 +1,49 @@
+import importlib
+import threading
+from typing import Any, Dict, List
+
+
+class LazyPluginRegistry:
+    """
+    이름 -> "모듈 경로:클래스 이름" 으로 등록하고, 처음 사용할 때 import하는 구현체 목록
+
+    selector가 모든 구현체를 모듈 최상단에서 import하면 번역만 하는 워커도 diffusers/torch import 비용을 치르므로,
+    selector는 이 registry로 요청받은 구현체의 모듈만 import한다.
+    """
+
+    def __init__(self, entries: Dict[str, str], error_message: str = "지원되지 않는 구현체: {name}"):
+        """
+        Args:
+            entries (dict): 이름 -> "package.module:ClassName"
+            error_message (str): 등록되지 않은 이름일 때 ValueError 메시지 ({name}에 요청한 이름)
+        """
+        self._entries = dict(entries)
+        self._error_message = error_message
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def register(self, name: str, target: str) -> None:
+        """구현체 추가 또는 교체 (이미 import한 클래스는 다음 사용 때 다시 import)"""
+        with self._lock:
+            self._entries[name] = target
+            self._loaded.pop(name, None)
+
+    def load(self, name: str):
+        """등록된 클래스를 import해서 반환 (한 번 import한 클래스는 재사용)"""
+        if name not in self._entries:
+            raise ValueError(self._error_message.format(name=name))
+        with self._lock:
+            if name not in self._loaded:
+                module_path, _, attribute = self._entries[name].partition(":")
+                self._loaded[name] = getattr(importlib.import_module(module_path), attribute)
+            return self._loaded[name]
+
+    def create(self, name: str, *args, **kwargs):
+        """등록된 클래스의 인스턴스 생성"""
+        return self.load(name)(*args, **kwargs)
@@ -1,9 +1,12 @@
 from ocr.ocr_interface import OCRInterface
-from ocr.easy_ocr import EasyOCR
+from model_registry.plugin_registry import LazyPluginRegistry
+
+# 다른 OCR 엔진 추가 가능 (예: TesseractReader)
+OCR_READERS = LazyPluginRegistry({
+    "easyocr": "ocr.easy_ocr:EasyOCR",
+}, error_message="Unsupported OCR engine: {name}")
+
 class OCRSelector:
     @staticmethod
     def get_reader(engine: str = 'easyocr') -> OCRInterface:
-        if engine == 'easyocr':
-            return EasyOCR()
-        # 다른 OCR 엔진 추가 가능 (예: TesseractReader)
-        raise ValueError(f"Unsupported OCR engine: {engine}")
\ No newline at end of file
+        return OCR_READERS.create(engine)
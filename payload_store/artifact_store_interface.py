@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+
+
+class ArtifactStoreInterface(ABC):
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> str:
+        """
+        blob 저장
+
+        Returns:
+            str: 나중에 get/delete에 넘길 참조 문자열
+        """
+        pass
+
+    @abstractmethod
+    def get(self, ref: str) -> bytes:
+        """참조 문자열로 blob 읽기"""
+        pass
+
+    @abstractmethod
+    def delete(self, ref: str) -> None:
+        """blob 삭제 (없으면 무시)"""
+        pass
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from payload_store.artifact_store_interface import ArtifactStoreInterface
+from payload_store.local_artifact_store import LocalArtifactStore
+from payload_store.s3_artifact_store import S3ArtifactStore
+
+
+class ArtifactStoreSelector:
+    @staticmethod
+    def get_artifact_store(backend: Optional[str], **kwargs) -> Optional[ArtifactStoreInterface]:
+        """backend가 없으면 None (큰 payload도 압축만 해서 Redis에 저장)"""
+        if not backend or backend == "none":
+            return None
+        if backend == "local":
+            return LocalArtifactStore(**kwargs)
+        if backend == "s3":
+            return S3ArtifactStore(**kwargs)
+        raise ValueError(f"지원되지 않는 artifact store backend: {backend}")
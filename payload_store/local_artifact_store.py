@@ -0,0 +1,59 @@
+import os
+import time
+
+from payload_store.artifact_store_interface import ArtifactStoreInterface
+
+
+class LocalArtifactStore(ArtifactStoreInterface):
+    """로컬 디스크(공유 볼륨)에 blob을 저장하는 artifact store. 모든 워커가 같은 경로를 마운트해야 함"""
+
+    def __init__(self, root_dir: str = "outputs/artifacts"):
+        self.root_dir = root_dir
+
+    def _path(self, ref: str) -> str:
+        path = os.path.normpath(os.path.join(self.root_dir, ref))
+        if not path.startswith(os.path.normpath(self.root_dir) + os.sep):
+            raise ValueError(f"artifact 경로가 저장소 밖을 가리킵니다: {ref}")
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 쓰는 도중에 다른 워커가 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return key
+
+    def get(self, ref: str) -> bytes:
+        with open(self._path(ref), "rb") as f:
+            return f.read()
+
+    def delete(self, ref: str) -> None:
+        try:
+            os.remove(self._path(ref))
+        except FileNotFoundError:
+            pass
+
+    def purge_older_than(self, max_age_seconds: float) -> int:
+        """
+        max_age_seconds보다 오래된 blob 삭제 (task 해시 TTL과 맞춰 주기적으로 호출)
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        if not os.path.isdir(self.root_dir):
+            return 0
+        deadline = time.time() - max_age_seconds
+        removed = 0
+        for dir_path, _, file_names in os.walk(self.root_dir):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                try:
+                    if os.path.getmtime(path) < deadline:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
@@ -0,0 +1,15 @@
+from prometheus_client import Counter
+
+# task 해시에 저장하려던 원본 payload 크기 (압축 전)
+PAYLOAD_RAW_BYTES = Counter(
+    "task_payload_raw_bytes_total",
+    "Uncompressed size of task payloads/results written by the pipeline",
+    ["field"]
+)
+
+# 실제로 저장된 크기, 위치(redis / artifact)별
+PAYLOAD_STORED_BYTES = Counter(
+    "task_payload_stored_bytes_total",
+    "Stored size of task payloads/results after compression or spill",
+    ["field", "location"]
+)
@@ -0,0 +1,175 @@
+import base64
+import zlib
+from typing import Any, Dict, Optional
+
+import redis
+
+from payload_store.artifact_store_interface import ArtifactStoreInterface
+from payload_store.payload_metrics import PAYLOAD_RAW_BYTES, PAYLOAD_STORED_BYTES
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SPILL_PREFIX = "ref+"
+
+
+class PayloadStore:
+    """
+    task 해시의 payload/result 필드를 크기에 따라 압축하거나 artifact store로 내보내는 저장소
+
+    - compress_threshold 이상: codec(zlib / zstd)으로 압축해 해시에 저장
+    - spill_threshold 이상 (압축 후 기준): artifact store(로컬 / S3)에 저장하고 해시에는 참조만 저장
+    - 인코딩은 '{field}Encoding' 필드에 기록하므로 인코딩 필드가 없는 기존 작업(서버 등록 등)은 그대로 읽힘
+    - 끝난 task 해시에는 TTL을 걸어 Redis 메모리가 끝없이 늘지 않도록 함
+
+    Redis 클라이언트가 decode_responses=True이므로 압축 바이트는 base85 문자열로 저장한다.
+    """
+
+    def __init__(
+        self,
+        r: redis.Redis,
+        artifact_store: Optional[ArtifactStoreInterface] = None,
+        codec: str = "zlib",
+        compress_threshold: int = 4096,
+        spill_threshold: int = 1024 * 1024,
+        finished_ttl: int = 86400,
+        task_prefix: str = "task:",
+        stats_prefix: str = "payload_stats:"
+    ):
+        """
+        Args:
+            artifact_store (optional): 큰 payload를 내보낼 저장소 (None이면 압축만 하고 Redis에 저장)
+            codec (str): zlib / zstd (zstd는 zstandard 패키지 필요)
+            compress_threshold (int): 이 크기(바이트) 이상인 payload만 압축
+            spill_threshold (int): 압축 후 이 크기(바이트) 이상이면 artifact store로 내보냄
+            finished_ttl (int): 끝난 task 해시와 파이프라인 통계의 만료 시간(초)
+        """
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("zstd codec을 사용하려면 zstandard 패키지가 필요합니다")
+        if codec not in ("zlib", "zstd"):
+            raise ValueError(f"지원되지 않는 payload codec: {codec}")
+        self.r = r
+        self.artifact_store = artifact_store
+        self.codec = codec
+        self.compress_threshold = compress_threshold
+        self.spill_threshold = spill_threshold
+        self.finished_ttl = finished_ttl
+        self.task_prefix = task_prefix
+        self.stats_prefix = stats_prefix
+
+    def stats_key(self, pipeline_id: str) -> str:
+        return f"{self.stats_prefix}{pipeline_id}"
+
+    def _compress(self, data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return zlib.compress(data, 6)
+
+    def _decompress(self, data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd로 압축된 payload를 읽으려면 zstandard 패키지가 필요합니다")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def pack(self, step_id: str, pipeline_id: str, value: Any, field: str = "payload", pipe=None) -> Dict[str, str]:
+        """
+        task 해시에 넣을 필드로 변환 (작은 값은 그대로)
+
+        Args:
+            step_id (str): 값을 저장할 task의 step id (artifact 경로와 메모리 집계에 사용)
+            value: 저장할 값 (문자열이 아니면 str로 변환)
+            field (str): 해시 필드 이름 (payload / result)
+            pipe (optional): 파이프라인별 집계를 넣을 호출 측 pipeline/트랜잭션 (None이면 바로 실행)
+                task 해시를 쓰는 MULTI/EXEC에 함께 넣으면 왕복이 늘지 않고 집계도 task와 원자적으로 기록됨
+
+        Returns:
+            dict: task 해시에 그대로 합칠 필드 ({field: 값[, f"{field}Encoding": 인코딩]})
+        """
+        text = value if isinstance(value, str) else str(value)
+        raw = text.encode("utf-8")
+        fields = {field: text}
+        location = "redis"
+        stored_bytes = len(raw)
+
+        if len(raw) >= self.compress_threshold:
+            compressed = self._compress(raw, self.codec)
+            if self.artifact_store is not None and len(compressed) >= self.spill_threshold:
+                ref = self.artifact_store.put(f"{pipeline_id}/{step_id}/{field}.{self.codec}", compressed)
+                fields = {field: ref, f"{field}Encoding": f"{SPILL_PREFIX}{self.codec}"}
+                location = "artifact"
+                stored_bytes = len(compressed)
+            else:
+                encoded = base64.b85encode(compressed).decode("ascii")
+                # 압축 효과가 없으면(이미 압축된 데이터 등) 원본 그대로 저장
+                if len(encoded) < len(raw):
+                    fields = {field: encoded, f"{field}Encoding": self.codec}
+                    stored_bytes = len(encoded)
+
+        PAYLOAD_RAW_BYTES.labels(field=field).inc(len(raw))
+        PAYLOAD_STORED_BYTES.labels(field=field, location=location).inc(stored_bytes)
+
+        # 파이프라인별 집계 (리포트용), 통계 키도 task 해시와 같은 TTL
+        stats_key = self.stats_key(pipeline_id)
+        execute = pipe is None
+        pipe = self.r.pipeline(transaction=False) if execute else pipe
+        pipe.hincrby(stats_key, "rawBytes", len(raw))
+        pipe.hincrby(stats_key, "redisBytes" if location == "redis" else "artifactBytes", stored_bytes)
+        pipe.hincrby(stats_key, "values", 1)
+        pipe.expire(stats_key, self.finished_ttl)
+        pipe.sadd(f"{stats_key}:tasks", f"{self.task_prefix}{step_id}")
+        pipe.expire(f"{stats_key}:tasks", self.finished_ttl)
+        if execute:
+            pipe.execute()
+        return fields
+
+    def unpack(self, task_data: Dict[str, str], field: str = "payload") -> Optional[str]:
+        """task 해시에서 읽은 필드를 원래 문자열로 복원"""
+        value = task_data.get(field)
+        encoding = task_data.get(f"{field}Encoding")
+        if value is None or not encoding:
+            return value
+        if encoding.startswith(SPILL_PREFIX):
+            if self.artifact_store is None:
+                raise ValueError(f"artifact store 없이 내보낸 payload를 읽을 수 없습니다: {value}")
+            compressed = self.artifact_store.get(value)
+            codec = encoding[len(SPILL_PREFIX):]
+        else:
+            compressed = base64.b85decode(value)
+            codec = encoding
+        return self._decompress(compressed, codec).decode("utf-8")
+
+    def mark_finished(self, step_id: str, pipe=None) -> None:
+        """끝난(완료/실패) task 해시에 TTL 설정"""
+        client = pipe if pipe is not None else self.r
+        client.expire(f"{self.task_prefix}{step_id}", self.finished_ttl)
+
+    def pipeline_report(self, pipeline_id: str) -> Dict[str, int]:
+        """
+        파이프라인의 payload 저장량 리포트
+
+        Returns:
+            dict: raw_bytes(압축 전), redis_bytes(Redis에 저장된 값), artifact_bytes(내보낸 값),
+                  saved_bytes(Redis에서 절약한 양), redis_memory_bytes(아직 남은 task 해시의 MEMORY USAGE 합계)
+        """
+        stats_key = self.stats_key(pipeline_id)
+        stats = {k: int(v) for k, v in self.r.hgetall(stats_key).items()}
+        task_keys = list(self.r.smembers(f"{stats_key}:tasks"))
+
+        pipe = self.r.pipeline(transaction=False)
+        for task_key in task_keys:
+            pipe.memory_usage(task_key)
+        redis_memory = sum(usage or 0 for usage in pipe.execute()) if task_keys else 0
+
+        raw_bytes = stats.get("rawBytes", 0)
+        redis_bytes = stats.get("redisBytes", 0)
+        return {
+            "values": stats.get("values", 0),
+            "raw_bytes": raw_bytes,
+            "redis_bytes": redis_bytes,
+            "artifact_bytes": stats.get("artifactBytes", 0),
+            "saved_bytes": raw_bytes - redis_bytes,
+            "redis_memory_bytes": redis_memory
+        }
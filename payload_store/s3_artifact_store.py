@@ -0,0 +1,24 @@
+from payload_store.artifact_store_interface import ArtifactStoreInterface
+
+
+class S3ArtifactStore(ArtifactStoreInterface):
+    """
+    S3 버킷에 blob을 저장하는 artifact store
+    만료는 버킷의 lifecycle 규칙(prefix 기준)으로 task 해시 TTL과 맞춰 설정
+    """
+
+    def __init__(self, s3_client, bucket: str, prefix: str = "task-payloads/"):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def put(self, key: str, data: bytes) -> str:
+        ref = f"{self.prefix}{key}"
+        self.s3_client.put_object(Bucket=self.bucket, Key=ref, Body=data, ContentType="application/octet-stream")
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        return self.s3_client.get_object(Bucket=self.bucket, Key=ref)["Body"].read()
+
+    def delete(self, ref: str) -> None:
+        self.s3_client.delete_object(Bucket=self.bucket, Key=ref)
@@ -1,9 +1,10 @@
-from prompt_maker.llama_prompt_maker import LlamaPromptMaker
+from model_registry.plugin_registry import LazyPluginRegistry
+
+PROMPT_MAKERS = LazyPluginRegistry({
+    "llama": "prompt_maker.llama_prompt_maker:LlamaPromptMaker",
+}, error_message="지원되지 않는 모델 타입: {name}")
 
 class PromptMakerSelector:
     @staticmethod
     def get_prompt_maker(model_type: str):
-        if model_type == "llama":
-            return LlamaPromptMaker()
-        else:
-            raise ValueError(f"지원되지 않는 모델 타입: {model_type}")
+        return PROMPT_MAKERS.create(model_type)
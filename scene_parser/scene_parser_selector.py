@@ -1,12 +1,11 @@
-from scene_parser.basic_scene_parser import BasicSceneParser
-from scene_parser.llama_scene_parser import LlamaSceneParser
+from model_registry.plugin_registry import LazyPluginRegistry
+
+SCENE_PARSERS = LazyPluginRegistry({
+    "basic": "scene_parser.basic_scene_parser:BasicSceneParser",
+    "llama": "scene_parser.llama_scene_parser:LlamaSceneParser",
+}, error_message="지원되지 않는 parser_type: {name}")
 
 class SceneParserSelector:
     @staticmethod
     def get_parser(parser_type: str):
-        if parser_type == "basic":
-            return BasicSceneParser()
-        if parser_type == "llama":
-            return LlamaSceneParser()
-        else:
-            raise ValueError(f"지원되지 않는 parser_type: {parser_type}")
+        return SCENE_PARSERS.create(parser_type)
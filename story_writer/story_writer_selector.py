@@ -1,10 +1,12 @@
 from story_writer.story_writer_interface import StoryWriterInterface
-from story_writer.llama_story_writer import LlamaStoryWriter
+from model_registry.plugin_registry import LazyPluginRegistry
+
+# 다른 작성기 추가 가능 (예: "gpt", "claude")
+STORY_WRITERS = LazyPluginRegistry({
+    "llama": "story_writer.llama_story_writer:LlamaStoryWriter",
+}, error_message="Unsupported writer type: {name}")
 
 class StoryWriterSelector:
     @staticmethod
     def get_writer(writer_type: str = "llama", **kwargs) -> StoryWriterInterface:
-        if writer_type == "llama":
-            return LlamaStoryWriter(**kwargs)
-        # 다른 작성기 추가 가능 (예: "gpt", "claude")
-        raise ValueError(f"Unsupported writer type: {writer_type}")
\ No newline at end of file
+        return STORY_WRITERS.create(writer_type, **kwargs)
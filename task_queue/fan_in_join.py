@@ -0,0 +1,134 @@
+import time
+from typing import Any, Dict, List, Tuple
+
+import redis
+
+from task_queue.task_queue_interface import TaskQueueInterface
+
+# KEYS: join 키 / ARGV: 완료된 branch, task_prefix, 다음 step id, push 명령 인자 수, push 명령..., 해시 필드(k, v)...
+# 남은 branch 집합에서 완료 branch를 빼고, 마지막 branch였다면 같은 스크립트 안에서 다음 step을 등록
+# (재시도로 같은 branch가 두 번 완료돼도 SREM이 0을 반환하므로 다음 step은 한 번만 등록됨)
+_COMPLETE_LUA = """
+if redis.call('SREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+if redis.call('SCARD', KEYS[1]) > 0 then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+
+local step_id = ARGV[3]
+local push_argc = tonumber(ARGV[4])
+local push = {}
+for i = 5, 4 + push_argc do
+    table.insert(push, ARGV[i])
+end
+local fields = {}
+for i = 5 + push_argc, #ARGV do
+    table.insert(fields, ARGV[i])
+end
+
+redis.call('HSET', ARGV[2] .. step_id, unpack(fields))
+push_step(ARGV[2] .. step_id, step_id, push)
+return 1
+"""
+
+# KEYS: join 키 / ARGV: 나눌 branch, 하위 branch...
+# branch가 아직 남아 있을 때만 하위 branch들로 교체 (SADD 후 SREM이라 집합이 잠시라도 비지 않음)
+_EXPAND_LUA = """
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+for i = 2, #ARGV do
+    redis.call('SADD', KEYS[1], ARGV[i])
+end
+redis.call('SREM', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class FanInJoin:
+    """
+    분기된 branch들이 모두 끝났을 때 다음 step을 자동으로 등록하는 fan-in join
+
+    - register: fan-out 시점에 파이프라인별로 남은 branch 집합을 만듦
+    - expand: 나중에야 개수가 정해지는 branch(예: 장면별 이미지 생성)를 하위 branch들로 교체
+    - complete: branch가 끝날 때마다 집합에서 원자적으로 제거하고, 마지막 branch면 다음 step을 큐에 등록
+
+    polling이나 수동 트리거 없이 가장 느린 branch가 끝나는 즉시 다음 step이 시작된다.
+    """
+
+    def __init__(self, r: redis.Redis, queue: TaskQueueInterface, key_prefix: str = "join:", ttl_seconds: int = 86400):
+        """
+        Args:
+            queue: 다음 step을 등록할 작업 큐
+            ttl_seconds (int): 끝내 완료되지 않은 join 키의 만료 시간(초)
+        """
+        self.r = r
+        self.queue = queue
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self._complete_script = r.register_script(queue.PUSH_STEP_LUA + _COMPLETE_LUA)
+        self._expand_script = r.register_script(_EXPAND_LUA)
+
+    def join_key(self, pipeline_id: str) -> str:
+        return f"{self.key_prefix}{pipeline_id}"
+
+    def register(self, pipeline_id: str, branches: List[Any], pipe=None) -> None:
+        """
+        파이프라인의 남은 branch 집합 생성
+
+        Args:
+            branches (list): branch 식별자 목록 (예: step order)
+            pipe (optional): 전달하면 명령만 추가 (fan-out enqueue와 같은 트랜잭션으로 묶을 때)
+        """
+        execute = pipe is None
+        pipe = self.r.pipeline(transaction=True) if execute else pipe
+        key = self.join_key(pipeline_id)
+        pipe.delete(key)
+        pipe.sadd(key, *[str(branch) for branch in branches])
+        pipe.expire(key, self.ttl_seconds)
+        if execute:
+            pipe.execute()
+
+    def expand(self, pipeline_id: str, branch: Any, sub_branches: List[Any], pipe=None) -> None:
+        """
+        branch 하나를 하위 branch들로 교체 (branch가 이미 없으면 아무것도 하지 않음)
+
+        Args:
+            branch: 교체할 branch 식별자
+            sub_branches (list): 새 branch 식별자 목록. 비어 있으면 안 됨 (그 경우 complete 사용)
+            pipe (optional): 전달하면 명령만 추가 (하위 task enqueue와 같은 트랜잭션으로 묶을 때)
+        """
+        if not sub_branches:
+            raise ValueError("sub_branches가 비어 있습니다. branch를 끝내려면 complete를 사용하세요")
+        self._expand_script(
+            keys=[self.join_key(pipeline_id)],
+            args=[str(branch), *[str(sub_branch) for sub_branch in sub_branches]],
+            client=pipe
+        )
+
+    def complete(self, pipeline_id: str, branch: Any, next_task: Tuple[str, Dict[str, Any]]) -> bool:
+        """
+        branch 완료 처리. 마지막 branch라면 next_task를 큐에 등록
+
+        Args:
+            branch: 완료된 branch 식별자
+            next_task (tuple): 모든 branch가 끝났을 때 등록할 (step id, task 해시 필드). 필드에 'order' 필수
+
+        Returns:
+            bool: 이 호출로 next_task가 등록됐는지 여부
+        """
+        step_id, mapping = next_task
+        push = self.queue.push_command(mapping["order"], mapping)
+        fields = [str(item) for pair in {**mapping, "enqueuedAt": time.time()}.items() for item in pair]
+
+        fired = self._complete_script(
+            keys=[self.join_key(pipeline_id)],
+            args=[str(branch), self.queue.task_prefix, step_id, len(push), *push, *fields]
+        )
+        return bool(fired)
+
+    def remaining(self, pipeline_id: str) -> List[str]:
+        """아직 끝나지 않은 branch 목록"""
+        return sorted(self.r.smembers(self.join_key(pipeline_id)))
@@ -0,0 +1,157 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from task_queue.reliable_list_task_queue import ReliableListTaskQueue
+
+# 우선순위 클래스별 점수 보정(초). 값이 작을수록 먼저 처리
+# 보정 폭만큼 기다린 낮은 우선순위 작업은 새로 들어온 높은 우선순위 작업보다 앞서게 됨 (aging)
+PRIORITY_CLASSES = {
+    "interactive": -300.0,
+    "normal": 0.0,
+    "bulk": 300.0,
+}
+DEFAULT_PRIORITY = "normal"
+
+# stage 대기열 조작 Lua 함수 (sorted set: 점수가 가장 낮은 step부터 꺼냄)
+# 재시도/반납 시에는 처음 등록할 때 계산한 점수를 그대로 사용해 원래 순번을 유지
+_ZSET_STAGE_QUEUE_LUA = """
+local function pop_stage(key)
+    local popped = redis.call('ZPOPMIN', key)
+    if popped[1] then
+        return popped[1]
+    end
+    return false
+end
+
+local function push_stage(queue_name, task_key, step_id, front)
+    local key = queue_name .. ':' .. (redis.call('HGET', task_key, 'order') or '')
+    local score = redis.call('HGET', task_key, 'score') or '0'
+    redis.call('ZADD', key, score, step_id)
+end
+"""
+
+# tenant마다 가상 시각을 두고 작업 하나당 단위 시간만큼 전진시켜, 한 tenant가 한꺼번에 넣은 작업이
+# 다른 tenant의 작업과 번갈아 처리되도록 함 (start-time fair queuing)
+# 계산한 점수는 task 해시에도 저장해 재시도/반납 시 같은 순번으로 돌아가게 함
+_FAIR_SHARE_LUA = """
+local function fair_share_push(stage_key, vtime_key, task_key, step_id, tenant, now, offset, quantum, ttl)
+    local virtual_time = tonumber(redis.call('HGET', vtime_key, tenant) or '0')
+    local start = math.max(tonumber(now), virtual_time)
+    redis.call('HSET', vtime_key, tenant, start + tonumber(quantum))
+    redis.call('EXPIRE', vtime_key, ttl)
+
+    local score = start + tonumber(offset)
+    redis.call('HSET', task_key, 'score', score)
+    redis.call('ZADD', stage_key, score, step_id)
+    return tostring(score)
+end
+"""
+
+# KEYS: stage 대기열, tenant별 가상 시각 해시, task 해시
+# ARGV: step_id, tenant, 현재 시각, 우선순위 보정, fair-share 단위 시간, 가상 시각 TTL, 해시 필드(k, v)...
+_ENQUEUE_LUA = _FAIR_SHARE_LUA + """
+local fields = {}
+for i = 7, #ARGV do
+    table.insert(fields, ARGV[i])
+end
+redis.call('HSET', KEYS[3], unpack(fields))
+return fair_share_push(KEYS[1], KEYS[2], KEYS[3], ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5], ARGV[6])
+"""
+
+# push_command 결과로 등록 (join으로 등록되는 step도 enqueue와 같은 점수 계산)
+_PUSH_FAIR_SHARE_LUA = _FAIR_SHARE_LUA + """
+local function push_step(task_key, step_id, push)
+    return fair_share_push(push[1], push[2], task_key, step_id, push[3], push[4], push[5], push[6], push[7])
+end
+"""
+
+
+class PriorityTaskQueue(ReliableListTaskQueue):
+    """
+    우선순위 클래스 + tenant별 fair-share 스케줄링을 하는 작업 큐
+
+    stage 대기열을 sorted set으로 두고, 점수 = max(현재 시각, tenant 가상 시각) + 우선순위 보정 으로 정렬한다.
+    - 우선순위: interactive / normal / bulk (task 해시의 priority 필드)
+    - fair-share: tenant(task 해시의 tenantId 필드)마다 작업 하나당 fair_share_quantum초씩 가상 시각을 전진시켜,
+      200개를 한꺼번에 넣은 tenant가 다른 사용자의 작업을 막지 않도록 함
+    - aging: 점수가 등록 시각 기준이므로 오래 기다린 bulk 작업도 결국 앞으로 나옴
+
+    claim/lease/heartbeat/재시도는 ReliableListTaskQueue와 동일하다.
+    """
+
+    STAGE_QUEUE_LUA = _ZSET_STAGE_QUEUE_LUA
+    PUSH_STEP_LUA = _PUSH_FAIR_SHARE_LUA
+
+    def __init__(
+        self,
+        r: redis.Redis,
+        queue_name: str = "priority_queue",
+        fair_share_quantum: float = 30.0,
+        virtual_time_ttl: int = 86400,
+        **kwargs
+    ):
+        """
+        Args:
+            fair_share_quantum (float): tenant가 작업 하나를 등록할 때마다 가상 시각이 전진하는 양(초)
+            virtual_time_ttl (int): tenant 가상 시각 해시의 만료 시간(초)
+        """
+        super().__init__(r, queue_name=queue_name, **kwargs)
+        self.fair_share_quantum = fair_share_quantum
+        self.virtual_time_ttl = virtual_time_ttl
+        self._enqueue_script = r.register_script(_ENQUEUE_LUA)
+
+    def virtual_time_key(self, stage: int) -> str:
+        return f"{self.queue_name}:vtime:{stage}"
+
+    def enqueue(self, step_id: str, stage: int) -> None:
+        self.enqueue_tasks([(step_id, {"order": stage})])
+
+    def enqueue_tasks(self, tasks: List[Tuple[str, Dict[str, Any]]], pipe=None) -> None:
+        execute = pipe is None
+        pipe = self.r.pipeline(transaction=True) if execute else pipe
+        now = time.time()
+        for step_id, mapping in tasks:
+            push = self.push_command(mapping["order"], mapping, now)
+            fields = {**mapping, "priority": mapping.get("priority") or DEFAULT_PRIORITY, "enqueuedAt": now}
+
+            self._enqueue_script(
+                keys=[push[0], push[1], f"{self.task_prefix}{step_id}"],
+                args=[step_id, *push[2:], *[str(item) for pair in fields.items() for item in pair]],
+                client=pipe
+            )
+        if execute:
+            pipe.execute()
+
+    def push_command(self, stage: int, mapping: Optional[Dict[str, Any]] = None, now: Optional[float] = None) -> List[str]:
+        # join으로 등록되는 step도 enqueue와 같은 fair-share 점수로 등록
+        # (stage 대기열, 가상 시각 해시, tenant, 현재 시각, 우선순위 보정, 단위 시간, TTL)
+        mapping = mapping or {}
+        priority = mapping.get("priority") or DEFAULT_PRIORITY
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"지원되지 않는 우선순위: {priority} (가능한 값: {list(PRIORITY_CLASSES)})")
+        tenant = mapping.get("tenantId") or mapping.get("pipelineId") or ""
+        return [
+            self.stage_key(stage), self.virtual_time_key(stage), str(tenant), repr(time.time() if now is None else now),
+            repr(PRIORITY_CLASSES[priority]), repr(self.fair_share_quantum), str(self.virtual_time_ttl)
+        ]
+
+    def _wait_for_step(self, stage_key: str, wait: float) -> Optional[str]:
+        # sorted set에는 processing 리스트로 원자적으로 옮기며 대기하는 명령이 없으므로 polling
+        # (BZPOPMIN은 꺼낸 뒤 lease 등록 전에 워커가 죽으면 step이 사라짐)
+        time.sleep(min(self.poll_interval, wait))
+        return None
+
+    def queue_depths(self, stage: int) -> Dict[str, int]:
+        """stage 대기열의 우선순위 클래스별 대기 작업 수"""
+        step_ids = self.r.zrange(self.stage_key(stage), 0, -1)
+        depths = {priority: 0 for priority in PRIORITY_CLASSES}
+        if not step_ids:
+            return depths
+        pipe = self.r.pipeline()
+        for step_id in step_ids:
+            pipe.hget(f"{self.task_prefix}{step_id}", "priority")
+        for priority in pipe.execute():
+            depths[priority or DEFAULT_PRIORITY] = depths.get(priority or DEFAULT_PRIORITY, 0) + 1
+        return depths
@@ -0,0 +1,23 @@
+import time
+from typing import Dict
+
+from prometheus_client import Histogram
+
+# 큐 대기 시간 (등록 → claim), stage와 우선순위 클래스별
+QUEUE_WAIT_SECONDS = Histogram(
+    "task_queue_wait_seconds",
+    "Time a step spent waiting in the task queue before being claimed",
+    ["stage", "priority"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+)
+
+
+def observe_queue_wait(task_data: Dict[str, str]) -> None:
+    """task 해시의 enqueuedAt 기준으로 대기 시간을 기록 (enqueuedAt이 없는 작업은 건너뜀)"""
+    enqueued_at = task_data.get("enqueuedAt")
+    if not enqueued_at:
+        return
+    QUEUE_WAIT_SECONDS.labels(
+        stage=task_data.get("order", ""),
+        priority=task_data.get("priority") or "normal"
+    ).observe(max(0.0, time.time() - float(enqueued_at)))
@@ -0,0 +1,349 @@
+import socket
+import threading
+import time
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from task_queue.task_queue_interface import TaskQueueInterface
+
+# stage 대기열 조작 Lua 함수 (list: 왼쪽으로 넣고 오른쪽에서 꺼내는 FIFO)
+# stage 대기열은 task 해시의 order로 결정: {queue_name}:{order}
+_LIST_STAGE_QUEUE_LUA = """
+local function pop_stage(key)
+    return redis.call('RPOP', key)
+end
+
+local function push_stage(queue_name, task_key, step_id, front)
+    local key = queue_name .. ':' .. (redis.call('HGET', task_key, 'order') or '')
+    if front then
+        -- 재시도 step은 대기열 맨 앞(다음에 꺼내질 위치)으로
+        redis.call('RPUSH', key, step_id)
+    else
+        redis.call('LPUSH', key, step_id)
+    end
+end
+"""
+
+# 실패한 step 하나를 해당 stage 대기열(혹은 dead letter)로 되돌리는 공통 Lua 함수
+# dead letter로 옮긴 task 해시에는 dead_ttl(초, 0이면 만료 없음)을 걸어 payload가 Redis에 계속 남지 않도록 함
+_RETRY_LUA = """
+local function retry(step_id, source, queue_name, leases, dead, task_prefix, max_retries, dead_ttl)
+    redis.call('LREM', source, 0, step_id)
+    redis.call('ZREM', leases, step_id)
+    local task_key = task_prefix .. step_id
+    local retries = redis.call('HINCRBY', task_key, 'retries', 1)
+    redis.call('HDEL', task_key, 'workerId')
+    if retries > max_retries then
+        redis.call('HSET', task_key, 'status', 'failed')
+        redis.call('LPUSH', dead, step_id)
+        if dead_ttl > 0 then
+            redis.call('EXPIRE', task_key, dead_ttl)
+        end
+    else
+        redis.call('HSET', task_key, 'status', 'queued')
+        push_stage(queue_name, task_key, step_id, true)
+    end
+    return retries
+end
+"""
+
+# KEYS: stage 대기열들(우선순위 순), processing, leases / ARGV: lease 만료 시각, worker_id, task_prefix
+_CLAIM_LUA = """
+local processing, leases = KEYS[#KEYS - 1], KEYS[#KEYS]
+for i = 1, #KEYS - 2 do
+    local step_id = pop_stage(KEYS[i])
+    if step_id then
+        redis.call('LPUSH', processing, step_id)
+        redis.call('ZADD', leases, ARGV[1], step_id)
+        redis.call('HSET', ARGV[3] .. step_id, 'workerId', ARGV[2])
+        return step_id
+    end
+end
+return false
+"""
+
+# KEYS: processing, leases / ARGV: lease 만료 시각, worker_id, task_prefix, step_id
+# BLMOVE로 processing 리스트에 옮겨진 step의 lease/소유 워커 등록
+# (이 사이에 워커가 죽어도 step은 processing 리스트에 남아 reclaim이 회수)
+_LEASE_LUA = """
+redis.call('ZADD', KEYS[2], ARGV[1], ARGV[4])
+redis.call('HSET', ARGV[3] .. ARGV[4], 'workerId', ARGV[2])
+return 1
+"""
+
+# ack/nack/release 공통: lease 만료로 회수돼 다른 워커가 가져간 step이면 아무것도 건드리지 않음
+_OWNER_CHECK_LUA = """
+local function owned(task_key, worker_id)
+    return redis.call('HGET', task_key, 'workerId') == worker_id
+end
+"""
+
+# KEYS: processing, leases / ARGV: step_id, task_prefix, worker_id
+_ACK_LUA = _OWNER_CHECK_LUA + """
+local task_key = ARGV[2] .. ARGV[1]
+if not owned(task_key, ARGV[3]) then
+    return 0
+end
+redis.call('LREM', KEYS[1], 0, ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', task_key, 'workerId')
+return 1
+"""
+
+# KEYS: processing, leases, dead / ARGV: step_id, task_prefix, max_retries, queue_name, worker_id, dead_ttl
+_NACK_LUA = _RETRY_LUA + _OWNER_CHECK_LUA + """
+if not owned(ARGV[2] .. ARGV[1], ARGV[5]) then
+    return false
+end
+return retry(ARGV[1], KEYS[1], ARGV[4], KEYS[2], KEYS[3], ARGV[2], tonumber(ARGV[3]), tonumber(ARGV[6]))
+"""
+
+# KEYS: processing, leases / ARGV: step_id, task_prefix, queue_name, worker_id
+_RELEASE_LUA = _OWNER_CHECK_LUA + """
+local task_key = ARGV[2] .. ARGV[1]
+if not owned(task_key, ARGV[4]) then
+    return 0
+end
+redis.call('LREM', KEYS[1], 0, ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HSET', task_key, 'status', 'queued')
+redis.call('HDEL', task_key, 'workerId')
+push_stage(ARGV[3], task_key, ARGV[1], false)
+return 1
+"""
+
+# KEYS: leases, dead, workers / ARGV: now, task_prefix, max_retries, queue_name, dead_ttl
+_RECLAIM_LUA = _RETRY_LUA + """
+local leases, dead, workers = KEYS[1], KEYS[2], KEYS[3]
+local task_prefix, max_retries, queue_name, dead_ttl = ARGV[2], tonumber(ARGV[3]), ARGV[4], tonumber(ARGV[5])
+local reclaimed = {}
+
+-- 1) heartbeat가 끊겨 lease가 만료된 step
+for _, step_id in ipairs(redis.call('ZRANGEBYSCORE', leases, '-inf', ARGV[1])) do
+    local worker_id = redis.call('HGET', task_prefix .. step_id, 'workerId')
+    local source = queue_name .. ':processing:' .. (worker_id or '')
+    retry(step_id, source, queue_name, leases, dead, task_prefix, max_retries, dead_ttl)
+    table.insert(reclaimed, step_id)
+end
+
+-- 2) 죽은 워커의 processing 리스트에 남은 step
+for _, worker_id in ipairs(redis.call('SMEMBERS', workers)) do
+    if redis.call('EXISTS', queue_name .. ':worker:' .. worker_id) == 0 then
+        local source = queue_name .. ':processing:' .. worker_id
+        for _, step_id in ipairs(redis.call('LRANGE', source, 0, -1)) do
+            retry(step_id, source, queue_name, leases, dead, task_prefix, max_retries, dead_ttl)
+            table.insert(reclaimed, step_id)
+        end
+        redis.call('DEL', source)
+        redis.call('SREM', workers, worker_id)
+    end
+end
+return reclaimed
+"""
+
+
+class ReliableListTaskQueue(TaskQueueInterface):
+    """
+    Redis list 기반 at-least-once 작업 큐 (stage별 대기열)
+
+    - enqueue: step order(stage)별 대기열 {queue_name}:{stage}에 등록
+    - claim: 담당 stage 대기열을 우선순위 순으로 확인해, 첫 step을 워커별 processing 리스트로 옮기고
+      lease(만료 시각)를 등록 (Lua로 원자적으로 처리). 모두 비어 있으면 가장 우선순위가 높은 stage 대기열에서
+      BLMOVE로 대기
+    - ack/nack/release: task 해시의 workerId가 자신일 때만 처리 (회수 후 늦게 도착한 응답은 무시)
+    - heartbeat: 백그라운드 스레드가 처리 중인 step의 lease와 워커 생존 키를 주기적으로 연장
+    - reclaim: lease가 만료됐거나 워커가 죽은 step을 재시도 횟수를 올려 원래 stage 대기열로 되돌림
+    - max_retries를 넘긴 step은 dead letter 리스트로 이동하고 status를 failed로 표시
+
+    프로세스가 step 도중 죽어도 해당 step만 다시 실행되고, 앞선 step은 다시 돌지 않는다.
+    """
+
+    # stage 대기열 자료구조를 정의하는 Lua 함수 (pop_stage, push_stage). 하위 클래스에서 교체 가능
+    STAGE_QUEUE_LUA = _LIST_STAGE_QUEUE_LUA
+
+    def __init__(
+        self,
+        r: redis.Redis,
+        queue_name: str = "task_queue",
+        stages: Optional[List[int]] = None,
+        worker_id: Optional[str] = None,
+        visibility_timeout: float = 60,
+        max_retries: int = 3,
+        task_prefix: str = "task:",
+        poll_interval: float = 0.1,
+        dead_letter_ttl: Optional[int] = None,
+    ):
+        """
+        Args:
+            stages (list, optional): claim할 stage 목록 (앞쪽일수록 우선). enqueue만 하는 경우 생략
+            poll_interval (float): 여러 stage를 담당할 때 첫 stage 대기열에서 대기하다 나머지 stage를
+                다시 확인하기까지의 간격(초). stage가 하나면 timeout 동안 계속 대기
+            dead_letter_ttl (int, optional): dead letter로 옮긴 task 해시의 만료 시간(초). None이면 만료 없음
+        """
+        self.r = r
+        self.queue_name = queue_name
+        self.stages = list(stages or [])
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.visibility_timeout = visibility_timeout
+        self.max_retries = max_retries
+        self.task_prefix = task_prefix
+        self.poll_interval = poll_interval
+        self.dead_letter_ttl = dead_letter_ttl
+
+        self.processing_key = f"{queue_name}:processing:{self.worker_id}"
+        self.leases_key = f"{queue_name}:leases"
+        self.dead_key = f"{queue_name}:dead"
+        self.workers_key = f"{queue_name}:workers"
+        self.alive_key = f"{queue_name}:worker:{self.worker_id}"
+
+        self._claim_script = r.register_script(self.STAGE_QUEUE_LUA + _CLAIM_LUA)
+        self._lease_script = r.register_script(_LEASE_LUA)
+        self._ack_script = r.register_script(_ACK_LUA)
+        self._nack_script = r.register_script(self.STAGE_QUEUE_LUA + _NACK_LUA)
+        self._release_script = r.register_script(self.STAGE_QUEUE_LUA + _RELEASE_LUA)
+        self._reclaim_script = r.register_script(self.STAGE_QUEUE_LUA + _RECLAIM_LUA)
+
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._heartbeat_thread = None
+        self._stop = threading.Event()
+
+    def stage_key(self, stage: int) -> str:
+        return f"{self.queue_name}:{stage}"
+
+    def enqueue(self, step_id: str, stage: int) -> None:
+        self.r.lpush(self.stage_key(stage), step_id)
+
+    def enqueue_tasks(self, tasks: List[Tuple[str, Dict[str, Any]]], pipe=None) -> None:
+        execute = pipe is None
+        pipe = self.r.pipeline(transaction=True) if execute else pipe
+        for step_id, mapping in tasks:
+            pipe.hset(f"{self.task_prefix}{step_id}", mapping={**mapping, "enqueuedAt": time.time()})
+            pipe.lpush(self.stage_key(mapping["order"]), step_id)
+        if execute:
+            pipe.execute()
+
+    def push_command(self, stage: int, mapping: Optional[Dict[str, Any]] = None) -> List[str]:
+        return ["LPUSH", self.stage_key(stage)]
+
+    def claim(self, timeout: float = 1, stages: Optional[List[int]] = None) -> Optional[str]:
+        stages = self.stages if stages is None else stages
+        if not stages:
+            time.sleep(timeout)
+            return None
+
+        self._ensure_heartbeat()
+
+        stage_keys = [self.stage_key(stage) for stage in stages]
+        deadline = time.monotonic() + timeout
+        while True:
+            step_id = self._claim_script(
+                keys=stage_keys + [self.processing_key, self.leases_key],
+                args=[time.time() + self.visibility_timeout, self.worker_id, self.task_prefix]
+            )
+            if not step_id:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                # 여러 stage를 한 번에 옮기며 대기할 수는 없으므로, 첫 stage에서만 대기하고
+                # 나머지 stage는 poll_interval마다 다시 확인
+                wait = remaining if len(stage_keys) == 1 else min(self.poll_interval, remaining)
+                step_id = self._wait_for_step(stage_keys[0], wait)
+            if step_id:
+                with self._held_lock:
+                    self._held.add(step_id)
+                return step_id
+
+    def _wait_for_step(self, stage_key: str, wait: float) -> Optional[str]:
+        """
+        stage 대기열에 step이 들어올 때까지 최대 wait초 대기해 processing 리스트로 옮기고 lease 등록
+
+        Returns:
+            str: 가져온 step_id (없으면 None)
+        """
+        # BLMOVE의 timeout 0은 무기한 대기이므로 최소 대기 시간을 둠
+        step_id = self.r.blmove(stage_key, self.processing_key, max(wait, 0.01), "RIGHT", "LEFT")
+        if step_id:
+            self._lease_script(
+                keys=[self.processing_key, self.leases_key],
+                args=[time.time() + self.visibility_timeout, self.worker_id, self.task_prefix, step_id]
+            )
+        return step_id
+
+    def ack(self, step_id: str) -> None:
+        acked = self._ack_script(
+            keys=[self.processing_key, self.leases_key],
+            args=[step_id, self.task_prefix, self.worker_id]
+        )
+        self._drop(step_id)
+        if not acked:
+            print(f"[큐] step {step_id}은 다른 워커로 회수되어 ack 무시")
+
+    def nack(self, step_id: str) -> None:
+        retries = self._nack_script(
+            keys=[self.processing_key, self.leases_key, self.dead_key],
+            args=[step_id, self.task_prefix, self.max_retries, self.queue_name, self.worker_id, self.dead_letter_ttl or 0]
+        )
+        self._drop(step_id)
+        if retries is None:
+            print(f"[큐] step {step_id}은 다른 워커로 회수되어 nack 무시")
+        elif int(retries) > self.max_retries:
+            print(f"[큐] step {step_id} 재시도 {self.max_retries}회 초과, dead letter로 이동")
+        else:
+            print(f"[큐] step {step_id} 재시도 등록 ({retries}/{self.max_retries})")
+
+    def release(self, step_id: str) -> None:
+        self._release_script(
+            keys=[self.processing_key, self.leases_key],
+            args=[step_id, self.task_prefix, self.queue_name, self.worker_id]
+        )
+        self._drop(step_id)
+
+    def reclaim_expired(self) -> List[str]:
+        reclaimed = self._reclaim_script(
+            keys=[self.leases_key, self.dead_key, self.workers_key],
+            args=[time.time(), self.task_prefix, self.max_retries, self.queue_name, self.dead_letter_ttl or 0]
+        )
+        if reclaimed:
+            print(f"[큐] 만료된 step {len(reclaimed)}개 회수: {reclaimed}")
+        return list(reclaimed)
+
+    def heartbeat(self) -> None:
+        """워커 생존 키와 처리 중인 step의 lease를 연장"""
+        deadline = time.time() + self.visibility_timeout
+        with self._held_lock:
+            held = list(self._held)
+
+        pipe = self.r.pipeline()
+        pipe.set(self.alive_key, 1, ex=max(1, int(self.visibility_timeout)))
+        pipe.sadd(self.workers_key, self.worker_id)
+        if held:
+            pipe.zadd(self.leases_key, {step_id: deadline for step_id in held}, xx=True)
+        pipe.execute()
+
+    def close(self) -> None:
+        """heartbeat 중지 (처리 중인 step은 lease 만료 후 다른 워커가 회수)"""
+        self._stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat_thread is not None:
+            return
+        self.heartbeat()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        # 만료 시간의 1/3 간격으로 연장해 일시적인 지연에도 lease가 끊기지 않도록 함
+        while not self._stop.wait(self.visibility_timeout / 3):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                print(f"[큐] heartbeat 실패: {e}")
+
+    def _drop(self, step_id: str) -> None:
+        with self._held_lock:
+            self._held.discard(step_id)
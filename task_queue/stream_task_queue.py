@@ -0,0 +1,264 @@
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from task_queue.task_queue_interface import TaskQueueInterface
+
+# KEYS: stage 스트림, task 해시, dead letter 리스트 / ARGV: group, entry id, step_id, max_retries, dead letter TTL(0이면 만료 없음)
+# 재시도 횟수 증가와 ack/재등록을 한 스크립트로 처리해, 중간에 끊겨도 횟수만 오르고 재등록되지 않는 일이 없도록 함
+# 이미 ack된 항목(다른 경로에서 먼저 재시도됨)이면 아무것도 하지 않음
+_RETRY_LUA = """
+if redis.call('XACK', KEYS[1], ARGV[1], ARGV[2]) == 0 then
+    return false
+end
+redis.call('XDEL', KEYS[1], ARGV[2])
+local retries = redis.call('HINCRBY', KEYS[2], 'retries', 1)
+if retries > tonumber(ARGV[4]) then
+    redis.call('HSET', KEYS[2], 'status', 'failed')
+    redis.call('LPUSH', KEYS[3], ARGV[3])
+    if tonumber(ARGV[5]) > 0 then
+        redis.call('EXPIRE', KEYS[2], ARGV[5])
+    end
+else
+    redis.call('HSET', KEYS[2], 'status', 'queued')
+    redis.call('XADD', KEYS[1], '*', 'stepId', ARGV[3])
+end
+return retries
+"""
+
+
+class StreamTaskQueue(TaskQueueInterface):
+    """
+    Redis Streams + consumer group 기반 at-least-once 작업 큐 (stage별 스트림)
+
+    - enqueue: XADD로 step id를 stage 스트림 {stream_name}:{stage}에 추가
+    - claim: 담당 stage 스트림을 우선순위 순으로 XREADGROUP해 새 항목을 이 워커(consumer)의 pending 목록에 둠
+    - ack: XACK + XDEL로 pending 목록과 스트림에서 제거
+    - heartbeat: 처리 중인 항목을 XCLAIM(JUSTID)으로 자기 자신에게 다시 claim해 idle 시간을 0으로 되돌림
+    - reclaim: XAUTOCLAIM으로 idle 시간이 visibility_timeout을 넘은 항목을 가져와 재시도 횟수를 올려 재등록
+
+    여러 GPU 호스트가 같은 group에 consumer로 붙기만 하면 수평 확장되며,
+    XPENDING으로 어떤 워커가 어떤 step을 잡고 있는지 바로 확인할 수 있다.
+    """
+
+    def __init__(
+        self,
+        r: redis.Redis,
+        stream_name: str = "task_stream",
+        group_name: str = "workers",
+        stages: Optional[List[int]] = None,
+        worker_id: Optional[str] = None,
+        visibility_timeout: float = 60,
+        max_retries: int = 3,
+        task_prefix: str = "task:",
+        poll_interval: float = 0.1,
+        dead_letter_ttl: Optional[int] = None,
+    ):
+        """
+        Args:
+            stages (list, optional): claim할 stage 목록 (앞쪽일수록 우선). enqueue만 하는 경우 생략
+            poll_interval (float): 여러 stage 스트림이 모두 비어 있을 때 다시 확인하기까지의 간격(초)
+            dead_letter_ttl (int, optional): dead letter로 옮긴 task 해시의 만료 시간(초). None이면 만료 없음
+        """
+        self.r = r
+        self.stream_name = stream_name
+        self.group_name = group_name
+        self.stages = list(stages or [])
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.visibility_timeout = visibility_timeout
+        self.max_retries = max_retries
+        self.task_prefix = task_prefix
+        self.poll_interval = poll_interval
+        self.dead_letter_ttl = dead_letter_ttl
+        self.dead_key = f"{stream_name}:dead"
+
+        self._entries: Dict[str, Tuple[str, str]] = {}  # step id -> (stage 스트림, entry id)
+        self._entries_lock = threading.Lock()
+        self._ready_streams = set()
+        self._retry_script = r.register_script(_RETRY_LUA)
+        self._heartbeat_thread = None
+        self._stop = threading.Event()
+
+    def stage_key(self, stage: int) -> str:
+        return f"{self.stream_name}:{stage}"
+
+    def enqueue(self, step_id: str, stage: int) -> None:
+        self.r.xadd(self.stage_key(stage), {"stepId": step_id})
+
+    def enqueue_tasks(self, tasks: List[Tuple[str, Dict[str, Any]]], pipe=None) -> None:
+        execute = pipe is None
+        pipe = self.r.pipeline(transaction=True) if execute else pipe
+        for step_id, mapping in tasks:
+            pipe.hset(f"{self.task_prefix}{step_id}", mapping={**mapping, "enqueuedAt": time.time()})
+            pipe.xadd(self.stage_key(mapping["order"]), {"stepId": step_id})
+        if execute:
+            pipe.execute()
+
+    def push_command(self, stage: int, mapping: Optional[Dict[str, Any]] = None) -> List[str]:
+        return ["XADD", self.stage_key(stage), "*", "stepId"]
+
+    def claim(self, timeout: float = 1, stages: Optional[List[int]] = None) -> Optional[str]:
+        stages = self.stages if stages is None else stages
+        if not stages:
+            time.sleep(timeout)
+            return None
+
+        streams = [self.stage_key(stage) for stage in stages]
+        for stream in streams:
+            self._ensure_group(stream)
+        self._ensure_heartbeat()
+
+        # stage가 하나면 XREADGROUP BLOCK으로 대기, 여러 개면 우선순위 순으로 확인하며 polling
+        # (여러 스트림을 한 번에 BLOCK 읽기하면 스트림마다 항목을 하나씩 가져오므로 우선순위를 지킬 수 없음)
+        deadline = time.monotonic() + timeout
+        while True:
+            for stream in streams:
+                block = max(1, int(timeout * 1000)) if len(streams) == 1 else None
+                response = self.r.xreadgroup(
+                    self.group_name, self.worker_id, {stream: ">"}, count=1, block=block
+                )
+                if response:
+                    _, entries = response[0]
+                    entry_id, fields = entries[0]
+                    step_id = fields["stepId"]
+                    with self._entries_lock:
+                        self._entries[step_id] = (stream, entry_id)
+                    return step_id
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or len(streams) == 1:
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+
+    def ack(self, step_id: str) -> None:
+        entry = self._pop_entry(step_id)
+        if entry is None:
+            return
+        stream, entry_id = entry
+        pipe = self.r.pipeline()
+        pipe.xack(stream, self.group_name, entry_id)
+        pipe.xdel(stream, entry_id)
+        pipe.execute()
+
+    def nack(self, step_id: str) -> None:
+        entry = self._pop_entry(step_id)
+        if entry is None:
+            return
+        retries = self._retry(step_id, *entry)
+        if retries is None:
+            print(f"[큐] step {step_id}은 이미 재시도 처리되어 nack 무시")
+        elif retries > self.max_retries:
+            print(f"[큐] step {step_id} 재시도 {self.max_retries}회 초과, dead letter로 이동")
+        else:
+            print(f"[큐] step {step_id} 재시도 등록 ({retries}/{self.max_retries})")
+
+    def release(self, step_id: str) -> None:
+        entry = self._pop_entry(step_id)
+        if entry is None:
+            return
+        stream, entry_id = entry
+        pipe = self.r.pipeline(transaction=True)
+        pipe.xack(stream, self.group_name, entry_id)
+        pipe.xdel(stream, entry_id)
+        pipe.hset(f"{self.task_prefix}{step_id}", "status", "queued")
+        pipe.xadd(stream, {"stepId": step_id})
+        pipe.execute()
+
+    def reclaim_expired(self) -> List[str]:
+        """담당 stage 스트림에서 idle 시간이 visibility_timeout을 넘은 항목을 회수"""
+        min_idle_ms = int(self.visibility_timeout * 1000)
+        reclaimed = []
+
+        for stage in self.stages:
+            stream = self.stage_key(stage)
+            self._ensure_group(stream)
+            start_id = "0-0"
+            while True:
+                # XAUTOCLAIM은 원자적이므로 같은 항목을 두 워커가 동시에 회수하지 않음
+                response = self.r.xautoclaim(
+                    stream, self.group_name, self.worker_id,
+                    min_idle_time=min_idle_ms, start_id=start_id, count=100
+                )
+                start_id, entries = response[0], response[1]
+                for entry_id, fields in entries:
+                    if not fields:
+                        continue
+                    step_id = fields["stepId"]
+                    if self._retry(step_id, stream, entry_id) is not None:
+                        reclaimed.append(step_id)
+                if start_id in ("0-0", b"0-0"):
+                    break
+
+        if reclaimed:
+            print(f"[큐] 만료된 step {len(reclaimed)}개 회수: {reclaimed}")
+        return reclaimed
+
+    def pending(self, stage: int) -> List[dict]:
+        """stage 스트림에서 ack되지 않은 항목 목록 (consumer, idle 시간, 전달 횟수 포함)"""
+        stream = self.stage_key(stage)
+        self._ensure_group(stream)
+        return self.r.xpending_range(stream, self.group_name, min="-", max="+", count=1000)
+
+    def heartbeat(self) -> None:
+        """처리 중인 항목의 idle 시간을 초기화해 다른 워커가 회수하지 않도록 함"""
+        with self._entries_lock:
+            entries = list(self._entries.values())
+
+        entry_ids_by_stream: Dict[str, List[str]] = {}
+        for stream, entry_id in entries:
+            entry_ids_by_stream.setdefault(stream, []).append(entry_id)
+        for stream, entry_ids in entry_ids_by_stream.items():
+            self.r.xclaim(
+                stream, self.group_name, self.worker_id,
+                min_idle_time=0, message_ids=entry_ids, justid=True
+            )
+
+    def close(self) -> None:
+        """heartbeat 중지 (처리 중인 step은 idle 시간 초과 후 다른 워커가 회수)"""
+        self._stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+
+    def _retry(self, step_id: str, stream: str, entry_id: str) -> Optional[int]:
+        """
+        항목을 ack하고 재시도 횟수에 따라 stage 스트림에 재등록하거나 dead letter로 이동
+
+        Returns:
+            int | None: 증가한 재시도 횟수. 이미 ack된 항목이면 None
+        """
+        retries = self._retry_script(
+            keys=[stream, f"{self.task_prefix}{step_id}", self.dead_key],
+            args=[self.group_name, entry_id, step_id, self.max_retries, self.dead_letter_ttl or 0]
+        )
+        return None if retries is None else int(retries)
+
+    def _pop_entry(self, step_id: str) -> Optional[Tuple[str, str]]:
+        with self._entries_lock:
+            return self._entries.pop(step_id, None)
+
+    def _ensure_group(self, stream: str) -> None:
+        if stream in self._ready_streams:
+            return
+        try:
+            self.r.xgroup_create(stream, self.group_name, id="0", mkstream=True)
+        except redis.exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._ready_streams.add(stream)
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat_thread is not None:
+            return
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.visibility_timeout / 3):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                print(f"[큐] heartbeat 실패: {e}")
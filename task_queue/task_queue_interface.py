@@ -0,0 +1,85 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Lua 스크립트 안에서 step을 stage 대기열에 넣는 함수 (push: push_command 결과)
+# 기본은 push_command가 돌려준 Redis 명령에 step id를 붙여 실행
+_PUSH_COMMAND_LUA = """
+local function push_step(task_key, step_id, push)
+    table.insert(push, step_id)
+    return redis.call(unpack(push))
+end
+"""
+
+
+class TaskQueueInterface(ABC):
+    # push_command 결과로 대기열에 등록하는 Lua 함수 push_step(task_key, step_id, push). 하위 클래스에서 교체 가능
+    PUSH_STEP_LUA = _PUSH_COMMAND_LUA
+
+    @abstractmethod
+    def enqueue(self, step_id: str, stage: int) -> None:
+        """step id를 해당 stage(step order) 대기열에 등록"""
+        pass
+
+    @abstractmethod
+    def enqueue_tasks(self, tasks: List[Tuple[str, Dict[str, Any]]], pipe=None) -> None:
+        """
+        여러 task의 해시 저장과 대기열 등록을 한 번의 왕복(MULTI/EXEC)으로 원자적으로 처리
+
+        Args:
+            tasks (list): (step id, task 해시 필드) 목록. 필드에는 stage로 쓰일 'order'가 반드시 포함
+            pipe (optional): 전달하면 명령만 추가하고 실행은 호출 측에서 (다른 명령과 같은 트랜잭션으로 묶을 때)
+        """
+        pass
+
+    @abstractmethod
+    def push_command(self, stage: int, mapping: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        stage 대기열에 step id를 넣는 Redis 명령 (Lua 스크립트 안에서 PUSH_STEP_LUA로 등록할 때 사용)
+
+        Args:
+            mapping (dict, optional): 등록할 task 해시 필드 (우선순위 등 대기열 위치 계산에 필요한 경우)
+
+        Returns:
+            list: step id를 마지막 인자로 붙이면 완성되는 명령 (예: ["LPUSH", "task_queue:6"])
+        """
+        pass
+
+    @abstractmethod
+    def claim(self, timeout: float = 1, stages: Optional[List[int]] = None) -> Optional[str]:
+        """
+        담당 stage 대기열에서 우선순위 순으로 step id 하나를 꺼내 이 워커 소유로 표시
+
+        Args:
+            timeout (float): 작업이 없을 때 기다릴 최대 시간(초)
+            stages (list, optional): 이번 claim에서 확인할 stage 목록. 생략 시 큐에 설정된 stage 전체
+
+        Returns:
+            str | None: step id. timeout 내에 작업이 없으면 None
+        """
+        pass
+
+    @abstractmethod
+    def ack(self, step_id: str) -> None:
+        """처리가 끝난 step을 완료 처리 (재시도 대상에서 제외)"""
+        pass
+
+    @abstractmethod
+    def nack(self, step_id: str) -> None:
+        """처리에 실패한 step을 재시도 대기열로 되돌림 (재시도 횟수 증가)"""
+        pass
+
+    @abstractmethod
+    def release(self, step_id: str) -> None:
+        """처리하지 않은 step을 재시도 횟수 증가 없이 대기열로 되돌림"""
+        pass
+
+    @abstractmethod
+    def reclaim_expired(self) -> List[str]:
+        """
+        만료된 lease(죽었거나 멈춘 워커가 잡고 있던 step)를 회수해 재시도 대기열로 되돌림
+
+        Returns:
+            list: 회수된 step id 목록
+        """
+        pass
@@ -0,0 +1,18 @@
+import redis
+
+from task_queue.task_queue_interface import TaskQueueInterface
+from task_queue.reliable_list_task_queue import ReliableListTaskQueue
+from task_queue.stream_task_queue import StreamTaskQueue
+from task_queue.priority_task_queue import PriorityTaskQueue
+
+
+class TaskQueueSelector:
+    @staticmethod
+    def get_task_queue(backend: str, r: redis.Redis, **kwargs) -> TaskQueueInterface:
+        if backend == "list":
+            return ReliableListTaskQueue(r, **kwargs)
+        if backend == "stream":
+            return StreamTaskQueue(r, **kwargs)
+        if backend == "priority":
+            return PriorityTaskQueue(r, **kwargs)
+        raise ValueError(f"지원되지 않는 작업 큐 backend: {backend}")
@@ -1,30 +1,75 @@
 from fastapi import FastAPI
 import redis
 import uuid
-from pydantic import BaseModel
+import os
+from typing import Optional
+from pydantic import BaseModel, field_validator
+from task_queue.task_queue_selector import TaskQueueSelector
+from task_queue.priority_task_queue import PRIORITY_CLASSES, DEFAULT_PRIORITY
+from image_maker.inference_profiles import INFERENCE_PROFILES
+from image_maker.style_adapters import STYLE_ADAPTERS
 
 app = FastAPI()
 r = redis.Redis(host="redis", port=6379, db=0, decode_responses=True)
 
+# 작업 큐 backend (list / stream / priority), 워커와 같은 값을 사용해야 함
+# stage(step order)별 대기열에 등록하며, 서버는 enqueue만 하므로 담당 stage 없이 생성
+queue = TaskQueueSelector.get_task_queue(os.getenv("TASK_QUEUE_BACKEND", "list"), r)
+
 class TaskRequest(BaseModel):
     fairytaleId: str
     text: str
+    # 우선순위 클래스 (interactive / normal / bulk), 미지정 시 normal
+    priority: Optional[str] = None
+    # fair-share 단위 (동화 소유자 등), 미지정 시 fairytaleId
+    tenantId: Optional[str] = None
+    # 이미지 생성 profile (draft / standard / quality), 미지정 시 워커 기본값
+    inferenceProfile: Optional[str] = None
+    # 이미지 그림체 (dream_shaper / ghibli_diffusion), 워커가 IMAGE_STYLE_SWAP=true일 때 사용
+    imageStyle: Optional[str] = None
+    # 장면 이미지 중간 미리보기 요청 (워커가 IMAGE_PREVIEW_EVERY_N_STEPS > 0일 때만 전송, safety checker 전 결과)
+    imagePreview: bool = False
+
+    @field_validator("priority")
+    @classmethod
+    def check_priority(cls, value):
+        if value is not None and value not in PRIORITY_CLASSES:
+            raise ValueError(f"priority는 {list(PRIORITY_CLASSES)} 중 하나여야 합니다")
+        return value
+
+    @field_validator("inferenceProfile")
+    @classmethod
+    def check_inference_profile(cls, value):
+        if value is not None and value not in INFERENCE_PROFILES:
+            raise ValueError(f"inferenceProfile은 {list(INFERENCE_PROFILES)} 중 하나여야 합니다")
+        return value
+
+    @field_validator("imageStyle")
+    @classmethod
+    def check_image_style(cls, value):
+        if value is not None and value not in STYLE_ADAPTERS:
+            raise ValueError(f"imageStyle은 {list(STYLE_ADAPTERS)} 중 하나여야 합니다")
+        return value
 
 @app.post("/enque")
 def enque_first_step(request: TaskRequest):
     step_id = str(uuid.uuid4())
 
-    task_key = f"task:{step_id}"
-    r.hset(task_key, mapping={
-        "pipelineId": request.fairytaleId,
-        "stepId": step_id,
-        "status": "queued",
-        "order": 1,
-        "payload": request.text
-    })
-
-    # 3. 작업 큐에 step_id 넣기 (예: Redis list 사용)
-    r.lpush("task_queue", step_id)
+    # task 해시 저장과 작업 큐 등록을 한 번의 왕복으로 처리
+    queue.enqueue_tasks([
+        (step_id, {
+            "pipelineId": request.fairytaleId,
+            "stepId": step_id,
+            "status": "queued",
+            "order": 1,
+            "payload": request.text,
+            "priority": request.priority or DEFAULT_PRIORITY,
+            "tenantId": request.tenantId or request.fairytaleId,
+            **({"inferenceProfile": request.inferenceProfile} if request.inferenceProfile else {}),
+            **({"imageStyle": request.imageStyle} if request.imageStyle else {}),
+            **({"imagePreview": "true"} if request.imagePreview else {})
+        })
+    ])
 
     # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$ response 구조체 도입 필요 $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
     return {
@@ -37,17 +82,16 @@ def enque_first_step(request: TaskRequest):
 def enque_sixth_step(request: TaskRequest):
     step_id = str(uuid.uuid4())
 
-    task_key = f"task:{step_id}"
-    r.hset(task_key, mapping={
-        "pipelineId": request.pipelineId,
-        "stepId": step_id,
-        "status": "queued",
-        "order": 6,
-        "payload": "success"
-    })
-
-    # 3. 작업 큐에 step_id 넣기 (예: Redis list 사용)
-    r.lpush("task_queue", step_id)
+    # task 해시 저장과 작업 큐 등록을 한 번의 왕복으로 처리
+    queue.enqueue_tasks([
+        (step_id, {
+            "pipelineId": request.pipelineId,
+            "stepId": step_id,
+            "status": "queued",
+            "order": 6,
+            "payload": "success"
+        })
+    ])
 
     # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$ response 구조체 도입 필요 $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
     return {
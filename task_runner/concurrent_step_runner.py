@@ -0,0 +1,87 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class ConcurrentStepRunner:
+    """
+    자원 종류별 동시 실행 한도를 두고 step을 스레드 풀에서 병렬 실행하는 러너
+
+    예: {"diffusion": 1, "cpu_model": 2, "http": 4}
+    → 이미지 생성 1개가 도는 동안에도 번역/감정분석, LLM 호출 step이 유휴 코어에서 함께 실행됨
+    """
+
+    def __init__(self, resource_limits: Dict[str, int]):
+        """
+        Args:
+            resource_limits (dict): 자원 이름 -> 동시에 실행 가능한 step 수
+        """
+        if any(limit < 1 for limit in resource_limits.values()):
+            raise ValueError(f"자원별 동시 실행 한도는 1 이상이어야 합니다: {resource_limits}")
+
+        self.resource_limits = dict(resource_limits)
+        self._running = {resource: 0 for resource in resource_limits}
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=sum(resource_limits.values()),
+            thread_name_prefix="step"
+        )
+
+    def has_capacity(self, resource: str) -> bool:
+        """해당 자원에 빈 실행 슬롯이 있는지 여부"""
+        with self._condition:
+            return self._running[resource] < self.resource_limits[resource]
+
+    def has_any_capacity(self) -> bool:
+        """어느 자원이든 빈 실행 슬롯이 하나라도 있는지 여부"""
+        with self._condition:
+            return any(self._running[res] < limit for res, limit in self.resource_limits.items())
+
+    def wait_for_capacity(self, timeout: float = None) -> bool:
+        """빈 슬롯이 생길 때까지 대기. timeout 내에 생기지 않으면 False"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: any(self._running[res] < limit for res, limit in self.resource_limits.items()),
+                timeout=timeout
+            )
+
+    def wait_for_release(self, timeout: float) -> None:
+        """실행 중인 step 하나가 끝날 때까지(혹은 timeout까지) 대기"""
+        with self._condition:
+            self._condition.wait(timeout=timeout)
+
+    def try_submit(self, resource: str, fn: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        자원 슬롯이 남아 있으면 fn을 스레드 풀에 제출
+
+        Returns:
+            bool: 제출 성공 여부 (슬롯이 없으면 False, 호출 측에서 작업을 되돌려야 함)
+        """
+        if resource not in self.resource_limits:
+            raise KeyError(f"정의되지 않은 자원: {resource}")
+
+        with self._condition:
+            if self._running[resource] >= self.resource_limits[resource]:
+                return False
+            self._running[resource] += 1
+
+        self._executor.submit(self._run, resource, fn, *args, **kwargs)
+        return True
+
+    def running(self) -> Dict[str, int]:
+        """자원별 실행 중인 step 수"""
+        with self._condition:
+            return dict(self._running)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, resource: str, fn: Callable[..., Any], *args, **kwargs) -> None:
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            print(f"[에러] {resource} step 실행 중 예외 발생: {e}")
+        finally:
+            with self._condition:
+                self._running[resource] -= 1
+                self._condition.notify_all()
@@ -0,0 +1,109 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 업로드할 파일: (버전 이름, S3 키, 바이트, Content-Type). 첫 번째가 원본
+SceneFile = Tuple[str, str, bytes, str]
+SceneRow = Tuple[str, int, str, Optional[Dict[str, str]]]
+
+
+class StreamingSceneUploader:
+    """
+    렌더링이 끝난 장면 이미지(원본 + 축소 버전들)의 S3 업로드와 DB 기록을 백그라운드에서 처리하는 업로더
+
+    - 업로드는 스레드 풀(max_workers)에서 실행되어, 업로드하는 동안 워커는 다음 장면을 렌더링함
+    - 업로드 전 이미지는 최대 max_in_flight장까지만 메모리에 두고, 가득 차면 submit이 자리가 날 때까지 대기
+    - DB 기록은 여러 장면(다른 파이프라인 포함)을 모아 db_batch_size개 또는 db_flush_interval초마다 한 트랜잭션으로 저장
+    - submit이 반환한 Future는 DB 기록까지 끝나면 이미지 URL로 완료됨 (실패 시 예외)
+    """
+
+    def __init__(
+        self,
+        upload_fn: Callable[[bytes, str, str], str],
+        write_rows_fn: Callable[[List[SceneRow]], None],
+        max_workers: int = 4,
+        max_in_flight: int = 8,
+        db_batch_size: int = 16,
+        db_flush_interval: float = 0.2
+    ):
+        """
+        Args:
+            upload_fn: (이미지 바이트, S3 키, Content-Type) -> URL
+            write_rows_fn: [(pipeline id, 장면 번호, 원본 URL, 버전별 URL), ...]을 한 트랜잭션으로 저장
+            max_workers (int): 동시 업로드 수
+            max_in_flight (int): 업로드 대기/진행 중으로 메모리에 둘 최대 장면 수
+            db_batch_size (int): 한 번에 저장할 최대 행 수
+            db_flush_interval (float): 첫 행 이후 batch를 채우기 위해 기다리는 최대 시간(초)
+        """
+        if max_in_flight < max_workers:
+            raise ValueError(f"max_in_flight({max_in_flight})는 max_workers({max_workers}) 이상이어야 합니다")
+        self.upload_fn = upload_fn
+        self.write_rows_fn = write_rows_fn
+        self.db_batch_size = db_batch_size
+        self.db_flush_interval = db_flush_interval
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scene-upload")
+        self._rows: "queue.Queue[Tuple[SceneRow, Future]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="scene-db-writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, pipeline_id: str, scene_number: int, files: List[SceneFile]) -> Future:
+        """
+        장면 하나의 업로드 + DB 기록 예약 (업로드 대기 장면이 가득 차 있으면 대기)
+
+        Args:
+            files (list): (버전 이름, S3 키, 바이트, Content-Type) 목록. 첫 번째가 원본
+
+        Returns:
+            Future: DB 기록까지 끝나면 원본 이미지 URL로 완료
+        """
+        self._in_flight.acquire()
+        future = Future()
+        try:
+            self._executor.submit(self._upload, pipeline_id, scene_number, files, future)
+        except Exception:
+            self._in_flight.release()
+            raise
+        return future
+
+    def _upload(self, pipeline_id: str, scene_number: int, files: List[SceneFile], future: Future) -> None:
+        try:
+            urls = {variant: self.upload_fn(data, s3_key, content_type) for variant, s3_key, data, content_type in files}
+        except Exception as e:
+            future.set_exception(e)
+            return
+        finally:
+            # 업로드가 끝나면 이미지 바이트는 더 이상 필요 없으므로 다음 장면에 자리를 내줌
+            self._in_flight.release()
+        original_url = urls.pop(files[0][0])
+        self._rows.put(((pipeline_id, scene_number, original_url, urls or None), future))
+
+    def _collect(self) -> List[Tuple[SceneRow, Future]]:
+        batch = [self._rows.get()]
+        deadline = time.monotonic() + self.db_flush_interval
+        while len(batch) < self.db_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._rows.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                self.write_rows_fn([row for row, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, _, image_url, _), future in batch:
+                future.set_result(image_url)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
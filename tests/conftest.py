@@ -0,0 +1,16 @@
+import os
+import sys
+
+import fakeredis
+import pytest
+
+# 저장소 루트의 패키지(task_queue, image_maker 등)를 import할 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def r():
+    """워커와 같이 decode_responses=True인 fakeredis 클라이언트 (Lua 스크립트는 lupa로 실행)"""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    yield client
+    client.flushall()
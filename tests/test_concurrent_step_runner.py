@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from task_runner.concurrent_step_runner import ConcurrentStepRunner
+
+
+@pytest.fixture
+def runner():
+    runner = ConcurrentStepRunner({"diffusion": 1, "http": 2})
+    yield runner
+    runner.shutdown()
+
+
+def blocking_step(started, release):
+    def step():
+        started.release()
+        release.wait(5)
+    return step
+
+
+def test_limits_are_enforced_per_resource(runner):
+    started, release = threading.Semaphore(0), threading.Event()
+
+    assert runner.try_submit("diffusion", blocking_step(started, release))
+    assert not runner.try_submit("diffusion", blocking_step(started, release))
+    # diffusion이 가득 차도 다른 자원 step은 함께 실행됨
+    assert runner.try_submit("http", blocking_step(started, release))
+    assert runner.try_submit("http", blocking_step(started, release))
+    for _ in range(3):
+        assert started.acquire(timeout=5)
+
+    assert runner.running() == {"diffusion": 1, "http": 2}
+    assert not runner.has_any_capacity()
+    assert not runner.wait_for_capacity(timeout=0.01)
+
+    release.set()
+    assert runner.wait_for_capacity(timeout=5)
+    runner.shutdown()
+    assert runner.running() == {"diffusion": 0, "http": 0}
+
+
+def test_failing_step_frees_its_slot(runner):
+    def failing_step():
+        raise RuntimeError("model crashed")
+
+    assert runner.try_submit("diffusion", failing_step)
+    runner.shutdown()
+
+    assert runner.has_capacity("diffusion")
+
+
+def test_unknown_resource_is_rejected(runner):
+    with pytest.raises(KeyError):
+        runner.try_submit("gpu", lambda: None)
+
+
+def test_limits_must_be_positive():
+    with pytest.raises(ValueError):
+        ConcurrentStepRunner({"diffusion": 0})
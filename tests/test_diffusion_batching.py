@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+import pytest
+import torch
+from diffusers import PNDMScheduler
+
+from image_maker.diffusion_image_maker import DiffusionImageMaker
+
+
+class FakePipe:
+    """
+    프롬프트마다 (프롬프트, seed)를 이미지 대신 반환하는 파이프라인
+    - 'bad'가 들어간 batch는 통째로 실패 (OOM 등)
+    - 'nsfw'가 들어간 프롬프트는 seed가 safe_seed 미만이면 NSFW로 판정
+    """
+
+    def __init__(self, safe_seed=0):
+        self.device = torch.device("cpu")
+        self.scheduler = PNDMScheduler()
+        self.unet = SimpleNamespace(to=lambda **kwargs: None)
+        self.safe_seed = safe_seed
+        self.calls = []
+
+    def __call__(self, prompt, negative_prompt, generator=None, **kwargs):
+        seeds = [g.initial_seed() for g in generator] if generator else [None] * len(prompt)
+        self.calls.append((list(prompt), kwargs["num_inference_steps"]))
+        if any("bad" in p for p in prompt):
+            raise RuntimeError("out of memory")
+        return SimpleNamespace(
+            images=list(zip(prompt, seeds)),
+            nsfw_content_detected=[
+                "nsfw" in p and (seed is None or seed < self.safe_seed) for p, seed in zip(prompt, seeds)
+            ]
+        )
+
+
+@pytest.fixture
+def maker():
+    return DiffusionImageMaker.from_pipe(FakePipe())
+
+
+def batch_sizes(maker):
+    return [len(prompts) for prompts, _ in maker.pipe.calls]
+
+
+def test_prompts_are_batched_in_order(maker):
+    images = maker.generate_images(["a", "b", "c", "d", "e"], batch_size=2, seeds=[1, 2, 3, 4, 5])
+
+    assert images == [("a", 1), ("b", 2), ("c", 3), ("d", 4), ("e", 5)]
+    assert batch_sizes(maker) == [2, 2, 1]
+
+
+def test_failed_batch_is_split_and_only_failing_scene_is_none(maker):
+    images = maker.generate_images(["a", "bad", "c", "d"], batch_size=4, seeds=[1, 2, 3, 4])
+
+    assert images == [("a", 1), None, ("c", 3), ("d", 4)]
+    # 4 -> [a, bad] -> [a], [bad] / [c, d]
+    assert batch_sizes(maker) == [4, 2, 1, 1, 2]
+
+
+def test_explicit_batch_size_is_clamped_to_max_batch_size(maker):
+    maker.max_batch_size = 2
+
+    maker.generate_images(["a", "b", "c", "d", "e"], batch_size=8)
+
+    assert batch_sizes(maker) == [2, 2, 1]
+
+
+def test_auto_batch_size_without_explicit_value(maker, monkeypatch):
+    monkeypatch.setattr(maker, "auto_batch_size", lambda: 3)
+
+    maker.generate_images(["a", "b", "c", "d"])
+
+    assert batch_sizes(maker) == [3, 1]
+
+
+@pytest.mark.parametrize("strategy", ["serial", "parallel"])
+def test_nsfw_scenes_are_regenerated_with_next_seeds(strategy):
+    maker = DiffusionImageMaker.from_pipe(FakePipe(safe_seed=12))
+    maker.max_nsfw_attempts = 3
+    maker.nsfw_retry_strategy = strategy
+
+    images = maker.generate_images(["nsfw", "a"], batch_size=4, seeds=[10, 20])
+
+    # 두 방식 모두 seed 순서상 첫 번째 안전한 후보(seed + 2)를 사용
+    assert images == [("nsfw", 12), ("a", 20)]
+    retried = [prompts for prompts, _ in maker.pipe.calls[1:]]
+    if strategy == "serial":
+        assert retried == [["nsfw"], ["nsfw"]]
+    else:
+        assert retried == [["nsfw", "nsfw"]]
+
+
+def test_profile_applies_per_call_without_leaking(maker):
+    maker.generate_images(["a"], batch_size=1, profile="draft")
+    maker.generate_images(["a"], batch_size=1)
+    maker.default_inference_profile = "draft"
+    maker.generate_images(["a"], batch_size=1)
+
+    assert [steps for _, steps in maker.pipe.calls] == [12, 25, 12]
+    assert maker.inference_profile == "draft"
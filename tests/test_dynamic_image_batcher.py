@@ -0,0 +1,173 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from image_maker.diffusion_image_maker import DiffusionImageMaker
+from image_maker.dynamic_image_batcher import DynamicImageBatcher
+
+
+class FakeImageMaker:
+    """generate_images 호출을 기록하고 프롬프트를 이미지 대신 반환 ('bad' 프롬프트는 None)"""
+
+    pipelined_decode = False
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def generate_images(self, prompts, **options):
+        self.calls.append((list(prompts), options))
+        if self.error is not None:
+            raise self.error
+        return [None if prompt == "bad" else f"image of {prompt}" for prompt in prompts]
+
+
+def make_batcher(image_maker, max_batch_size=4):
+    # 요청을 모두 넣기 전에 batch가 닫히지 않도록 max_batch_size가 찰 때까지 충분히 기다림
+    return DynamicImageBatcher(lambda: image_maker, max_batch_size=max_batch_size, max_wait_seconds=5)
+
+
+def test_requests_are_batched_into_one_call():
+    image_maker = FakeImageMaker()
+    batcher = make_batcher(image_maker)
+
+    futures = [batcher.submit(f"scene {i}", seed=i) for i in range(4)]
+
+    assert [future.result(timeout=5) for future in futures] == [f"image of scene {i}" for i in range(4)]
+    assert image_maker.calls == [
+        ([f"scene {i}" for i in range(4)], {"batch_size": 4, "seeds": [0, 1, 2, 3]})
+    ]
+    assert batcher.stats() == {"batches": 1, "images": 4, "mean_batch_size": 4.0}
+
+
+def test_batch_is_grouped_by_profile_and_style():
+    image_maker = FakeImageMaker()
+    batcher = make_batcher(image_maker)
+
+    futures = [
+        batcher.submit("a", profile="draft"),
+        batcher.submit("b", style="ghibli"),
+        batcher.submit("c", profile="draft"),
+        batcher.submit("d", preview_key="p1:4"),
+    ]
+    for future in futures:
+        future.result(timeout=5)
+
+    calls = {tuple(prompts): options for prompts, options in image_maker.calls}
+    assert calls[("a", "c")]["profile"] == "draft"
+    assert calls[("b",)]["style"] == "ghibli"
+    assert calls[("d",)]["preview_keys"] == ["p1:4"]
+    assert "profile" not in calls[("b",)] and "preview_keys" not in calls[("a", "c")]
+
+
+def test_failed_scene_fails_only_its_request():
+    batcher = make_batcher(FakeImageMaker(), max_batch_size=2)
+
+    ok, bad = batcher.submit("ok"), batcher.submit("bad")
+
+    assert ok.result(timeout=5) == "image of ok"
+    with pytest.raises(RuntimeError):
+        bad.result(timeout=5)
+
+
+def test_generator_error_fails_every_request_in_batch():
+    batcher = make_batcher(FakeImageMaker(error=MemoryError("out of memory")), max_batch_size=2)
+
+    futures = [batcher.submit("a"), batcher.submit("b")]
+
+    for future in futures:
+        with pytest.raises(MemoryError):
+            future.result(timeout=5)
+    assert batcher.stats()["batches"] == 0
+
+
+def test_missing_images_fail_leftover_requests():
+    image_maker = FakeImageMaker()
+    image_maker.generate_images = lambda prompts, **options: ["image of a"]
+    batcher = make_batcher(image_maker, max_batch_size=2)
+
+    first, second = batcher.submit("a"), batcher.submit("b")
+
+    assert first.result(timeout=5) == "image of a"
+    with pytest.raises(RuntimeError):
+        second.result(timeout=5)
+
+
+def test_batcher_thread_survives_unexpected_errors():
+    image_maker = FakeImageMaker()
+    broken = {"calls": 0}
+
+    def generate_images(prompts, **options):
+        broken["calls"] += 1
+        # 첫 batch는 이미지 목록 대신 None을 돌려줘 결과 분배 중 예외 발생
+        return None if broken["calls"] == 1 else [f"image of {prompt}" for prompt in prompts]
+
+    image_maker.generate_images = generate_images
+    batcher = make_batcher(image_maker, max_batch_size=1)
+
+    with pytest.raises(TypeError):
+        batcher.generate("a", timeout=5)
+    assert batcher.generate("b", timeout=5) == "image of b"
+
+
+def test_generate_waits_for_result():
+    batcher = make_batcher(FakeImageMaker(), max_batch_size=1)
+
+    assert batcher.generate("a", timeout=5) == "image of a"
+
+
+class FakeLatentPipe:
+    """
+    pipelined decode 경로(output_type="latent" -> vae.decode -> run_safety_checker -> postprocess)를 흉내 내는 파이프라인
+    프롬프트 "scene {n}"의 latent는 n이고, 디코드된 이미지는 "image {n}" 문자열
+    """
+
+    def __init__(self):
+        self.device = self._execution_device = torch.device("cpu")
+        self.unet = SimpleNamespace()
+        self.vae = SimpleNamespace(config=SimpleNamespace(scaling_factor=1.0), decode=self._decode)
+        self.image_processor = SimpleNamespace(postprocess=self._postprocess)
+        self.denoised = []
+        self.decode_threads = []
+
+    def __call__(self, prompt, negative_prompt, generator=None, output_type=None, **kwargs):
+        assert output_type == "latent"
+        self.denoised.append(list(prompt))
+        return SimpleNamespace(images=torch.tensor([[float(p.split()[-1])] for p in prompt]))
+
+    def _decode(self, latents, return_dict=False):
+        self.decode_threads.append(threading.current_thread().name)
+        return (latents,)
+
+    def run_safety_checker(self, decoded, device, dtype):
+        return decoded, None
+
+    def _postprocess(self, decoded, output_type, do_denormalize):
+        return [f"image {int(value)}" for value in decoded[:, 0]]
+
+
+def test_pipelined_maker_splits_batch_and_calls_hooks_on_decode_thread():
+    image_maker = DiffusionImageMaker.from_pipe(FakeLatentPipe())
+    image_maker.pipelined_decode = True
+    batcher = make_batcher(image_maker)
+    delivered = {}
+
+    def hook(n):
+        def on_image(image):
+            delivered[n] = (image, threading.current_thread().name)
+        return on_image
+
+    futures = [batcher.submit(f"scene {n}", seed=n, on_image=hook(n) if n != 2 else None) for n in range(4)]
+    images = [future.result(timeout=5) for future in futures]
+
+    assert images == [f"image {n}" for n in range(4)]
+    # 한 flush가 두 sub-batch로 나뉘어 앞 sub-batch의 디코드가 뒤 sub-batch의 denoising과 겹칠 수 있음
+    assert image_maker.pipe.denoised == [["scene 0", "scene 1"], ["scene 2", "scene 3"]]
+    assert image_maker.pipe.decode_threads == ["image-decode", "image-decode"]
+    # hook은 요청별로 Future와 같은 이미지 객체를 받고, hook이 없는 요청은 건너뜀
+    assert sorted(delivered) == [0, 1, 3]
+    for n, (image, thread_name) in delivered.items():
+        assert image is images[n]
+        assert thread_name == "image-decode"
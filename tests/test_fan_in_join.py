@@ -0,0 +1,166 @@
+import pytest
+
+from task_queue.fan_in_join import FanInJoin
+from task_queue.reliable_list_task_queue import ReliableListTaskQueue
+from task_queue.stream_task_queue import StreamTaskQueue
+
+
+@pytest.fixture
+def queue(r):
+    queue = ReliableListTaskQueue(r, stages=[3], worker_id="worker-a")
+    yield queue
+    queue.close()
+
+
+@pytest.fixture
+def join(r, queue):
+    return FanInJoin(r, queue)
+
+
+NEXT_TASK = ("p1-merge", {"pipelineId": "p1", "order": 3, "status": "queued"})
+
+
+def test_last_branch_enqueues_next_task_once(r, queue, join):
+    join.register("p1", [1, 2])
+
+    assert join.complete("p1", 1, NEXT_TASK) is False
+    assert queue.claim(timeout=0) is None
+    assert join.remaining("p1") == ["2"]
+
+    assert join.complete("p1", 2, NEXT_TASK) is True
+    assert not r.exists(join.join_key("p1"))
+    assert r.hget("task:p1-merge", "pipelineId") == "p1"
+    assert r.hget("task:p1-merge", "enqueuedAt") is not None
+    assert queue.claim(timeout=0) == "p1-merge"
+
+
+def test_duplicate_completion_does_not_refire(queue, join):
+    join.register("p1", [1, 2])
+    join.complete("p1", 1, NEXT_TASK)
+    # 재시도로 같은 branch가 다시 완료돼도 남은 branch가 줄지 않음
+    assert join.complete("p1", 1, NEXT_TASK) is False
+    assert join.remaining("p1") == ["2"]
+
+    assert join.complete("p1", 2, NEXT_TASK) is True
+    assert join.complete("p1", 2, NEXT_TASK) is False
+    assert queue.claim(timeout=0) == "p1-merge"
+    assert queue.claim(timeout=0) is None
+
+
+def test_expand_replaces_branch_with_sub_branches(join):
+    join.register("p1", ["image", "audio"])
+
+    join.expand("p1", "image", ["image:1", "image:2"])
+
+    assert join.remaining("p1") == ["audio", "image:1", "image:2"]
+    for branch in ("audio", "image:1"):
+        assert join.complete("p1", branch, NEXT_TASK) is False
+    assert join.complete("p1", "image:2", NEXT_TASK) is True
+
+
+def test_expand_missing_branch_is_noop(join):
+    join.register("p1", ["audio"])
+
+    join.expand("p1", "image", ["image:1"])
+
+    assert join.remaining("p1") == ["audio"]
+
+
+def test_expand_rejects_empty_sub_branches(join):
+    join.register("p1", ["image"])
+
+    with pytest.raises(ValueError):
+        join.expand("p1", "image", [])
+    assert join.remaining("p1") == ["image"]
+
+
+def test_register_and_expand_join_callers_transaction(r, join):
+    pipe = r.pipeline(transaction=True)
+    join.register("p1", ["image"], pipe=pipe)
+    join.expand("p1", "image", ["image:1"], pipe=pipe)
+    # execute 전에는 아무것도 기록되지 않음
+    assert not r.exists(join.join_key("p1"))
+
+    pipe.execute()
+
+    assert join.remaining("p1") == ["image:1"]
+    assert r.ttl(join.join_key("p1")) > 0
+
+
+def test_next_task_goes_through_stream_queue(r):
+    queue = StreamTaskQueue(r, stages=[3], worker_id="worker-a")
+    join = FanInJoin(r, queue)
+    join.register("p1", [1])
+
+    assert join.complete("p1", 1, NEXT_TASK) is True
+    assert queue.claim(timeout=0.01) == "p1-merge"
+    queue.close()
+
+
+# 워커의 장면별 이미지 분기와 같은 구성: scene parser 이후 branch 5(이미지), 31(번역), 32(감정분석)를 등록하고
+# prompt maker가 장면 수를 알게 되면 branch 5를 장면별 branch "5:{장면 번호}"로 교체
+IMAGE_MAKER_ORDER, NOTIFY_ORDER = 5, 6
+
+
+@pytest.fixture
+def scene_queue(r):
+    queue = ReliableListTaskQueue(r, stages=[IMAGE_MAKER_ORDER, NOTIFY_ORDER], worker_id="worker-a")
+    yield queue
+    queue.close()
+
+
+def fan_out_scenes(r, queue, join, scene_count):
+    join.register("p1", [IMAGE_MAKER_ORDER, 31, 32])
+    pipe = r.pipeline(transaction=True)
+    tasks = [
+        (f"scene-{n}", {"status": "queued", "pipelineId": "p1", "order": IMAGE_MAKER_ORDER, "sceneNumber": n})
+        for n in range(1, scene_count + 1)
+    ]
+    join.expand("p1", IMAGE_MAKER_ORDER, [f"{IMAGE_MAKER_ORDER}:{n}" for n in range(1, scene_count + 1)], pipe=pipe)
+    queue.enqueue_tasks(tasks, pipe=pipe)
+    pipe.execute()
+
+
+def notify_task(step_id):
+    return step_id, {"status": "queued", "pipelineId": "p1", "order": NOTIFY_ORDER}
+
+
+def test_scene_fan_out_replaces_image_branch(r, scene_queue):
+    join = FanInJoin(r, scene_queue)
+
+    fan_out_scenes(r, scene_queue, join, 4)
+
+    assert join.remaining("p1") == ["31", "32", "5:1", "5:2", "5:3", "5:4"]
+    assert [scene_queue.claim(timeout=0, stages=[IMAGE_MAKER_ORDER]) for _ in range(4)] == [
+        "scene-1", "scene-2", "scene-3", "scene-4"
+    ]
+
+
+def test_scene_fan_out_notifies_once_after_last_scene(r, scene_queue):
+    join = FanInJoin(r, scene_queue)
+    fan_out_scenes(r, scene_queue, join, 3)
+
+    fired = [join.complete("p1", branch, notify_task(f"notify-{branch}")) for branch in (31, "5:2", 32, "5:1")]
+    assert fired == [False, False, False, False]
+    assert scene_queue.claim(timeout=0, stages=[NOTIFY_ORDER]) is None
+
+    assert join.complete("p1", "5:3", notify_task("notify-last")) is True
+    assert scene_queue.claim(timeout=0, stages=[NOTIFY_ORDER]) == "notify-last"
+    assert scene_queue.claim(timeout=0, stages=[NOTIFY_ORDER]) is None
+
+
+def test_scene_fan_out_ignores_duplicate_scene_completion(r, scene_queue):
+    join = FanInJoin(r, scene_queue)
+    fan_out_scenes(r, scene_queue, join, 2)
+    join.complete("p1", 31, notify_task("notify-1"))
+    join.complete("p1", 32, notify_task("notify-2"))
+    join.complete("p1", "5:1", notify_task("notify-3"))
+
+    # 재시도된 장면 step이 다시 완료돼도 남은 장면이 줄지 않고 알림도 등록되지 않음
+    assert join.complete("p1", "5:1", notify_task("notify-dup")) is False
+    assert join.remaining("p1") == ["5:2"]
+
+    assert join.complete("p1", "5:2", notify_task("notify-last")) is True
+    assert join.complete("p1", "5:2", notify_task("notify-again")) is False
+    assert scene_queue.claim(timeout=0, stages=[NOTIFY_ORDER]) == "notify-last"
+    assert scene_queue.claim(timeout=0, stages=[NOTIFY_ORDER]) is None
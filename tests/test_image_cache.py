@@ -0,0 +1,80 @@
+import os
+
+import pytest
+from PIL import Image
+
+from image_maker.image_cache import ImageCache, prompt_seed
+
+
+def solid(color, size=32):
+    return Image.new("RGB", (size, size), color)
+
+
+@pytest.fixture
+def entry_bytes(tmp_path):
+    """solid() 이미지 한 장의 PNG 크기"""
+    cache = ImageCache(str(tmp_path / "probe"))
+    cache.put("probe", solid("red"))
+    return os.path.getsize(cache._path("probe"))
+
+
+def test_make_key_ignores_field_order_and_changes_with_any_field():
+    key = ImageCache.make_key(model="m", prompt="fox", seed=1)
+
+    assert key == ImageCache.make_key(seed=1, prompt="fox", model="m")
+    assert key != ImageCache.make_key(model="m", prompt="fox", seed=2)
+
+
+def test_prompt_seed_is_stable():
+    assert prompt_seed("a fox") == prompt_seed("a fox")
+    assert prompt_seed("a fox") != prompt_seed("a cat")
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = ImageCache(str(tmp_path))
+
+    assert cache.get("k1") is None
+    cache.put("k1", solid("red"))
+
+    assert cache.get("k1").tobytes() == solid("red").tobytes()
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_least_recently_used_image_is_evicted(tmp_path, entry_bytes):
+    cache = ImageCache(str(tmp_path / "cache"), max_bytes=entry_bytes * 2)
+    cache.put("k1", solid("red"))
+    cache.put("k2", solid("red"))
+    # k1을 조회해 k2가 가장 오래된 항목이 됨
+    cache.get("k1")
+
+    cache.put("k3", solid("red"))
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None and cache.get("k3") is not None
+
+
+def test_local_index_is_restored_on_restart(tmp_path, entry_bytes):
+    ImageCache(str(tmp_path / "cache")).put("k1", solid("red"))
+
+    restarted = ImageCache(str(tmp_path / "cache"), max_bytes=entry_bytes)
+    restarted.put("k2", solid("red"))
+
+    assert restarted.get("k1") is None
+    assert restarted.get("k2") is not None
+
+
+def test_redis_index_is_shared_between_workers(r, tmp_path, entry_bytes):
+    cache_dir = str(tmp_path / "shared")
+    worker_a = ImageCache(cache_dir, max_bytes=entry_bytes * 2, r=r)
+    worker_b = ImageCache(cache_dir, max_bytes=entry_bytes * 2, r=r)
+
+    worker_a.put("k1", solid("red"))
+    worker_b.put("k2", solid("red"))
+    worker_b.put("k2", solid("red"))
+    assert int(r.get("image_cache:bytes")) == entry_bytes * 2
+
+    worker_a.put("k3", solid("red"))
+
+    assert worker_b.get("k1") is None
+    assert worker_b.get("k3") is not None
+    assert int(r.get("image_cache:bytes")) == entry_bytes * 2
@@ -0,0 +1,46 @@
+import io
+
+import pytest
+from PIL import Image
+
+from image_maker.image_encoder import ImageEncoder, parse_variants
+
+
+@pytest.fixture
+def image():
+    return Image.effect_mandelbrot((128, 96), (-2, -1, 1, 1), 50).convert("RGB")
+
+
+def plain_png(image):
+    with io.BytesIO() as output:
+        image.save(output, format="PNG")
+        return output.getvalue()
+
+
+def test_default_png_is_plain_encoding(image):
+    encoded = ImageEncoder().encode(image)
+
+    assert encoded.data == plain_png(image)
+    assert (encoded.content_type, encoded.extension) == ("image/png", "png")
+
+
+@pytest.mark.parametrize("image_format", ["png", "jpeg"])
+def test_optimize_is_opt_in(image, image_format):
+    assert ImageEncoder(image_format)._save_options().get("optimize") is None
+    assert ImageEncoder(image_format, optimize=True)._save_options()["optimize"] is True
+
+
+def test_variants_are_resized_and_original_comes_first(image):
+    encoder = ImageEncoder("webp", 80, parse_variants("thumbnail:64,large:512"))
+
+    original, thumbnail, large = encoder.encode_variants(image)
+
+    assert (original.variant, original.width) == ("original", 128)
+    assert (thumbnail.variant, thumbnail.width, thumbnail.height) == ("thumbnail", 64, 48)
+    # 원본보다 작아지지 않는 버전은 원본 인코딩 결과를 그대로 사용
+    assert (large.variant, large.data) == ("large", original.data)
+
+
+def test_invalid_variant_setting_is_rejected():
+    with pytest.raises(ValueError):
+        parse_variants("thumbnail")
@@ -0,0 +1,55 @@
+import pytest
+
+from benchmarks.tiny_diffusion import build_tiny_sd_pipeline
+from image_maker.dream_shaper_image_maker import DreamShaperImageMaker
+from image_maker.memory_saver import choose_memory_saver, get_memory_saver
+
+GB = 1024 ** 3
+
+
+@pytest.mark.parametrize("available, expected", [(8 * GB, "off"), (2 * GB, "balanced"), (GB // 2, "low")])
+def test_auto_level_follows_available_memory(available, expected):
+    assert choose_memory_saver(available, per_image_bytes=GB) == expected
+
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(ValueError):
+        get_memory_saver("tiny")
+
+
+def make_maker():
+    image_maker = DreamShaperImageMaker.from_pipe(build_tiny_sd_pipeline())
+    image_maker.num_inference_steps = 2
+    return image_maker
+
+
+def test_low_level_tiles_vae_and_limits_batch_size():
+    image_maker = make_maker()
+    key_before = image_maker.cache_key("a fox", 0)
+
+    assert image_maker.apply_memory_saver("low") == "low"
+
+    assert image_maker.pipe.vae.use_tiling
+    assert image_maker.max_batch_size == 1
+    # 결과가 달라지는 설정이므로 캐시 키도 바뀜
+    assert image_maker.cache_key("a fox", 0) != key_before
+    # 이미 적용했으면 다른 단계를 요청해도 그대로
+    assert image_maker.apply_memory_saver("off") == "low"
+
+
+def test_output_preserving_level_keeps_cache_key():
+    image_maker = make_maker()
+    key_before = image_maker.cache_key("a fox", 0)
+
+    image_maker.apply_memory_saver("balanced")
+
+    assert image_maker.cache_key("a fox", 0) == key_before
+    assert image_maker.max_batch_size == DreamShaperImageMaker.max_batch_size
+
+
+def test_auto_level_uses_available_memory(monkeypatch):
+    image_maker = make_maker()
+    monkeypatch.setattr(image_maker, "_available_memory_bytes", lambda: image_maker._per_image_bytes() // 2)
+
+    assert image_maker.apply_memory_saver() == "low"
+    assert image_maker.generate_images(["a fox", "a cat"], batch_size=2, seeds=[0, 1])[1] is not None
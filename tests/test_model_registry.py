@@ -0,0 +1,90 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from model_registry.model_registry import ModelRegistry
+
+MB = 1024 ** 2
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # 로드 중 RSS 변화 대신 모델에 적힌 크기로 집계 (모델 객체는 미리 만들어 두어 RSS 변화가 거의 없음)
+    monkeypatch.setattr(ModelRegistry, "_estimate_size", staticmethod(lambda model: model.size))
+    return ModelRegistry(max_memory_bytes=250 * MB)
+
+
+def model(name, size_mb=100):
+    return SimpleNamespace(name=name, size=size_mb * MB)
+
+
+def test_loader_runs_once_per_key(registry):
+    loads = []
+    translator = model("marian")
+
+    def loader():
+        loads.append("marian")
+        return translator
+
+    assert registry.get("translator:marian", loader) is translator
+    assert registry.get("translator:marian", loader) is translator
+    assert loads == ["marian"]
+    stats = registry.stats()
+    assert (stats["hits"], stats["misses"], stats["resident"]) == (1, 1, ["translator:marian"])
+
+
+def test_concurrent_requests_load_model_once(registry):
+    loads = []
+    translator = model("marian")
+
+    def slow_loader():
+        loads.append("marian")
+        time.sleep(0.05)
+        return translator
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("marian", slow_loader))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ["marian"]
+    assert all(result is translator for result in results)
+
+
+def test_least_recently_used_model_is_evicted_over_budget(registry):
+    models = {name: model(name) for name in ("a", "b", "c")}
+    registry.get("a", lambda: models["a"])
+    registry.get("b", lambda: models["b"])
+    # a를 다시 사용해 b가 가장 오래된 모델이 됨
+    registry.get("a", lambda: models["a"])
+
+    registry.get("c", lambda: models["c"])
+
+    stats = registry.stats()
+    assert stats["resident"] == ["a", "c"]
+    assert stats["evictions"] == 1
+    assert stats["resident_bytes"] >= 200 * MB
+
+
+def test_model_larger_than_budget_stays_resident(registry):
+    registry.get("small", lambda: model("small"))
+
+    registry.get("huge", lambda: model("huge", size_mb=300))
+
+    assert registry.stats()["resident"] == ["huge"]
+
+
+def test_evict_and_clear(registry):
+    registry.get("a", lambda: model("a", 10))
+    registry.get("b", lambda: model("b", 10))
+
+    registry.evict("a")
+    registry.evict("missing")
+    assert registry.stats()["resident"] == ["b"]
+
+    registry.clear()
+    assert registry.stats()["resident"] == []
@@ -0,0 +1,109 @@
+import random
+import string
+
+import pytest
+
+from payload_store.local_artifact_store import LocalArtifactStore
+from payload_store.payload_store import PayloadStore
+
+STORY = "오늘 나는 친구와 공원에 갔다. " * 500
+
+
+@pytest.fixture
+def store(r):
+    return PayloadStore(r, compress_threshold=1024)
+
+
+def test_small_value_is_stored_as_is(store):
+    fields = store.pack("s1", "p1", "짧은 일기")
+
+    assert fields == {"payload": "짧은 일기"}
+    assert store.unpack(fields) == "짧은 일기"
+
+
+def test_non_string_value_is_converted(store):
+    assert store.pack("s1", "p1", 42, field="result") == {"result": "42"}
+
+
+def test_large_value_is_compressed_and_round_trips(store):
+    fields = store.pack("s1", "p1", STORY)
+
+    assert fields["payloadEncoding"] == "zlib"
+    assert len(fields["payload"]) < len(STORY.encode("utf-8"))
+    assert store.unpack(fields) == STORY
+
+
+def test_incompressible_value_is_stored_raw(store):
+    rng = random.Random(0)
+    text = "".join(rng.choice(string.printable) for _ in range(4096))
+
+    fields = store.pack("s1", "p1", text)
+
+    assert fields == {"payload": text}
+
+
+def test_task_without_encoding_field_is_read_as_is(store):
+    # 인코딩 필드가 없는 기존 작업(서버 등록 등)
+    assert store.unpack({"payload": STORY}) == STORY
+    assert store.unpack({}) is None
+
+
+def test_huge_value_spills_to_artifact_store(r, tmp_path):
+    artifacts = LocalArtifactStore(str(tmp_path))
+    store = PayloadStore(r, artifact_store=artifacts, compress_threshold=1024, spill_threshold=64)
+
+    fields = store.pack("s1", "p1", STORY, field="result")
+
+    assert fields == {"result": "p1/s1/result.zlib", "resultEncoding": "ref+zlib"}
+    assert (tmp_path / "p1" / "s1" / "result.zlib").exists()
+    assert store.unpack(fields, field="result") == STORY
+    # artifact store 없이 참조를 읽으면 실패
+    with pytest.raises(ValueError):
+        PayloadStore(r).unpack(fields, field="result")
+
+
+def test_unknown_codec_is_rejected(r):
+    with pytest.raises(ValueError):
+        PayloadStore(r, codec="lz4")
+
+
+def test_pipeline_report_counts_packed_values(r, store, monkeypatch):
+    # fakeredis에는 MEMORY USAGE가 없으므로 남은 task 해시마다 1바이트로 집계
+    monkeypatch.setattr(type(r.pipeline()), "memory_usage", lambda pipe, key: pipe.exists(key))
+    fields = store.pack("s1", "p1", STORY)
+    r.hset("task:s1", mapping=fields)
+    store.pack("s2", "p1", "짧은 결과", field="result")
+
+    report = store.pipeline_report("p1")
+
+    raw_bytes = len(STORY.encode("utf-8")) + len("짧은 결과".encode("utf-8"))
+    assert report["values"] == 2
+    assert report["raw_bytes"] == raw_bytes
+    assert report["redis_bytes"] == len(fields["payload"]) + len("짧은 결과".encode("utf-8"))
+    assert report["artifact_bytes"] == 0
+    assert report["saved_bytes"] == raw_bytes - report["redis_bytes"]
+    # s2의 task 해시는 이미 만료된 상황
+    assert report["redis_memory_bytes"] == 1
+
+
+def test_stats_join_callers_transaction(r, store):
+    pipe = r.pipeline(transaction=True)
+    fields = store.pack("s1", "p1", STORY, pipe=pipe)
+    pipe.hset("task:s1", mapping=fields)
+    # execute 전에는 통계도 task 해시도 기록되지 않음
+    assert not r.exists(store.stats_key("p1"))
+
+    pipe.execute()
+
+    assert r.hget(store.stats_key("p1"), "values") == "1"
+    assert r.smembers(f"{store.stats_key('p1')}:tasks") == {"task:s1"}
+    assert r.ttl(store.stats_key("p1")) > 0
+
+
+def test_mark_finished_sets_ttl(r, store):
+    r.hset("task:s1", "status", "completed")
+    assert r.ttl("task:s1") == -1
+
+    store.mark_finished("s1")
+
+    assert 0 < r.ttl("task:s1") <= store.finished_ttl
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from db.pipeline_crud import PipelineCRUD  # noqa: E402
+from db.pipeline_models import PipelineResult  # noqa: E402
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'pipeline.db'}"
+
+
+def test_scene_urls_and_variants_are_saved_in_one_batch(database_url):
+    crud = PipelineCRUD(database_url)
+    db = crud.get_session()
+
+    crud.save_scene_image_urls(db, [
+        ("p1", 1, "https://bucket/p1/1.webp", {"thumbnail": "https://bucket/p1/1_thumbnail.webp"}),
+        ("p2", 1, "https://bucket/p2/1.webp", None),
+        # 같은 batch 안에서 다시 나온 장면은 갱신
+        ("p1", 1, "https://bucket/p1/1-v2.webp", {"thumbnail": "https://bucket/p1/1_thumbnail-v2.webp"}),
+    ])
+
+    page, = crud.get_result_payload(db, "p1")["pageList"]
+    assert page["imageUrl"] == "https://bucket/p1/1-v2.webp"
+    assert page["imageVariants"] == {"thumbnail": "https://bucket/p1/1_thumbnail-v2.webp"}
+    assert crud.get_result_payload(db, "p2")["pageList"][0]["imageVariants"] == {}
+    db.close()
+
+
+def test_existing_database_without_variant_table_keeps_working(database_url):
+    # variant 테이블이 생기기 전의 데이터베이스
+    engine = create_engine(database_url)
+    PipelineResult.__table__.create(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(PipelineResult.__table__.insert().values(
+            pipeline_id="old", scene_number=1, scene_image_url="https://bucket/old/1.png"
+        ))
+
+    crud = PipelineCRUD(database_url)
+    db = crud.get_session()
+    crud.save_scene_image_urls(db, [("old", 2, "https://bucket/old/2.webp", {"thumbnail": "https://bucket/old/2_t.webp"})])
+
+    pages = crud.get_result_payload(db, "old")["pageList"]
+    assert [(page["imageUrl"], page["imageVariants"]) for page in pages] == [
+        ("https://bucket/old/1.png", {}),
+        ("https://bucket/old/2.webp", {"thumbnail": "https://bucket/old/2_t.webp"}),
+    ]
+    db.close()
+
+def test_scene_stories_are_saved_in_one_transaction(database_url):
+    crud = PipelineCRUD(database_url)
+    db = crud.get_session()
+    crud.save_mood(db, "p1", 1, "happy")
+
+    crud.save_scene_stories(db, "p1", [(1, "여우가 숲을 걸었다."), (2, "비가 왔다.")])
+
+    pages = crud.get_result_payload(db, "p1")["pageList"]
+    assert [(page["mood"], page["story"]) for page in pages] == [("happy", "여우가 숲을 걸었다."), (None, "비가 왔다.")]
+    db.close()
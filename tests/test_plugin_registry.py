@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from collections import OrderedDict
+
+import pytest
+
+from model_registry.plugin_registry import LazyPluginRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_load_imports_registered_class():
+    registry = LazyPluginRegistry({"ordered": "collections:OrderedDict"})
+
+    assert "ordered" in registry and registry.names() == ["ordered"]
+    assert registry.load("ordered") is OrderedDict
+    assert registry.create("ordered", a=1) == OrderedDict(a=1)
+
+
+def test_unknown_name_raises_configured_message():
+    registry = LazyPluginRegistry({}, error_message="지원되지 않는 번역기입니다: {name}")
+
+    with pytest.raises(ValueError, match="지원되지 않는 번역기입니다: papago"):
+        registry.load("papago")
+
+
+def test_register_replaces_loaded_class():
+    registry = LazyPluginRegistry({"store": "collections:OrderedDict"})
+    registry.load("store")
+
+    registry.register("store", "collections:Counter")
+
+    assert registry.load("store").__name__ == "Counter"
+
+
+@pytest.mark.parametrize("selector, heavy_module", [
+    ("translator.translator_selector", "transformers"),
+    ("image_maker.image_maker_selector", "diffusers"),
+])
+def test_selectors_do_not_import_backends_until_used(selector, heavy_module):
+    # 이 프로세스에는 이미 import돼 있을 수 있으므로 새 인터프리터에서 확인
+    code = f"import sys, {selector}; print({heavy_module!r} in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
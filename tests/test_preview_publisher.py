@@ -0,0 +1,115 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import torch
+from diffusers import PNDMScheduler
+
+from image_maker.diffusion_image_maker import DiffusionImageMaker
+from image_maker.preview_publisher import PreviewPublisher, latent_format, preview_channel
+
+
+@pytest.fixture
+def publisher(r):
+    return PreviewPublisher(r, every_n_steps=2, min_interval_seconds=0, max_width=16)
+
+
+def subscribe(r, *preview_keys):
+    pubsub = r.pubsub()
+    pubsub.subscribe(*[preview_channel(key) for key in preview_keys])
+    # 구독 확인 메시지
+    for _ in preview_keys:
+        pubsub.get_message(timeout=1)
+    return pubsub
+
+
+def messages(pubsub):
+    received = []
+    while (message := pubsub.get_message(timeout=0.1)) is not None:
+        if message["type"] == "message":
+            received.append((message["channel"], json.loads(message["data"])))
+    return received
+
+
+def run_steps(callback, total_steps, batch=2, pipe=None):
+    latents = torch.randn(batch, 4, 8, 8)
+    for step_index in range(total_steps):
+        callback(pipe, step_index, 0, {"latents": latents})
+
+
+def test_callback_publishes_every_n_steps_except_last(r, publisher):
+    pubsub = subscribe(r, "p1:1")
+
+    run_steps(publisher.step_callback(["p1:1", None], total_steps=6), 6)
+    publisher.flush(timeout=5)
+
+    received = messages(pubsub)
+    assert [(channel, message["step"]) for channel, message in received] == [
+        ("image_preview:p1:1", 2), ("image_preview:p1:1", 4)
+    ]
+    assert received[0][1]["total_steps"] == 6 and received[0][1]["width"] == 16
+    # 늦게 구독한 클라이언트용 최신 미리보기
+    assert json.loads(r.get(preview_channel("p1:1")))["step"] == 4
+
+
+def test_retract_deletes_latest_preview_after_pending_previews(r, publisher):
+    pubsub = subscribe(r, "p1:1")
+
+    run_steps(publisher.step_callback(["p1:1"], total_steps=4), 4, batch=1)
+    publisher.retract("p1:1")
+    publisher.flush(timeout=5)
+
+    received = [message for _, message in messages(pubsub)]
+    assert received[-1] == {"retracted": True}
+    assert received[0]["step"] == 2
+    assert not r.exists(preview_channel("p1:1"))
+
+
+def test_latent_rgb_factors_depend_on_pipeline(publisher):
+    latents = torch.randn(1, 4, 8, 8, generator=torch.Generator().manual_seed(0))
+
+    sd15, = publisher.decode(latents, "sd15")
+    sdxl, = publisher.decode(latents, "sdxl")
+
+    assert sd15.tobytes() != sdxl.tobytes()
+    assert latent_format(SimpleNamespace(text_encoder_2=object())) == "sdxl"
+    assert latent_format(SimpleNamespace()) == "sd15"
+
+
+class PreviewingPipe:
+    """step마다 callback_on_step_end를 호출하고, 'nsfw' 프롬프트는 seed가 safe_seed 미만이면 NSFW로 판정"""
+
+    def __init__(self, safe_seed):
+        self.device = torch.device("cpu")
+        self.scheduler = PNDMScheduler()
+        self.unet = SimpleNamespace(to=lambda **kwargs: None)
+        self.safe_seed = safe_seed
+
+    def __call__(self, prompt, negative_prompt, generator, num_inference_steps, callback_on_step_end=None, **kwargs):
+        if callback_on_step_end is not None:
+            run_steps(callback_on_step_end, num_inference_steps, batch=len(prompt), pipe=self)
+        seeds = [g.initial_seed() for g in generator]
+        return SimpleNamespace(
+            images=list(zip(prompt, seeds)),
+            nsfw_content_detected=["nsfw" in p and seed < self.safe_seed for p, seed in zip(prompt, seeds)]
+        )
+
+
+def test_flagged_scene_preview_is_retracted_and_not_resent_on_retry(r, publisher):
+    image_maker = DiffusionImageMaker.from_pipe(PreviewingPipe(safe_seed=11))
+    image_maker.num_inference_steps = 4
+    image_maker.max_nsfw_attempts = 2
+    image_maker.preview_publisher = publisher
+    pubsub = subscribe(r, "p1:1", "p1:2")
+
+    images = image_maker.generate_images(["nsfw", "safe"], batch_size=2, seeds=[10, 20], preview_keys=["p1:1", "p1:2"])
+    publisher.flush(timeout=5)
+
+    assert images == [("nsfw", 11), ("safe", 20)]
+    received = messages(pubsub)
+    flagged = [message for channel, message in received if channel == "image_preview:p1:1"]
+    # 첫 시도의 미리보기 뒤에 회수 메시지가 마지막으로 오고, 재생성 후보의 미리보기는 보내지 않음
+    assert [message.get("step") for message in flagged] == [2, None]
+    assert flagged[-1] == {"retracted": True}
+    assert not r.exists(preview_channel("p1:1"))
+    assert r.exists(preview_channel("p1:2"))
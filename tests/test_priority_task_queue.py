@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from task_queue.fan_in_join import FanInJoin
+from task_queue.priority_task_queue import PriorityTaskQueue
+
+
+@pytest.fixture
+def queue(r):
+    queue = PriorityTaskQueue(r, stages=[1], worker_id="worker-a")
+    yield queue
+    queue.close()
+
+
+def task(step_id, tenant="t1", priority=None):
+    mapping = {"status": "queued", "order": 1, "tenantId": tenant}
+    if priority:
+        mapping["priority"] = priority
+    return step_id, mapping
+
+
+def claim_all(queue):
+    claimed = []
+    while (step_id := queue.claim(timeout=0)) is not None:
+        claimed.append(step_id)
+    return claimed
+
+
+def test_priority_classes_order_claims(queue):
+    queue.enqueue_tasks([
+        task("bulk", "t1", "bulk"),
+        task("normal", "t2"),
+        task("interactive", "t3", "interactive"),
+    ])
+
+    assert claim_all(queue) == ["interactive", "normal", "bulk"]
+
+
+def test_unknown_priority_is_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.enqueue_tasks([task("s1", priority="urgent")])
+
+
+def test_fair_share_interleaves_tenants(queue):
+    # t1이 한꺼번에 3개를 넣은 뒤 t2가 1개를 넣어도 t2는 t1의 두 번째 작업보다 먼저 처리됨
+    queue.enqueue_tasks([task(f"t1-{i}", "t1") for i in range(3)])
+    queue.enqueue_tasks([task("t2-0", "t2")])
+
+    assert claim_all(queue) == ["t1-0", "t2-0", "t1-1", "t1-2"]
+
+
+def test_retry_keeps_original_score(r, queue):
+    queue.enqueue_tasks([task("s1", "t1"), task("s2", "t2")])
+    assert queue.claim(timeout=0) == "s1"
+
+    queue.nack("s1")
+
+    assert r.hget("task:s1", "retries") == "1"
+    assert claim_all(queue) == ["s1", "s2"]
+
+
+def test_join_step_gets_fair_share_score(r, queue):
+    queue.enqueue_tasks([task(f"t1-{i}", "t1") for i in range(3)])
+    join = FanInJoin(r, queue)
+    join.register("p1", [1])
+
+    assert join.complete("p1", 1, ("merge", {"status": "queued", "order": 1, "tenantId": "t1"})) is True
+
+    # 가상 시각이 밀린 t1의 작업 뒤로 등록되고, 점수가 해시에도 저장됨
+    score = r.zscore(queue.stage_key(1), "merge")
+    assert float(r.hget("task:merge", "score")) == score
+    assert claim_all(queue) == ["t1-0", "t1-1", "t1-2", "merge"]
+
+
+def test_join_step_keeps_its_position_on_retry(r, queue):
+    join = FanInJoin(r, queue)
+    join.register("p1", [1])
+    join.complete("p1", 1, ("merge", {"status": "queued", "order": 1, "tenantId": "t1"}))
+    assert queue.claim(timeout=0) == "merge"
+    queue.enqueue_tasks([task("urgent", "t2", "interactive")])
+
+    queue.nack("merge")
+
+    # 재시도 시 저장된 점수로 돌아가 더 앞선 점수의 작업을 앞지르지 않음
+    assert float(r.hget("task:merge", "score")) == r.zscore(queue.stage_key(1), "merge")
+    assert claim_all(queue) == ["urgent", "merge"]
+
+
+def test_queue_depths_by_priority(queue):
+    queue.enqueue_tasks([task("a", priority="bulk"), task("b"), task("c", priority="bulk")])
+
+    assert queue.queue_depths(1) == {"interactive": 0, "normal": 1, "bulk": 2}
@@ -0,0 +1,76 @@
+import pytest
+import torch
+
+from benchmarks.tiny_diffusion import build_tiny_sd_pipeline
+from image_maker.prompt_embedding_cache import PromptEmbeddingCache
+
+
+@pytest.fixture(scope="module")
+def pipe():
+    return build_tiny_sd_pipeline()
+
+
+@pytest.fixture
+def encoded_rows(pipe, monkeypatch):
+    """텍스트 인코더가 실제로 인코딩한 행 수 목록"""
+    rows = []
+    forward = pipe.text_encoder.forward
+
+    def counting_forward(input_ids, *args, **kwargs):
+        rows.append(len(input_ids))
+        return forward(input_ids, *args, **kwargs)
+
+    monkeypatch.setattr(pipe.text_encoder, "forward", counting_forward)
+    return rows
+
+
+def test_embeddings_match_pipeline_encode_prompt(pipe):
+    prompts = ["a fox in the forest", "a cat on the roof"]
+
+    cached = PromptEmbeddingCache().encode(pipe, prompts)
+
+    expected, _ = pipe.encode_prompt(prompts, pipe.device, 1, False)
+    torch.testing.assert_close(cached, expected)
+
+
+def test_repeated_texts_are_encoded_once(pipe, encoded_rows):
+    cache = PromptEmbeddingCache()
+    negative = "low quality, blurry"
+
+    cache.encode(pipe, [negative] * 4)
+    embeddings = cache.encode(pipe, ["a fox", negative])
+
+    # 같은 호출 안의 반복과 이전 호출의 결과를 모두 재사용
+    assert encoded_rows == [1, 1]
+    assert embeddings.shape[0] == 2
+    assert cache.stats()["entries"] == 2
+
+
+def test_whitespace_variants_share_an_entry(pipe, encoded_rows):
+    cache = PromptEmbeddingCache()
+
+    cache.encode(pipe, ["a fox in the forest"])
+    cache.encode(pipe, ["a  fox in the   forest"])
+
+    assert encoded_rows == [1]
+
+
+def test_namespace_separates_entries(pipe, encoded_rows):
+    cache = PromptEmbeddingCache()
+
+    cache.encode(pipe, ["a fox"], namespace="dream_shaper")
+    cache.encode(pipe, ["a fox"], namespace="ghibli")
+
+    assert encoded_rows == [1, 1]
+
+
+def test_least_recently_used_entry_is_dropped(pipe, encoded_rows):
+    cache = PromptEmbeddingCache(max_entries=2)
+    cache.encode(pipe, ["a fox", "a cat"])
+    cache.encode(pipe, ["a fox"])
+
+    cache.encode(pipe, ["a dog"])
+    cache.encode(pipe, ["a fox", "a cat"])
+
+    # a cat만 밀려나 다시 인코딩됨
+    assert encoded_rows == [2, 1, 1]
@@ -0,0 +1,194 @@
+import threading
+import time
+
+import pytest
+
+from task_queue.reliable_list_task_queue import ReliableListTaskQueue
+
+
+@pytest.fixture
+def make_queue(r):
+    queues = []
+
+    def make(**kwargs):
+        kwargs.setdefault("stages", [1, 2])
+        kwargs.setdefault("worker_id", "worker-a")
+        queue = ReliableListTaskQueue(r, **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.close()
+
+
+def enqueue(queue, *step_ids, order=1):
+    queue.enqueue_tasks([(step_id, {"status": "queued", "order": order}) for step_id in step_ids])
+
+
+def test_claim_is_fifo_and_leases_the_step(r, make_queue):
+    queue = make_queue()
+    enqueue(queue, "s1", "s2")
+
+    assert queue.claim(timeout=0) == "s1"
+    assert r.lrange(queue.processing_key, 0, -1) == ["s1"]
+    assert r.zscore(queue.leases_key, "s1") > time.time()
+    assert r.hget("task:s1", "workerId") == "worker-a"
+    assert queue.claim(timeout=0) == "s2"
+    assert queue.claim(timeout=0) is None
+
+
+def test_claim_checks_stages_in_priority_order(make_queue):
+    queue = make_queue(stages=[2, 1])
+    enqueue(queue, "low", order=1)
+    enqueue(queue, "high", order=2)
+
+    assert queue.claim(timeout=0) == "high"
+    assert queue.claim(timeout=0) == "low"
+    # 담당하지 않는 stage는 꺼내지 않음
+    enqueue(queue, "other", order=3)
+    assert queue.claim(timeout=0) is None
+
+
+def test_ack_removes_processing_entry_and_lease(r, make_queue):
+    queue = make_queue()
+    enqueue(queue, "s1")
+    queue.claim(timeout=0)
+
+    queue.ack("s1")
+
+    assert r.llen(queue.processing_key) == 0
+    assert r.zscore(queue.leases_key, "s1") is None
+    assert r.hget("task:s1", "workerId") is None
+
+
+def test_late_responses_from_previous_owner_are_ignored(r, make_queue):
+    slow = make_queue(worker_id="worker-slow")
+    enqueue(slow, "s1")
+    slow.claim(timeout=0)
+    # lease가 만료돼 회수된 뒤 다른 워커가 다시 가져간 상황
+    r.zadd(slow.leases_key, {"s1": time.time() - 1})
+    slow.reclaim_expired()
+    other = make_queue(worker_id="worker-b")
+    assert other.claim(timeout=0) == "s1"
+
+    slow.ack("s1")
+    slow.nack("s1")
+    slow.release("s1")
+
+    assert r.hget("task:s1", "workerId") == "worker-b"
+    assert r.zscore(other.leases_key, "s1") is not None
+    assert r.lrange(other.processing_key, 0, -1) == ["s1"]
+    assert r.hget("task:s1", "retries") == "1"
+    assert r.llen(other.stage_key(1)) == 0
+
+    other.ack("s1")
+    assert r.hget("task:s1", "workerId") is None
+    assert r.llen(other.processing_key) == 0
+
+
+def test_claim_blocks_until_a_step_is_enqueued(r, make_queue):
+    queue = make_queue(stages=[1])
+    threading.Timer(0.2, enqueue, args=(queue, "s1")).start()
+
+    started = time.monotonic()
+    assert queue.claim(timeout=5) == "s1"
+    assert time.monotonic() - started < 2
+    assert r.lrange(queue.processing_key, 0, -1) == ["s1"]
+    assert r.zscore(queue.leases_key, "s1") > time.time()
+    assert r.hget("task:s1", "workerId") == "worker-a"
+
+
+def test_claim_waits_on_first_stage_and_rechecks_the_rest(make_queue):
+    queue = make_queue(stages=[1, 2], poll_interval=0.05)
+    threading.Timer(0.2, enqueue, args=(queue, "low"), kwargs={"order": 2}).start()
+
+    assert queue.claim(timeout=5) == "low"
+    assert queue.claim(timeout=0.1) is None
+
+
+def test_nack_requeues_at_front_then_dead_letters(r, make_queue):
+    queue = make_queue(max_retries=1)
+    enqueue(queue, "s1", "s2")
+
+    assert queue.claim(timeout=0) == "s1"
+    queue.nack("s1")
+    # 재시도 step은 먼저 들어온 s2보다 앞에서 다시 꺼내짐
+    assert r.hget("task:s1", "retries") == "1"
+    assert r.hget("task:s1", "status") == "queued"
+    assert queue.claim(timeout=0) == "s1"
+
+    queue.nack("s1")
+    assert r.hget("task:s1", "status") == "failed"
+    assert r.lrange(queue.dead_key, 0, -1) == ["s1"]
+    assert r.zscore(queue.leases_key, "s1") is None
+    assert queue.claim(timeout=0) == "s2"
+
+
+def test_release_requeues_without_counting_a_retry(r, make_queue):
+    queue = make_queue()
+    enqueue(queue, "s1", "s2")
+    queue.claim(timeout=0)
+
+    queue.release("s1")
+
+    assert r.hget("task:s1", "retries") is None
+    assert r.llen(queue.processing_key) == 0
+    # 재시도가 아니므로 대기열 맨 뒤로
+    assert queue.claim(timeout=0) == "s2"
+    assert queue.claim(timeout=0) == "s1"
+
+
+def test_reclaim_expired_lease(r, make_queue):
+    queue = make_queue()
+    enqueue(queue, "s1")
+    queue.claim(timeout=0)
+    # heartbeat가 끊겨 lease가 만료된 상황
+    r.zadd(queue.leases_key, {"s1": time.time() - 1})
+
+    assert queue.reclaim_expired() == ["s1"]
+    assert r.hget("task:s1", "retries") == "1"
+    assert r.llen(queue.processing_key) == 0
+    assert queue.claim(timeout=0) == "s1"
+
+
+def test_reclaim_steps_of_dead_worker(r, make_queue):
+    dead = make_queue(worker_id="worker-dead")
+    enqueue(dead, "s1")
+    dead.claim(timeout=0)
+    # 워커 생존 키가 만료됐지만 lease는 아직 남은 상황 (processing 리스트로 회수)
+    r.delete(dead.alive_key)
+    r.zrem(dead.leases_key, "s1")
+
+    alive = make_queue(worker_id="worker-alive")
+    assert alive.reclaim_expired() == ["s1"]
+    assert not r.exists(dead.processing_key)
+    assert "worker-dead" not in r.smembers(alive.workers_key)
+    assert alive.claim(timeout=0) == "s1"
+
+
+def test_heartbeat_extends_held_leases(r, make_queue):
+    queue = make_queue(visibility_timeout=30)
+    enqueue(queue, "s1")
+    queue.claim(timeout=0)
+    r.zadd(queue.leases_key, {"s1": time.time() + 1})
+
+    queue.heartbeat()
+
+    assert r.zscore(queue.leases_key, "s1") > time.time() + 20
+    assert r.exists(queue.alive_key)
+
+
+def test_dead_lettered_task_hash_expires(r, make_queue):
+    queue = make_queue(max_retries=0, dead_letter_ttl=600)
+    enqueue(queue, "s1", "s2")
+    queue.claim(timeout=0)
+    queue.nack("s1")
+    # lease 만료로 회수되며 dead letter로 가는 경우도 같은 TTL
+    queue.claim(timeout=0)
+    r.zadd(queue.leases_key, {"s2": time.time() - 1})
+    queue.reclaim_expired()
+
+    assert r.lrange(queue.dead_key, 0, -1) == ["s2", "s1"]
+    assert 0 < r.ttl("task:s1") <= 600
+    assert 0 < r.ttl("task:s2") <= 600
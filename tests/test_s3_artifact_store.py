@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from payload_store.payload_store import PayloadStore  # noqa: E402
+from payload_store.s3_artifact_store import S3ArtifactStore  # noqa: E402
+
+BUCKET = "fairytale-test"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    # 실제 자격 증명이 있어도 moto 밖으로 요청이 나가지 않도록 더미 값 사용
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def store(s3_client):
+    return S3ArtifactStore(s3_client, BUCKET)
+
+
+def test_put_get_delete_round_trip(s3_client, store):
+    ref = store.put("p1/s1/payload.zlib", b"\x00compressed\xff")
+
+    assert ref == "task-payloads/p1/s1/payload.zlib"
+    assert store.get(ref) == b"\x00compressed\xff"
+    head = s3_client.head_object(Bucket=BUCKET, Key=ref)
+    assert head["ContentType"] == "application/octet-stream"
+
+    store.delete(ref)
+    assert s3_client.list_objects_v2(Bucket=BUCKET).get("KeyCount", 0) == 0
+
+
+def test_delete_missing_object_is_ignored(store):
+    store.delete("task-payloads/missing")
+
+
+def test_get_missing_object_raises(s3_client, store):
+    with pytest.raises(s3_client.exceptions.NoSuchKey):
+        store.get("task-payloads/missing")
+
+
+def test_payload_store_spills_to_s3(r, s3_client, store):
+    payloads = PayloadStore(r, artifact_store=store, compress_threshold=1024, spill_threshold=1024)
+    rng = random.Random(0)
+    text = "".join(rng.choice("가나다라마바사아자차카타파하 ") for _ in range(20000))
+
+    fields = payloads.pack("s1", "p1", text)
+
+    assert fields["payloadEncoding"] == "ref+zlib"
+    assert fields["payload"] == "task-payloads/p1/s1/payload.zlib"
+    assert payloads.unpack(fields) == text
@@ -0,0 +1,132 @@
+import pytest
+
+from task_queue.stream_task_queue import StreamTaskQueue
+
+
+@pytest.fixture
+def make_queue(r):
+    queues = []
+
+    def make(**kwargs):
+        kwargs.setdefault("stages", [1, 2])
+        kwargs.setdefault("worker_id", "worker-a")
+        queue = StreamTaskQueue(r, **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.close()
+
+
+def enqueue(queue, *step_ids, order=1):
+    queue.enqueue_tasks([(step_id, {"status": "queued", "order": order}) for step_id in step_ids])
+
+
+def test_claim_reads_new_entries_into_pending(r, make_queue):
+    queue = make_queue(stages=[1])
+    enqueue(queue, "s1", "s2")
+
+    assert queue.claim(timeout=0.01) == "s1"
+    pending = queue.pending(1)
+    assert [entry["consumer"] for entry in pending] == ["worker-a"]
+    assert r.hget("task:s1", "status") == "queued"
+    assert queue.claim(timeout=0.01) == "s2"
+    assert queue.claim(timeout=0.01) is None
+
+
+def test_claim_checks_stages_in_priority_order(make_queue):
+    queue = make_queue(stages=[2, 1])
+    enqueue(queue, "low", order=1)
+    enqueue(queue, "high", order=2)
+
+    assert queue.claim(timeout=0.01) == "high"
+    assert queue.claim(timeout=0.01) == "low"
+
+
+def test_consumers_in_one_group_share_entries(make_queue):
+    a = make_queue(worker_id="worker-a")
+    b = make_queue(worker_id="worker-b")
+    enqueue(a, "s1", "s2")
+
+    assert a.claim(timeout=0.01) == "s1"
+    assert b.claim(timeout=0.01) == "s2"
+    assert a.claim(timeout=0.01) is None
+
+
+def test_ack_removes_entry_from_pending_and_stream(r, make_queue):
+    queue = make_queue()
+    enqueue(queue, "s1")
+    queue.claim(timeout=0.01)
+
+    queue.ack("s1")
+
+    assert queue.pending(1) == []
+    assert r.xlen(queue.stage_key(1)) == 0
+
+
+def test_nack_requeues_then_dead_letters(r, make_queue):
+    queue = make_queue(max_retries=1)
+    enqueue(queue, "s1")
+
+    queue.claim(timeout=0.01)
+    queue.nack("s1")
+    assert r.hget("task:s1", "retries") == "1"
+    assert queue.pending(1) == []
+    assert queue.claim(timeout=0.01) == "s1"
+
+    queue.nack("s1")
+    assert r.hget("task:s1", "status") == "failed"
+    assert r.lrange(queue.dead_key, 0, -1) == ["s1"]
+    assert r.xlen(queue.stage_key(1)) == 0
+    assert queue.claim(timeout=0.01) is None
+
+
+def test_release_requeues_without_counting_a_retry(r, make_queue):
+    queue = make_queue()
+    enqueue(queue, "s1")
+    queue.claim(timeout=0.01)
+
+    queue.release("s1")
+
+    assert r.hget("task:s1", "retries") is None
+    assert queue.pending(1) == []
+    assert queue.claim(timeout=0.01) == "s1"
+
+
+def test_reclaim_idle_entries_of_another_consumer(r, make_queue):
+    dead = make_queue(worker_id="worker-dead")
+    enqueue(dead, "s1")
+    dead.claim(timeout=0.01)
+
+    # visibility_timeout 0: pending 항목은 모두 idle 시간 초과로 간주
+    alive = make_queue(worker_id="worker-alive", visibility_timeout=0)
+    assert alive.reclaim_expired() == ["s1"]
+    assert r.hget("task:s1", "retries") == "1"
+    assert alive.pending(1) == []
+    assert alive.claim(timeout=0.01) == "s1"
+
+
+def test_late_nack_after_reclaim_does_not_retry_twice(r, make_queue):
+    slow = make_queue(worker_id="worker-slow")
+    enqueue(slow, "s1")
+    slow.claim(timeout=0.01)
+    alive = make_queue(worker_id="worker-alive", visibility_timeout=0)
+    assert alive.reclaim_expired() == ["s1"]
+
+    # 회수로 이미 재등록된 뒤 늦게 도착한 nack은 재시도 횟수를 올리거나 다시 등록하지 않음
+    slow.nack("s1")
+
+    assert r.hget("task:s1", "retries") == "1"
+    assert r.xlen(slow.stage_key(1)) == 1
+
+
+def test_dead_lettered_task_hash_expires(r, make_queue):
+    queue = make_queue(max_retries=0, dead_letter_ttl=600)
+    enqueue(queue, "s1")
+    queue.claim(timeout=0.01)
+
+    queue.nack("s1")
+
+    assert r.lrange(queue.dead_key, 0, -1) == ["s1"]
+    assert 0 < r.ttl("task:s1") <= 600
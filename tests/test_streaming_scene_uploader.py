@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+from task_runner.streaming_scene_uploader import StreamingSceneUploader
+
+
+class FakeStorage:
+    """업로드/DB 기록을 기록하는 가짜 S3 + DB"""
+
+    def __init__(self, fail_keys=(), fail_write=False):
+        self.uploads = []
+        self.writes = []
+        self.fail_keys = set(fail_keys)
+        self.fail_write = fail_write
+        self.lock = threading.Lock()
+
+    def upload(self, data, s3_key, content_type):
+        if s3_key in self.fail_keys:
+            raise IOError(f"upload failed: {s3_key}")
+        with self.lock:
+            self.uploads.append((s3_key, data, content_type))
+        return f"https://bucket/{s3_key}"
+
+    def write_rows(self, rows):
+        if self.fail_write:
+            raise RuntimeError("db down")
+        self.writes.append(list(rows))
+
+
+def make_uploader(storage, **kwargs):
+    kwargs.setdefault("db_flush_interval", 0.01)
+    return StreamingSceneUploader(storage.upload, storage.write_rows, **kwargs)
+
+
+def scene_files(pipeline_id, scene_number, variants=()):
+    files = [("original", f"{pipeline_id}/{scene_number}.webp", b"original", "image/webp")]
+    files += [(variant, f"{pipeline_id}/{scene_number}_{variant}.webp", b"small", "image/webp") for variant in variants]
+    return files
+
+
+def test_uploads_every_variant_and_writes_one_row():
+    storage = FakeStorage()
+    uploader = make_uploader(storage)
+
+    url = uploader.submit("p1", 1, scene_files("p1", 1, ["thumb"])).result(timeout=5)
+
+    assert url == "https://bucket/p1/1.webp"
+    assert sorted(key for key, _, _ in storage.uploads) == ["p1/1.webp", "p1/1_thumb.webp"]
+    assert storage.writes == [[("p1", 1, url, {"thumb": "https://bucket/p1/1_thumb.webp"})]]
+    uploader.shutdown()
+
+
+def test_scene_without_variants_has_no_variant_urls():
+    storage = FakeStorage()
+    uploader = make_uploader(storage)
+
+    uploader.submit("p1", 1, scene_files("p1", 1)).result(timeout=5)
+
+    assert storage.writes == [[("p1", 1, "https://bucket/p1/1.webp", None)]]
+    uploader.shutdown()
+
+
+def test_rows_of_several_scenes_share_one_transaction():
+    storage = FakeStorage()
+    uploader = make_uploader(storage, db_batch_size=3, db_flush_interval=5)
+
+    futures = [uploader.submit(pipeline_id, n, scene_files(pipeline_id, n)) for pipeline_id, n in [("p1", 1), ("p2", 1), ("p1", 2)]]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert len(storage.writes) == 1
+    assert sorted(row[:2] for row in storage.writes[0]) == [("p1", 1), ("p1", 2), ("p2", 1)]
+    uploader.shutdown()
+
+
+def test_upload_failure_fails_only_that_scene_and_frees_its_slot():
+    storage = FakeStorage(fail_keys={"p1/1_thumb.webp"})
+    uploader = make_uploader(storage, max_workers=1, max_in_flight=1)
+
+    with pytest.raises(IOError):
+        uploader.submit("p1", 1, scene_files("p1", 1, ["thumb"])).result(timeout=5)
+    # 실패한 장면의 자리가 반납되어 다음 submit이 막히지 않음
+    assert uploader.submit("p1", 2, scene_files("p1", 2)).result(timeout=5) == "https://bucket/p1/2.webp"
+    assert [row[:2] for rows in storage.writes for row in rows] == [("p1", 2)]
+    uploader.shutdown()
+
+
+def test_db_failure_fails_every_scene_in_the_batch():
+    storage = FakeStorage(fail_write=True)
+    uploader = make_uploader(storage, db_batch_size=2, db_flush_interval=5)
+
+    futures = [uploader.submit("p1", n, scene_files("p1", n)) for n in (1, 2)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+    uploader.shutdown()
+
+
+def test_submit_blocks_while_max_in_flight_scenes_are_uploading():
+    storage = FakeStorage()
+    release = threading.Event()
+    upload = storage.upload
+
+    def slow_upload(data, s3_key, content_type):
+        release.wait(5)
+        return upload(data, s3_key, content_type)
+
+    uploader = StreamingSceneUploader(slow_upload, storage.write_rows, max_workers=1, max_in_flight=1, db_flush_interval=0.01)
+    first = uploader.submit("p1", 1, scene_files("p1", 1))
+    second = []
+    submitter = threading.Thread(target=lambda: second.append(uploader.submit("p1", 2, scene_files("p1", 2))))
+    submitter.start()
+
+    submitter.join(0.1)
+    assert submitter.is_alive()
+    release.set()
+    submitter.join(5)
+    assert first.result(timeout=5) == "https://bucket/p1/1.webp"
+    assert second[0].result(timeout=5) == "https://bucket/p1/2.webp"
+    uploader.shutdown()
+
+
+def test_max_in_flight_must_cover_workers():
+    with pytest.raises(ValueError):
+        StreamingSceneUploader(lambda *args: "", lambda rows: None, max_workers=4, max_in_flight=2)
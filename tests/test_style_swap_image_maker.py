@@ -0,0 +1,92 @@
+import pytest
+import torch
+from diffusers import StableDiffusionPipeline
+
+from benchmarks.tiny_diffusion import build_tiny_sd_pipeline
+from image_maker.style_adapters import StyleAdapter
+from image_maker.style_swap_image_maker import StyleSwapImageMaker
+
+
+@pytest.fixture(scope="module")
+def model_dirs(tmp_path_factory):
+    """가중치만 다른 tiny SD1.5 모델 두 개"""
+    dirs = []
+    for seed in (0, 1):
+        path = tmp_path_factory.mktemp(f"model{seed}")
+        build_tiny_sd_pipeline(seed=seed).save_pretrained(path)
+        dirs.append(str(path))
+    return dirs
+
+
+def make_maker(model_dirs, max_cached_unets=0):
+    styles = {
+        "base": StyleAdapter("base", negative_prompt="blurry"),
+        "other": StyleAdapter("other", unet=model_dirs[1], max_nsfw_attempts=2),
+    }
+    pipe = StableDiffusionPipeline.from_pretrained(model_dirs[0], safety_checker=None, requires_safety_checker=False)
+    image_maker = StyleSwapImageMaker.from_pipe(pipe, styles, "base", max_cached_unets=max_cached_unets)
+    image_maker.num_inference_steps = 2
+    return image_maker
+
+
+def unet_weights(image_maker):
+    return {k: v.clone() for k, v in image_maker.pipe.unet.state_dict().items()}
+
+
+def assert_same_weights(left, right):
+    assert left.keys() == right.keys()
+    assert all(torch.equal(left[k], right[k]) for k in left)
+
+
+def test_switch_copies_weights_into_the_shared_unet(model_dirs):
+    image_maker = make_maker(model_dirs)
+    unet = image_maker.pipe.unet
+    base = unet_weights(image_maker)
+    other = StableDiffusionPipeline.from_pretrained(model_dirs[1]).unet.state_dict()
+
+    image_maker.apply_style("other")
+    assert image_maker.pipe.unet is unet
+    assert_same_weights(unet_weights(image_maker), other)
+    assert (image_maker.max_nsfw_attempts, image_maker.negative_prompt) == (2, StyleSwapImageMaker.negative_prompt)
+
+    image_maker.apply_style("base")
+    assert_same_weights(unet_weights(image_maker), base)
+    assert image_maker.negative_prompt == "blurry"
+
+
+def test_no_unet_is_kept_resident_by_default(model_dirs):
+    image_maker = make_maker(model_dirs)
+
+    for style in ("other", "base", "other", "base"):
+        image_maker.apply_style(style)
+
+    stats = image_maker.stats()
+    assert stats["cached_unets"] == 0
+    # 전환마다 디스크에서 다시 불러옴
+    assert (stats["switches"], stats["unet_loads"]) == (5, 4)
+
+
+def test_cached_unets_skip_reloads(model_dirs):
+    image_maker = make_maker(model_dirs, max_cached_unets=2)
+
+    for style in ("other", "base", "other", "base"):
+        image_maker.apply_style(style)
+
+    stats = image_maker.stats()
+    assert (stats["cached_unets"], stats["unet_loads"]) == (2, 2)
+
+
+def test_generate_images_switches_style_per_call(model_dirs):
+    image_maker = make_maker(model_dirs)
+
+    base_image, = image_maker.generate_images(["a fox"], batch_size=1, seeds=[0])
+    other_image, = image_maker.generate_images(["a fox"], batch_size=1, seeds=[0], style="other")
+
+    assert image_maker.style == "other"
+    assert base_image.tobytes() != other_image.tobytes()
+    assert image_maker.model_id().endswith(":other")
+
+
+def test_style_cannot_combine_unet_and_lora():
+    with pytest.raises(ValueError):
+        StyleAdapter("broken", unet="some/unet", lora="some/lora")
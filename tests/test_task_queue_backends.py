@@ -0,0 +1,70 @@
+import pytest
+
+from task_queue.task_queue_selector import TaskQueueSelector
+
+BACKENDS = ["list", "stream", "priority"]
+
+
+@pytest.fixture(params=BACKENDS)
+def make_queue(request, r):
+    queues = []
+
+    def make(**kwargs):
+        kwargs.setdefault("worker_id", "worker-a")
+        queue = TaskQueueSelector.get_task_queue(request.param, r, **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.close()
+
+
+def claim_all(queue, **kwargs):
+    claimed = []
+    while (step_id := queue.claim(timeout=0.01, **kwargs)) is not None:
+        claimed.append(step_id)
+    return claimed
+
+
+def test_fan_out_joins_callers_transaction(r, make_queue):
+    queue = make_queue(stages=[4])
+    pipe = r.pipeline(transaction=True)
+    pipe.hset("task:parent", "status", "completed")
+    queue.enqueue_tasks([(f"scene-{n}", {"pipelineId": "p1", "order": 4, "status": "queued"}) for n in range(3)], pipe=pipe)
+    # execute 전에는 부모 상태도 자식 task도 기록되지 않음
+    assert not r.exists("task:parent", "task:scene-0")
+
+    pipe.execute()
+
+    assert r.hget("task:parent", "status") == "completed"
+    assert all(r.hget(f"task:scene-{n}", "pipelineId") == "p1" for n in range(3))
+    assert sorted(claim_all(queue)) == ["scene-0", "scene-1", "scene-2"]
+
+
+def test_enqueue_tasks_without_pipe_executes_immediately(r, make_queue):
+    queue = make_queue(stages=[1])
+
+    queue.enqueue_tasks([("s1", {"order": 1, "status": "queued"})])
+
+    assert r.hget("task:s1", "status") == "queued"
+    assert claim_all(queue) == ["s1"]
+
+
+def test_worker_claims_only_its_stages(make_queue):
+    producer = make_queue()
+    producer.enqueue_tasks([("parse", {"order": 1, "status": "queued"}), ("image", {"order": 5, "status": "queued"})])
+    # 이미지 생성(stage 5) 전용 GPU 워커
+    gpu_worker = make_queue(stages=[5])
+
+    assert claim_all(gpu_worker) == ["image"]
+
+    # 담당 stage가 비면 steal stage(1)까지 확인
+    stealing_worker = make_queue(stages=[5, 1])
+    assert claim_all(stealing_worker, stages=[5]) == []
+    assert claim_all(stealing_worker) == ["parse"]
+
+
+def test_unknown_backend_is_rejected(r):
+    with pytest.raises(ValueError):
+        TaskQueueSelector.get_task_queue("kafka", r)
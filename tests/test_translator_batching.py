@@ -0,0 +1,150 @@
+from translator.marian_translator import MarianTranslator
+from translator.nllb_translator import NLLBTranslator
+from translator.translator_interface import TranslatorInterface
+from translator.translator_manager import TranslatorManager
+
+
+class FakeMarianTokenizer:
+    """단어 단위 tokenizer (토큰 = 단어, 디코드 결과는 대문자)"""
+
+    def __call__(self, sentences, truncation=True):
+        return {"input_ids": [sentence.split() for sentence in sentences]}
+
+    def pad(self, encoded, return_tensors=None):
+        return {"input_ids": encoded["input_ids"]}
+
+    def batch_decode(self, sequences, skip_special_tokens=True):
+        return [" ".join(tokens).upper() for tokens in sequences]
+
+
+class FakeMarianModel:
+    def __init__(self):
+        self.batches = []
+
+    def generate(self, input_ids):
+        self.batches.append([" ".join(tokens) for tokens in input_ids])
+        return input_ids
+
+
+def make_marian(batch_size, sort_by_length=True):
+    # 모델 다운로드 없이 생성
+    translator = MarianTranslator.__new__(MarianTranslator)
+    translator.batch_size = batch_size
+    translator.sort_by_length = sort_by_length
+    translator.tokenizer = FakeMarianTokenizer()
+    translator.model = FakeMarianModel()
+    return translator
+
+
+SENTENCES = ["a b c d", "e", "f g g h i", "j k"]
+
+
+def test_marian_sentences_are_batched_by_length_and_returned_in_order():
+    translator = make_marian(batch_size=2)
+
+    assert translator.translate_sentences(SENTENCES) == [sentence.upper() for sentence in SENTENCES]
+    # 길이가 비슷한 문장끼리 묶여 padding이 줄어듦
+    assert translator.model.batches == [["e", "j k"], ["a b c d", "f g g h i"]]
+
+
+def test_marian_without_length_sort_keeps_input_batches():
+    translator = make_marian(batch_size=3, sort_by_length=False)
+
+    assert translator.translate_sentences(SENTENCES) == [sentence.upper() for sentence in SENTENCES]
+    assert translator.model.batches == [SENTENCES[:3], SENTENCES[3:]]
+
+
+def test_marian_empty_input_skips_generate():
+    translator = make_marian(batch_size=2)
+
+    assert translator.translate_sentences([]) == []
+    assert translator.model.batches == []
+
+
+def test_marian_translate_text_joins_translated_sentences():
+    translator = make_marian(batch_size=8)
+
+    assert translator.translate_text("오늘 비가 왔다. 집에 있었다!") == "오늘 비가 왔다. 집에 있었다!".upper()
+    assert len(translator.model.batches) == 1
+
+
+def test_marian_translate_batch_regroups_sentences_per_text():
+    translator = make_marian(batch_size=8)
+    texts = ["a b. c d e!", "f?", "g h. i. j k l."]
+
+    assert translator.translate_batch(texts) == [text.upper() for text in texts]
+    # 모든 텍스트의 문장이 한 batch로 번역됨
+    assert len(translator.model.batches) == 1
+    assert sorted(translator.model.batches[0]) == sorted(s for text in texts for s in translator.split_sentences(text))
+
+
+class FakeTranslationPipeline:
+    """HF translation pipeline처럼 청크 목록을 받아 대문자로 '번역'하고 호출을 기록"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, chunks, max_length, batch_size):
+        self.calls.append((list(chunks), batch_size))
+        return [{"translation_text": chunk.upper()} for chunk in chunks]
+
+
+def make_nllb(batch_size=16):
+    translator = NLLBTranslator.__new__(NLLBTranslator)
+    translator.batch_size = batch_size
+    translator.translator = FakeTranslationPipeline()
+    return translator
+
+
+def test_nllb_translates_all_scenes_in_one_call():
+    translator = make_nllb(batch_size=4)
+    scenes = ["the fox ran.", "it rained", "the end"]
+
+    assert translator.translate_batch(scenes) == ["THE FOX RAN.", "IT RAINED", "THE END"]
+    assert translator.translator.calls == [(scenes, 4)]
+
+
+def test_nllb_long_scene_chunks_are_rejoined_per_scene():
+    translator = make_nllb()
+    long_scene = " ".join(["word"] * 200)
+
+    first, second = translator.translate_batch([long_scene, "short"])
+
+    chunks = translator.split_text(long_scene)
+    assert len(chunks) > 1
+    assert first == "\n".join(chunk.upper() for chunk in chunks)
+    assert second == "SHORT"
+    assert len(translator.translator.calls) == 1
+
+
+def test_nllb_empty_input_skips_pipeline():
+    translator = make_nllb()
+
+    assert translator.translate_batch([]) == []
+    assert translator.translate_batch([""]) == [""]
+    assert translator.translator.calls == []
+
+
+class EchoTranslator(TranslatorInterface):
+    def __init__(self):
+        self.texts = []
+
+    def translate_text(self, text):
+        self.texts.append(text)
+        return f"<{text}>"
+
+
+def test_interface_default_translate_batch_translates_each_text():
+    translator = EchoTranslator()
+
+    assert translator.translate_batch(["a", "b"]) == ["<a>", "<b>"]
+    assert translator.texts == ["a", "b"]
+
+
+def test_manager_process_batch_uses_translator_batch():
+    translator = make_nllb()
+    manager = TranslatorManager(translator)
+
+    assert manager.process_batch(["one", "two"]) == ["ONE", "TWO"]
+    assert manager.process("three") == "THREE"
+    assert len(translator.translator.calls) == 2
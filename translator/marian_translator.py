@@ -1,32 +1,63 @@
 from translator.translator_interface import TranslatorInterface
 from transformers import MarianMTModel, MarianTokenizer
+from typing import List
 import re
+import torch
 
 class MarianTranslator(TranslatorInterface):
-    def __init__(self, model_name='Helsinki-NLP/opus-mt-ko-en'):
+    def __init__(self, model_name='Helsinki-NLP/opus-mt-ko-en', batch_size=16, sort_by_length=True):
+        """
+        Args:
+            model_name (str): Marian 번역 모델
+            batch_size (int): 한 번의 generate로 번역할 문장 수 (1이면 문장마다 따로 번역)
+            sort_by_length (bool): 길이가 비슷한 문장끼리 batch로 묶어 padding을 줄임 (결과는 원래 문장 순서로 복원)
+        """
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.sort_by_length = sort_by_length
         self.tokenizer = MarianTokenizer.from_pretrained(model_name)
         self.model = MarianMTModel.from_pretrained(model_name)
-    
+
     def split_sentences(self, text):
         return re.split(r'(?<=[.!?])\s+', text)
 
+    def translate_sentences(self, sentences: List[str]) -> List[str]:
+        """
+        문장 목록을 batch_size씩 padding해서 번역하고 입력 순서대로 반환
+        (attention mask로 padding을 가리므로 문장마다 따로 번역한 결과와 같음)
+        """
+        if not sentences:
+            return []
+        input_ids = self.tokenizer(sentences, truncation=True)["input_ids"]
+        order = list(range(len(sentences)))
+        if self.sort_by_length:
+            order.sort(key=lambda i: len(input_ids[i]))
+
+        translated_sentences = [None] * len(sentences)
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start:start + self.batch_size]
+            inputs = self.tokenizer.pad({"input_ids": [input_ids[i] for i in indices]}, return_tensors="pt")
+            with torch.no_grad():
+                translated = self.model.generate(**inputs)
+            for i, result in zip(indices, self.tokenizer.batch_decode(translated, skip_special_tokens=True)):
+                translated_sentences[i] = result
+        return translated_sentences
+
     def translate_text(self, text: str) -> str:
-        # KSS로 문장 분리
+        # 문장 분리 후 batch로 번역
         sentences = self.split_sentences(text)
-
-        # 번역 수행
-        translated_sentences = []
-        for sentence in sentences:
-            inputs = self.tokenizer(sentence, return_tensors="pt", padding=True, truncation=True)
-            translated = self.model.generate(**inputs)
-            result = self.tokenizer.decode(translated[0], skip_special_tokens=True)
-            translated_sentences.append(result)
+        translated_sentences = self.translate_sentences(sentences)
 
         # 최종 번역 결과를 하나의 문자열로 합침
         final_result = " ".join(translated_sentences)
         return final_result
 
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """여러 텍스트의 문장을 모아 함께 batch로 번역하고, 텍스트별로 다시 합침"""
+        sentences_per_text = [self.split_sentences(text) for text in texts]
+        translated = iter(self.translate_sentences([s for sentences in sentences_per_text for s in sentences]))
+        return [" ".join(next(translated) for _ in sentences) for sentences in sentences_per_text]
+
 # 메인 가드
 if __name__ == "__main__":
     sample_text = "제 미쿡친구 줴임스에게 6마눠을 송금하구 시풔요"
@@ -1,8 +1,11 @@
 from translator.translator_interface import TranslatorInterface
 from transformers import pipeline
+from typing import List
 
 class NLLBTranslator(TranslatorInterface):
-    def __init__(self, model_name='NHNDQ/nllb-finetuned-en2ko', device=0, src_lang='eng_Latn', tgt_lang='kor_Hang'):
+    def __init__(self, model_name='NHNDQ/nllb-finetuned-en2ko', device=0, src_lang='eng_Latn', tgt_lang='kor_Hang', batch_size=16):
+        # 한 번의 generate로 번역할 청크 수 (HF pipeline의 batch_size)
+        self.batch_size = batch_size
         self.translator = pipeline(
             'translation',
             model=model_name,
@@ -12,16 +15,24 @@ class NLLBTranslator(TranslatorInterface):
         )
 
     def translate_text(self, text: str) -> str:
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        여러 텍스트(동화의 장면들 등)를 한 번에 번역
+        모든 텍스트의 청크를 모아 pipeline에 batch_size씩 넘기고, 텍스트별로 다시 합침
+        """
         # 긴 텍스트를 여러 청크로 분할
-        chunks = self.split_text(text)
-        translated_chunks = []
+        chunks_per_text = [self.split_text(text) for text in texts]
+        chunks = [chunk for text_chunks in chunks_per_text for chunk in text_chunks]
+        if not chunks:
+            return ["" for _ in texts]
 
-        for chunk in chunks:
-            output = self.translator(chunk, max_length=512)
-            translated_chunks.append(output[0]['translation_text'])
+        outputs = self.translator(chunks, max_length=512, batch_size=self.batch_size)
+        translated_chunks = iter(output['translation_text'] for output in outputs)
 
         # 결과 병합
-        return "\n".join(translated_chunks)
+        return ["\n".join(next(translated_chunks) for _ in text_chunks) for text_chunks in chunks_per_text]
 
     def split_text(self, text, max_length=500):
         """텍스트를 max_length(단어 기준)로 분할하는 헬퍼 함수"""
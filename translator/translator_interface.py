@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 class TranslatorInterface(ABC):
     @abstractmethod
     def translate_text(self, text: str) -> str:
         pass
 
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        여러 텍스트를 번역해 입력 순서대로 반환 (기본 구현은 하나씩 번역, batch로 번역할 수 있는 번역기는 재정의)
+        결과는 텍스트마다 translate_text를 호출한 것과 같음
+        """
+        return [self.translate_text(text) for text in texts]
@@ -1,4 +1,5 @@
 from translator.translator_interface import TranslatorInterface
+from typing import List
 
 class TranslatorManager:
     def __init__(self, translator: TranslatorInterface):
@@ -11,6 +12,12 @@ class TranslatorManager:
         translated = self.translator.translate_text(input_text)
         return translated
 
+    def process_batch(self, input_texts: List[str]) -> List[str]:
+        """
+        Translate several texts in one batched call and return them in input order.
+        """
+        return self.translator.translate_batch(input_texts)
+
     def process_from_path(self, input_path: str, output_path: str) -> str:
         """
         Read text from file, translate it, and write result to output file.
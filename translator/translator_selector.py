@@ -1,15 +1,14 @@
 from translator.translator_interface import TranslatorInterface
-from translator.marian_translator import MarianTranslator
-from translator.nllb_translator import NLLBTranslator
+from model_registry.plugin_registry import LazyPluginRegistry
+
+# transformers는 번역기를 처음 만들 때 import
+TRANSLATORS = LazyPluginRegistry({
+    "nllb": "translator.nllb_translator:NLLBTranslator",
+    "marian": "translator.marian_translator:MarianTranslator",
+}, error_message="지원되지 않는 번역기입니다: {name}")
 
 class TranslatorSelector:
     @staticmethod
     def get_translator(translator: str) -> TranslatorInterface:
         """언어 쌍에 따라 적합한 번역기 객체를 반환"""
-        if translator == 'nllb':
-            return NLLBTranslator()
-        elif translator == 'marian':
-            return MarianTranslator()
-        else:
-            raise ValueError(f"지원되지 않는 번역기입니다: {translator}")
-
+        return TRANSLATORS.create(translator)
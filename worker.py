@@ -1,5 +1,6 @@
-import redis, time, uuid, requests, boto3, os, json
+import redis, time, uuid, requests, boto3, os, json, argparse
 from io import BytesIO
+from concurrent.futures import Future
 
 from dotenv import load_dotenv
 from db.pipeline_crud import PipelineCRUD
@@ -16,6 +17,19 @@ from emotion_classifier.emotion_classifier_selector import EmotionClassifierSele
 from emotion_classifier.emotion_classifier_manager import EmotionClassifierManager
 from image_maker.image_maker_selector import ImageMakerSelector
 from image_maker.image_maker_manager import ImageMakerManager
+from image_maker.dynamic_image_batcher import DynamicImageBatcher
+from image_maker.image_encoder import ImageEncoder, ORIGINAL_VARIANT, parse_variants
+from image_maker.image_cache import ImageCache, prompt_seed
+from model_registry.model_registry import ModelRegistry
+from task_runner.concurrent_step_runner import ConcurrentStepRunner
+from task_runner.streaming_scene_uploader import StreamingSceneUploader
+from task_queue.task_queue_selector import TaskQueueSelector
+from task_queue.fan_in_join import FanInJoin
+from task_queue.queue_metrics import observe_queue_wait
+from payload_store.payload_store import PayloadStore
+from payload_store.artifact_store_selector import ArtifactStoreSelector
+from payload_store.local_artifact_store import LocalArtifactStore
+from prometheus_client import start_http_server
 
 # Redis 연결
 r = redis.Redis(host="redis", port=6379, db=0, decode_responses=True)
@@ -33,7 +47,132 @@ AWS_ACCESS_KEY = os.getenv("AWS_S3_ACCESS_KEY")
 AWS_SECRET_KEY = os.getenv("AWS_S3_SECRET_KEY")
 PRESIGNED_EXPIRATION = int(os.getenv("AWS_S3_PRESIGNED_URL_EXPIRATION", "300")) 
 
+# 모델 레지스트리 RAM 예산 (MB, 미설정 시 무제한)
+MODEL_REGISTRY_MAX_MEMORY_MB = os.getenv("MODEL_REGISTRY_MAX_MEMORY_MB")
+
+# 작업 큐 설정: backend(list / stream / priority), lease 만료 시간(초), step별 최대 재시도 횟수, 만료 lease 회수 주기(초)
+TASK_QUEUE_BACKEND = os.getenv("TASK_QUEUE_BACKEND", "list")
+WORKER_ID = os.getenv("WORKER_ID")
+# 담당 stage(step order) 목록, 쉼표 구분 (미설정 시 전체 stage). --stages / --steal-stages 인자가 우선
+WORKER_STAGES = os.getenv("WORKER_STAGES")
+WORKER_STEAL_STAGES = os.getenv("WORKER_STEAL_STAGES")
+TASK_VISIBILITY_TIMEOUT_SECONDS = float(os.getenv("TASK_VISIBILITY_TIMEOUT_SECONDS", "60"))
+TASK_MAX_RETRIES = int(os.getenv("TASK_MAX_RETRIES", "3"))
+TASK_RECLAIM_INTERVAL_SECONDS = float(os.getenv("TASK_RECLAIM_INTERVAL_SECONDS", "15"))
+
+# task payload 저장 설정: 압축 codec(zlib / zstd), 압축 기준 크기, artifact store로 내보낼 기준 크기(압축 후),
+# artifact store(none / local / s3), 끝난 task 해시 TTL(초)
+PAYLOAD_CODEC = os.getenv("PAYLOAD_CODEC", "zlib")
+PAYLOAD_COMPRESS_THRESHOLD_BYTES = int(os.getenv("PAYLOAD_COMPRESS_THRESHOLD_BYTES", "4096"))
+PAYLOAD_SPILL_THRESHOLD_BYTES = int(os.getenv("PAYLOAD_SPILL_THRESHOLD_BYTES", str(1024 * 1024)))
+PAYLOAD_ARTIFACT_STORE = os.getenv("PAYLOAD_ARTIFACT_STORE", "none")
+PAYLOAD_ARTIFACT_DIR = os.getenv("PAYLOAD_ARTIFACT_DIR", "outputs/artifacts")
+TASK_RESULT_TTL_SECONDS = int(os.getenv("TASK_RESULT_TTL_SECONDS", "86400"))
+
+# 큐 대기 시간 등 Prometheus 메트릭 노출 포트 (미설정 시 노출하지 않음)
+WORKER_METRICS_PORT = os.getenv("WORKER_METRICS_PORT")
+
+# 워커 실행 모드: serial(기본, step 하나씩) / concurrent(자원별 한도 내 동시 실행)
+WORKER_MODE = os.getenv("WORKER_MODE", "serial")
+WORKER_DIFFUSION_CONCURRENCY = int(os.getenv("WORKER_DIFFUSION_CONCURRENCY", "1"))
+WORKER_CPU_MODEL_CONCURRENCY = int(os.getenv("WORKER_CPU_MODEL_CONCURRENCY", "2"))
+WORKER_HTTP_CONCURRENCY = int(os.getenv("WORKER_HTTP_CONCURRENCY", "4"))
+WORKER_REQUEUE_BACKOFF_SECONDS = float(os.getenv("WORKER_REQUEUE_BACKOFF_SECONDS", "0.2"))
+
+# 동적 batching (concurrent 모드 전용): 여러 파이프라인의 장면을 모아 최대 IMAGE_BATCH_MAX_SIZE장씩,
+# 첫 장면 이후 최대 IMAGE_BATCH_MAX_WAIT_MS만큼 기다렸다가 한 번에 생성. 1이면 사용하지 않음
+IMAGE_BATCH_MAX_SIZE = int(os.getenv("IMAGE_BATCH_MAX_SIZE", "1"))
+IMAGE_BATCH_MAX_WAIT_MS = float(os.getenv("IMAGE_BATCH_MAX_WAIT_MS", "200"))
+# batch에 넣은 장면 결과를 기다리는 최대 시간(초). 넘으면 step 실패로 nack되어 워커 전체가 멈추지 않음
+IMAGE_BATCH_TIMEOUT_SECONDS = float(os.getenv("IMAGE_BATCH_TIMEOUT_SECONDS", "600"))
+
+# 장면 이미지 업로드/DB 기록 (렌더링과 겹쳐 백그라운드에서 실행): 동시 업로드 수, 메모리에 둘 최대 업로드 대기 이미지 수,
+# DB에 한 트랜잭션으로 모아 저장할 최대 장면 수와 최대 대기 시간
+IMAGE_UPLOAD_CONCURRENCY = int(os.getenv("IMAGE_UPLOAD_CONCURRENCY", "4"))
+IMAGE_UPLOAD_MAX_IN_FLIGHT = int(os.getenv("IMAGE_UPLOAD_MAX_IN_FLIGHT", "8"))
+IMAGE_DB_BATCH_SIZE = int(os.getenv("IMAGE_DB_BATCH_SIZE", "16"))
+IMAGE_DB_FLUSH_MS = float(os.getenv("IMAGE_DB_FLUSH_MS", "200"))
+
+# 업로드 이미지 인코딩: 포맷(png / webp / jpeg), WebP/JPEG 품질, 원본과 함께 올릴 축소 버전 (예: "thumbnail:256,mobile:768")
+IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "png")
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "85"))
+IMAGE_VARIANTS = os.getenv("IMAGE_VARIANTS", "")
+# true면 PNG/JPEG를 최적화 인코딩 (크기는 조금 줄지만 인코딩 시간이 크게 늘어 기본은 끔)
+IMAGE_OPTIMIZE = os.getenv("IMAGE_OPTIMIZE", "false").lower() == "true"
+
+# NSFW로 판정된 장면 재생성 방식: serial (한 후보씩 최대 2번 더) / parallel (남은 후보를 한 batch로 생성해 첫 번째 안전한 이미지 사용)
+IMAGE_NSFW_RETRY_STRATEGY = os.getenv("IMAGE_NSFW_RETRY_STRATEGY", "serial")
+
+# true면 장면 batch의 VAE 디코드/PIL 변환과 업로드용 인코딩을 디코드 스레드에서 처리해 다음 batch의 denoising과 겹침
+# (SD1.5 계열만, 여러 장면이 함께 생성되는 dynamic batcher(IMAGE_BATCH_MAX_SIZE > 1)에서 batch를 두 개 이상으로 나눠 겹침)
+IMAGE_PIPELINED_DECODE = os.getenv("IMAGE_PIPELINED_DECODE", "false").lower() == "true"
+
+# 그림체 전환: true면 SD1.5 base 파이프라인 하나(텍스트 인코더/VAE 공유)에서 요청별 imageStyle로 UNet/LoRA를 바꿔 생성,
+# IMAGE_STYLE은 요청에 imageStyle이 없을 때의 그림체
+IMAGE_STYLE_SWAP = os.getenv("IMAGE_STYLE_SWAP", "false").lower() == "true"
+IMAGE_STYLE = os.getenv("IMAGE_STYLE", "dream_shaper")
+
+# 요청에 inferenceProfile이 없을 때 쓸 이미지 생성 profile (draft / standard / quality, 미설정 시 모델 기본 설정)
+IMAGE_INFERENCE_PROFILE = os.getenv("IMAGE_INFERENCE_PROFILE") or None
+
+# 이미지 생성 메모리 절약: auto(생성기를 불러온 뒤 남은 메모리로 선택) / off / balanced(VAE slicing) /
+# low(VAE tiling, UNet bf16 저장, CUDA sequential CPU offload, 한 장씩 생성)
+IMAGE_MEMORY_SAVER = os.getenv("IMAGE_MEMORY_SAVER", "auto")
+
+# 이미지 생성 중간 미리보기: imagePreview를 요청한 파이프라인만 N step마다 Redis pub/sub(image_preview:{pipeline id}:{장면 번호})로
+# 전송 (0이면 사용 안 함), NSFW로 판정된 장면은 미리보기를 회수({"retracted": true}),
+# 장면별 최소 전송 간격(ms), 미리보기 너비(px), TAESD 모델(미설정 시 가중치 없는 latent 선형 근사로 디코드)
+IMAGE_PREVIEW_EVERY_N_STEPS = int(os.getenv("IMAGE_PREVIEW_EVERY_N_STEPS", "0"))
+IMAGE_PREVIEW_MIN_INTERVAL_MS = float(os.getenv("IMAGE_PREVIEW_MIN_INTERVAL_MS", "1000"))
+IMAGE_PREVIEW_MAX_WIDTH = int(os.getenv("IMAGE_PREVIEW_MAX_WIDTH", "256"))
+IMAGE_PREVIEW_TAESD_MODEL = os.getenv("IMAGE_PREVIEW_TAESD_MODEL") or None
+
+# 번역 batch 크기: 한 번의 generate로 번역할 문장(Marian) / 청크(NLLB) 수 (1이면 하나씩 번역)
+TRANSLATION_BATCH_SIZE = int(os.getenv("TRANSLATION_BATCH_SIZE", "16"))
+
+# 텍스트 인코더 출력 캐시 크기 (프롬프트/negative prompt 임베딩 LRU 항목 수, 0이면 사용 안 함)
+PROMPT_EMBEDDING_CACHE_SIZE = int(os.getenv("PROMPT_EMBEDDING_CACHE_SIZE", "256"))
+
+# 이미지 결과 캐시: 저장 경로(미설정 시 사용 안 함), 용량 예산(MB), LRU 인덱스를 Redis에 둘지 여부(워커 간 공유 볼륨일 때)
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR")
+IMAGE_CACHE_MAX_MB = int(os.getenv("IMAGE_CACHE_MAX_MB", "2048"))
+IMAGE_CACHE_REDIS_INDEX = os.getenv("IMAGE_CACHE_REDIS_INDEX", "false").lower() == "true"
+
+# 프로세스 전역 모델 레지스트리: 백엔드별로 한 번만 로드하고 재사용
+registry = ModelRegistry(
+    max_memory_bytes=int(MODEL_REGISTRY_MAX_MEMORY_MB) * 1024 ** 2 if MODEL_REGISTRY_MAX_MEMORY_MB else None
+)
+
+# 작업 큐 (stage별 대기열, claim/ack 기반 at-least-once)
+def build_task_queue(stages=None):
+    return TaskQueueSelector.get_task_queue(
+        TASK_QUEUE_BACKEND,
+        r,
+        stages=stages,
+        worker_id=WORKER_ID,
+        visibility_timeout=TASK_VISIBILITY_TIMEOUT_SECONDS,
+        max_retries=TASK_MAX_RETRIES,
+        # dead letter로 옮긴 task 해시(payload 포함)도 끝난 task와 같은 TTL
+        dead_letter_ttl=TASK_RESULT_TTL_SECONDS
+    )
+
+# 워커 시작 시 담당 stage로 다시 생성 (그 전까지는 다음 step 등록용)
+queue = build_task_queue()
+
+# scene parser 이후 분기(이미지 생성/번역/감정분석)가 모두 끝나면 완료 알림 step을 등록하는 join
+IMAGE_MAKER_ORDER = 5
+NOTIFY_ORDER = 6
+join = FanInJoin(r, queue)
+
 # 큐 관련 처리
+def inherited_fields(current_task_data):
+    """다음 step에 그대로 전달할 요청 단위 필드 (우선순위, tenant, 이미지 생성 profile, 그림체, 미리보기 요청)"""
+    return {
+        field: current_task_data[field]
+        for field in ("priority", "tenantId", "inferenceProfile", "imageStyle", "imagePreview")
+        if current_task_data.get(field)
+    }
+
 def enqueue_next_step(current_task_data, result):
     """
     현재 task 정보를 바탕으로 다음 step을 생성하고 큐에 등록
@@ -44,20 +183,25 @@ def enqueue_next_step(current_task_data, result):
     """
     next_order = int(current_task_data['order']) + 1
     next_step_id = str(uuid.uuid4())
+    pipeline_id = current_task_data['pipelineId']
 
-    r.hset(f"task:{next_step_id}", mapping={
-        "status": "queued",
-        "payload": result,
-        "pipelineId": current_task_data['pipelineId'],
-        "order": next_order
-    })
-
-    r.lpush("task_queue", next_step_id)
+    # payload 집계, task 해시 저장과 큐 등록을 한 번의 왕복으로 처리
+    pipe = r.pipeline(transaction=True)
+    queue.enqueue_tasks([
+        (next_step_id, {
+            "status": "queued",
+            **payloads.pack(next_step_id, pipeline_id, result, pipe=pipe),
+            "pipelineId": pipeline_id,
+            "order": next_order,
+            **inherited_fields(current_task_data)
+        })
+    ], pipe=pipe)
+    pipe.execute()
     print(f"[STEP {current_task_data['order']}] 다음 step 생성 및 큐 등록 완료: {next_step_id}")
 
 def enqueue_next_steps_after_scene_parser(current_task_data, result):
     """
-    scene parser 이후 분기 처리: 3개의 다음 step을 각각 등록
+    scene parser 이후 분기 처리: 3개의 다음 step을 한 번에 등록
 
     Args:
         current_task_data (dict): 현재 step의 task 데이터 (stepId 포함 X)
@@ -68,39 +212,120 @@ def enqueue_next_steps_after_scene_parser(current_task_data, result):
 
     # 3개 payload 생성 및 점검 출력 함수 호출
     original_result, translation_payload, emotion_payload = create_payloads_and_check(result)
+    image_step_id, translation_step_id, emotion_step_id = (str(uuid.uuid4()) for _ in range(3))
+
+    # join 등록, payload 집계와 3개 task의 해시 저장/큐 등록을 MULTI/EXEC 한 번으로 원자적으로 처리
+    pipe = r.pipeline(transaction=True)
+    tasks = [
+        # image_generation은 원본 전체 result 전달
+        (image_step_id, {
+            "status": "queued",
+            **payloads.pack(image_step_id, pipeline_id, original_result, pipe=pipe),
+            "pipelineId": pipeline_id,
+            "order": base_order + 1,
+            **inherited_fields(current_task_data)
+        }),
+        # story_translation: translation_payload JSON 직렬화하여 전달
+        (translation_step_id, {
+            "status": "queued",
+            **payloads.pack(translation_step_id, pipeline_id, json.dumps(translation_payload, ensure_ascii=False), pipe=pipe),
+            "pipelineId": pipeline_id,
+            "order": int(f"{base_order}1"),
+            **inherited_fields(current_task_data)
+        }),
+        # emotion_classification: emotion_payload JSON 직렬화하여 전달
+        (emotion_step_id, {
+            "status": "queued",
+            **payloads.pack(emotion_step_id, pipeline_id, json.dumps(emotion_payload, ensure_ascii=False), pipe=pipe),
+            "pipelineId": pipeline_id,
+            "order": int(f"{base_order}2"),
+            **inherited_fields(current_task_data)
+        }),
+    ]
 
-    # image_generation은 원본 전체 result 전달
-    step_id_img = str(uuid.uuid4())
-    r.hset(f"task:{step_id_img}", mapping={
-        "status": "queued",
-        "payload": original_result,
-        "pipelineId": pipeline_id,
-        "order": base_order + 1
-    })
-    r.lpush("task_queue", step_id_img)
-    print(f"[STEP {base_order}] 다음 step 생성 및 큐 등록 완료: {step_id_img}")
+    # 이미지 분기는 prompt maker를 거쳐 장면별 image_maker(5)에서 끝나므로 branch는 5, 31, 32
+    join.register(pipeline_id, [IMAGE_MAKER_ORDER, int(f"{base_order}1"), int(f"{base_order}2")], pipe=pipe)
+    queue.enqueue_tasks(tasks, pipe=pipe)
+    pipe.execute()
+    for step_id, _ in tasks:
+        print(f"[STEP {base_order}] 다음 step 생성 및 큐 등록 완료: {step_id}")
 
-    # story_translation: translation_payload JSON 직렬화하여 전달
-    step_id_trans = str(uuid.uuid4())
-    r.hset(f"task:{step_id_trans}", mapping={
-        "status": "queued",
-        "payload": json.dumps(translation_payload, ensure_ascii=False),
-        "pipelineId": pipeline_id,
-        "order": int(f"{base_order}1")
-    })
-    r.lpush("task_queue", step_id_trans)
-    print(f"[STEP {int(f'{base_order}')}] 다음 step 생성 및 큐 등록 완료: {step_id_trans}")
+def enqueue_image_steps_per_scene(current_task_data, result):
+    """
+    prompt maker 이후 분기 처리: 장면마다 image_maker step을 하나씩 등록해 여러 GPU 워커가 나눠 처리
+
+    Args:
+        current_task_data (dict): 현재 step의 task 데이터
+        result (str): prompt maker의 결과 ('[{"scene_number": "1", "generated_prompt": "..."}, ...]')
+    """
+    pipeline_id = current_task_data['pipelineId']
+    prompts = json.loads(result)
+
+    # join 교체, payload 집계와 장면 task 등록을 같은 트랜잭션으로 처리
+    pipe = r.pipeline(transaction=True)
+    tasks = []
+    # 장면 번호는 기존 일괄 처리와 같이 프롬프트 순서(1부터) 기준
+    for scene_number, prompt in enumerate(prompts, 1):
+        scene_step_id = str(uuid.uuid4())
+        generated_prompt = prompt.get("generated_prompt", "")
+        scene_payload = json.dumps({
+            "scene_number": scene_number,
+            "generated_prompt": generated_prompt,
+            # 프롬프트 기반 고정 seed: 재시도/재요청 시 같은 이미지가 나오고 이미지 캐시를 재사용
+            "seed": prompt_seed(generated_prompt),
+            "inference_profile": current_task_data.get("inferenceProfile") or IMAGE_INFERENCE_PROFILE,
+            "style": current_task_data.get("imageStyle") or IMAGE_STYLE,
+            "preview": current_task_data.get("imagePreview") == "true"
+        }, ensure_ascii=False)
+        tasks.append((scene_step_id, {
+            "status": "queued",
+            **payloads.pack(scene_step_id, pipeline_id, scene_payload, pipe=pipe),
+            "pipelineId": pipeline_id,
+            "order": IMAGE_MAKER_ORDER,
+            "sceneNumber": scene_number,
+            **inherited_fields(current_task_data)
+        }))
+
+    if not tasks:
+        # 생성할 장면이 없으면 이미지 분기를 바로 완료 처리
+        complete_fan_in_branch({**current_task_data, "order": IMAGE_MAKER_ORDER})
+        return
+
+    # join의 이미지 분기를 장면별 branch로 교체
+    join.expand(pipeline_id, IMAGE_MAKER_ORDER, [scene_branch(IMAGE_MAKER_ORDER, m["sceneNumber"]) for _, m in tasks], pipe=pipe)
+    queue.enqueue_tasks(tasks, pipe=pipe)
+    pipe.execute()
+    print(f"[STEP {current_task_data['order']}] 장면별 이미지 생성 step {len(tasks)}개 등록 완료")
 
-    # emotion_classification: emotion_payload JSON 직렬화하여 전달
-    step_id_emo = str(uuid.uuid4())
-    r.hset(f"task:{step_id_emo}", mapping={
+def scene_branch(order, scene_number):
+    return f"{order}:{scene_number}"
+
+def complete_fan_in_branch(current_task_data):
+    """
+    scene parser 이후 분기 step 완료 처리: 마지막으로 끝난 branch라면 완료 알림 step을 등록
+
+    Args:
+        current_task_data (dict): 현재 step의 task 데이터
+    """
+    pipeline_id = current_task_data['pipelineId']
+    notify_step_id = str(uuid.uuid4())
+
+    # 장면별 step은 장면 단위 branch로 완료
+    branch = int(current_task_data['order'])
+    if current_task_data.get("sceneNumber"):
+        branch = scene_branch(branch, current_task_data["sceneNumber"])
+
+    fired = join.complete(pipeline_id, branch, (notify_step_id, {
         "status": "queued",
-        "payload": json.dumps(emotion_payload, ensure_ascii=False),
+        "payload": "success",
         "pipelineId": pipeline_id,
-        "order": int(f"{base_order}2")
-    })
-    r.lpush("task_queue", step_id_emo)
-    print(f"[STEP {int(f'{base_order}')}] 다음 step 생성 및 큐 등록 완료: {step_id_emo}")
+        "order": NOTIFY_ORDER,
+        **inherited_fields(current_task_data)
+    }))
+    if fired:
+        print(f"[STEP {branch}] 모든 분기 완료, 완료 알림 step 등록: {notify_step_id}")
+    else:
+        print(f"[STEP {branch}] 분기 완료, 남은 분기: {join.remaining(pipeline_id)}")
 
 # scene parser 큐 생성 유틸
 def create_payloads_and_check(result: str):
@@ -135,52 +360,135 @@ def create_payloads_and_check(result: str):
     ]
     return original_result, translation_payload, emotion_payload
 
+def load_translator(translator_name):
+    translator = TranslatorSelector.get_translator(translator_name)
+    translator.batch_size = TRANSLATION_BATCH_SIZE
+    return translator
+
 # ko_en_translator 로직
 def ko_en_translator(input_text:str):
-    translator = TranslatorSelector.get_translator("marian")
+    translator = registry.get("translator:marian", lambda: load_translator("marian"))
     translator_manager = TranslatorManager(translator)
     return translator_manager.process(input_text)
 
 # story_writer 로직
 def story_writer(input_text:str):
-    story_writer = StoryWriterSelector.get_writer("llama")
+    story_writer = registry.get("story_writer:llama", lambda: StoryWriterSelector.get_writer("llama"))
     story_manager = StoryWriterManager(story_writer)
     return story_manager.process(input_text)
 
 # scene_parser 로직
 def scene_parser(input_text:str):
-    parser = SceneParserSelector.get_parser(parser_type="llama")
+    parser = registry.get("scene_parser:llama", lambda: SceneParserSelector.get_parser(parser_type="llama"))
     manager = SceneParserManager(parser)
     return manager.process(input_text)
 
 # prompt_maker 로직
 def prompt_maker(input_text:str):
-    prompt_maker = PromptMakerSelector.get_prompt_maker("llama")
+    prompt_maker = registry.get("prompt_maker:llama", lambda: PromptMakerSelector.get_prompt_maker("llama"))
     manager = PromptMakerManager(prompt_maker)
     return manager.process(input_text)
 
-# image_maker 로직
-def image_maker(input_text: str, pipeline_id: str, crud: PipelineCRUD):
-    image_maker = ImageMakerSelector.get_image_maker('dream_shaper')
-    manager = ImageMakerManager(image_maker)
-
-    images = manager.process(input_text)  # List[bytes]
+# image_maker 로직 (장면 하나)
+image_cache = ImageCache(
+    IMAGE_CACHE_DIR,
+    max_bytes=IMAGE_CACHE_MAX_MB * 1024 ** 2,
+    r=r if IMAGE_CACHE_REDIS_INDEX else None
+) if IMAGE_CACHE_DIR else None
+
+# 이미지 생성기를 처음 불러올 때 생성 (torch import를 이미지 step을 처리하는 워커로 미룸)
+prompt_embedding_cache = None
+preview_publisher = None
+
+def load_image_maker(model_name):
+    global prompt_embedding_cache, preview_publisher
+    if prompt_embedding_cache is None and PROMPT_EMBEDDING_CACHE_SIZE > 0:
+        from image_maker.prompt_embedding_cache import PromptEmbeddingCache
+        prompt_embedding_cache = PromptEmbeddingCache(PROMPT_EMBEDDING_CACHE_SIZE)
+    if preview_publisher is None and IMAGE_PREVIEW_EVERY_N_STEPS > 0:
+        from image_maker.preview_publisher import PreviewPublisher
+        preview_publisher = PreviewPublisher(
+            r,
+            every_n_steps=IMAGE_PREVIEW_EVERY_N_STEPS,
+            min_interval_seconds=IMAGE_PREVIEW_MIN_INTERVAL_MS / 1000,
+            max_width=IMAGE_PREVIEW_MAX_WIDTH,
+            taesd_model=IMAGE_PREVIEW_TAESD_MODEL
+        )
+    image_maker = ImageMakerSelector.get_image_maker(model_name)
+    image_maker.image_cache = image_cache
+    image_maker.prompt_embedding_cache = prompt_embedding_cache
+    image_maker.preview_publisher = preview_publisher
+    image_maker.nsfw_retry_strategy = IMAGE_NSFW_RETRY_STRATEGY
+    image_maker.pipelined_decode = IMAGE_PIPELINED_DECODE
+    image_maker.default_inference_profile = IMAGE_INFERENCE_PROFILE
+    print(f"[{model_name}] memory saver: {image_maker.apply_memory_saver(IMAGE_MEMORY_SAVER)}")
+    return image_maker
+
+def get_image_maker():
+    if IMAGE_STYLE_SWAP:
+        return registry.get("image_maker:sd15_styles", lambda: load_image_maker('sd15_styles'))
+    return registry.get("image_maker:dream_shaper", lambda: load_image_maker('dream_shaper'))
+
+# concurrent 모드에서 IMAGE_BATCH_MAX_SIZE > 1이면 워커 시작 시 생성
+image_batcher = None
+
+image_encoder = ImageEncoder(IMAGE_FORMAT, IMAGE_QUALITY, parse_variants(IMAGE_VARIANTS), optimize=IMAGE_OPTIMIZE)
+
+def upload_scene_image(pipeline_id, scene_number, image):
+    """원본 + 축소 버전 인코딩 후 S3 업로드 + DB에 URL 저장을 업로더에 맡김 (업로드하는 동안 워커는 다음 장면을 렌더링)"""
+    files = []
+    for encoded in image_encoder.encode_variants(image):
+        suffix = "" if encoded.variant == ORIGINAL_VARIANT else f"_{encoded.variant}"
+        s3_key = f"{pipeline_id}/scene_{scene_number}{suffix}.{encoded.extension}"
+        files.append((encoded.variant, s3_key, encoded.data, encoded.content_type))
+    return scene_uploader.submit(pipeline_id, scene_number, files)
 
-    with crud.get_session() as db:
-        for i, image_bytes in enumerate(images, 1):
-            # S3 업로드
-            s3_key = f"{pipeline_id}/scene_{i}.png"
-            image_url = upload_image_to_s3(image_bytes, s3_key)
-
-            # DB에 URL 저장
-            crud.save_scene_image_url(
-                db=db,
-                pipeline_id=pipeline_id,
-                scene_number=i,
-                image_url=image_url
-            )
+def image_maker(input_text: str, pipeline_id: str, crud: PipelineCRUD):
+    """
+    장면 하나의 이미지를 생성하고, S3 업로드와 DB URL 저장은 백그라운드 업로더에 맡김
+    input_text: '{"scene_number": 1, "generated_prompt": "..."}' 형태의 JSON 문자열
 
-    return "success"
+    Returns:
+        Future: 업로드와 DB 기록이 끝나면 이미지 URL로 완료 (그때 step 완료 처리 및 ack)
+    """
+    scene = json.loads(input_text)
+    scene_number = int(scene["scene_number"])
+    profile = scene.get("inference_profile")
+    # 그림체 전환을 쓰지 않으면 DreamShaper 고정
+    style = scene.get("style") if IMAGE_STYLE_SWAP else None
+    # 미리보기 채널: image_preview:{pipeline id}:{장면 번호} (요청이 미리보기를 원하고 IMAGE_PREVIEW_EVERY_N_STEPS > 0일 때만 전송)
+    scene["preview_key"] = f"{pipeline_id}:{scene_number}" if scene.get("preview") else None
+
+    # IMAGE_PIPELINED_DECODE면 디코드 스레드에서 바로 인코딩/업로드를 시작해 다음 sub-batch의 denoising과 겹침
+    uploads = []
+
+    def on_image(image):
+        uploads.append((image, upload_scene_image(pipeline_id, scene_number, image)))
+
+    if image_batcher is not None:
+        # 다른 파이프라인의 장면과 함께 batch로 생성되고, 이 장면의 이미지만 돌려받음 (실패 시 예외)
+        image = image_batcher.generate(
+            scene["generated_prompt"], seed=scene.get("seed"), profile=profile, style=style,
+            timeout=IMAGE_BATCH_TIMEOUT_SECONDS, preview_key=scene["preview_key"], on_image=on_image
+        )
+    else:
+        manager = ImageMakerManager(get_image_maker())
+        image = manager.generate(
+            json.dumps([scene], ensure_ascii=False), profile=profile, style=style,
+            on_image=lambda i, image: on_image(image)
+        )[0]
+    if image is None:
+        # 실패한 장면만 재시도되도록 예외로 알림
+        raise RuntimeError(f"scene {scene_number} 이미지 생성 실패")
+    if image_cache is not None:
+        print(f"[이미지 캐시] hit rate {image_cache.stats()['hit_rate']:.1%}")
+    if prompt_embedding_cache is not None:
+        print(f"[프롬프트 임베딩 캐시] hit rate {prompt_embedding_cache.stats()['hit_rate']:.1%}")
+
+    # 디코드 스레드에서 이미 올린 이미지면 그 업로드를 그대로 사용 (캐시 hit 등은 여기서 인코딩/업로드)
+    if uploads and uploads[0][0] is image:
+        return uploads[0][1]
+    return upload_scene_image(pipeline_id, scene_number, image)
 
 # en_ko_translator 로직
 def en_ko_translator(input_text: str, pipeline_id: str, crud: PipelineCRUD):
@@ -188,31 +496,27 @@ def en_ko_translator(input_text: str, pipeline_id: str, crud: PipelineCRUD):
     영어 story를 한국어로 번역하고 DB에 저장
     input_text: '[{"scene_number": 1, "story": "...."}, ...]' 형태의 JSON 문자열
     """
-    translator = TranslatorSelector.get_translator("nllb")
+    translator = registry.get("translator:nllb", lambda: load_translator("nllb"))
     translator_manager = TranslatorManager(translator)
 
     data = json.loads(input_text)
-    translated = []
 
-    with crud.get_session() as db:
-        for item in data:
-            scene_number = item["scene_number"]
-            story_en = item["story"]
-            story_ko = translator_manager.process(story_en)
+    # 모든 장면을 한 번의 batch 번역으로 처리
+    stories_ko = translator_manager.process_batch([item["story"] for item in data])
+    translated = [
+        {"scene_number": item["scene_number"], "story_ko": story_ko}
+        for item, story_ko in zip(data, stories_ko)
+    ]
 
-            # DB에 저장
-            crud.save_scene_story(db, pipeline_id, scene_number, story_ko)
+    # DB에 한 트랜잭션으로 저장
+    with crud.get_session() as db:
+        crud.save_scene_stories(db, pipeline_id, [(item["scene_number"], item["story_ko"]) for item in translated])
 
-            translated.append({
-                "scene_number": scene_number,
-                "story_ko": story_ko
-            })
-    
     return json.dumps(translated, ensure_ascii=False)
 
 # emotion_classifer 로직
 def emotion_classifier(input_text: str, pipeline_id: str, crud: PipelineCRUD):
-    classifer = EmotionClassifierSelector.get_emotion_classifier("minilm")
+    classifer = registry.get("emotion_classifier:minilm", lambda: EmotionClassifierSelector.get_emotion_classifier("minilm"))
     emotion_classifer_manager = EmotionClassifierManager(classifer)
 
     data = json.loads(input_text)
@@ -280,12 +584,20 @@ def is_scene_parser_logic(logic_fn):
     db_required_fns = {"scene_parser"}
     return logic_fn.__name__ in db_required_fns
 
+def is_prompt_maker_logic(logic_fn):
+    return logic_fn.__name__ == "prompt_maker"
+
+def is_fan_in_branch(logic_fn):
+    # scene parser 이후 병렬로 실행되고, 모두 끝나야 완료 알림으로 이어지는 분기
+    branch_fns = {"image_maker", "en_ko_translator", "emotion_classifier"}
+    return logic_fn.__name__ in branch_fns
+
 def is_terminal(logic_fn):
     db_required_fns = {"emotion_classifier", "en_ko_translator", "notify_fairytale_completion"}
     return logic_fn.__name__ in db_required_fns
 
 # s3 업로드용 유틸 함수
-def upload_image_to_s3(image_bytes: bytes, s3_key: str) -> str:
+def upload_image_to_s3(image_bytes: bytes, s3_key: str, content_type: str = "image/png") -> str:
     """
     S3에 이미지 업로드 후 public URL 반환
     """
@@ -296,7 +608,7 @@ def upload_image_to_s3(image_bytes: bytes, s3_key: str) -> str:
         Fileobj=file_obj,
         Bucket=AWS_BUCKET,
         Key=s3_key,
-        ExtraArgs={"ContentType": "image/png"}
+        ExtraArgs={"ContentType": content_type}
     )
 
     # 그냥 URL 생성 (리전 필요)
@@ -305,6 +617,13 @@ def upload_image_to_s3(image_bytes: bytes, s3_key: str) -> str:
 
 # step 함수
 def step(task_data, logic):
+    """
+    step 로직 실행 후 결과 저장 및 다음 step 등록
+
+    Returns:
+        Future 또는 None: 로직이 백그라운드 작업(Future)을 반환하면 그 작업이 끝난 뒤 완료 처리하고,
+                         완료 처리까지 끝나면 완료되는 Future를 반환 (호출 측은 그때 ack)
+    """
     payload = task_data['payload']
 
     if use_db_for_logic(logic):
@@ -312,15 +631,45 @@ def step(task_data, logic):
     else:
         result = logic(input_text=payload)
 
-    r.hset(f"task:{task_data['stepId']}", mapping={
+    if not isinstance(result, Future):
+        finish_step(task_data, logic, result)
+        return None
+
+    finished = Future()
+
+    def on_done(background):
+        try:
+            finish_step(task_data, logic, background.result())
+        except Exception as e:
+            finished.set_exception(e)
+        else:
+            finished.set_result(None)
+
+    result.add_done_callback(on_done)
+    return finished
+
+def finish_step(task_data, logic, result):
+    step_id = task_data['stepId']
+
+    # 결과 저장과 함께 끝난 task 해시에 TTL 설정
+    pipe = r.pipeline(transaction=True)
+    pipe.hset(f"task:{step_id}", mapping={
         "status": "done",
-        "result": result
+        **payloads.pack(step_id, task_data['pipelineId'], result, field="result", pipe=pipe)
     })
-
-    if is_terminal(logic):
+    payloads.mark_finished(step_id, pipe=pipe)
+    pipe.execute()
+
+    if is_fan_in_branch(logic):
+        complete_fan_in_branch(task_data)
+    elif is_terminal(logic):
+        if logic.__name__ == "notify_fairytale_completion":
+            print_payload_report(task_data['pipelineId'])
         return
     elif is_scene_parser_logic(logic):
         enqueue_next_steps_after_scene_parser(task_data, result)
+    elif is_prompt_maker_logic(logic):
+        enqueue_image_steps_per_scene(task_data, result)
     else:
         enqueue_next_step(task_data, result)
 
@@ -335,6 +684,42 @@ s3_client = boto3.client(
     aws_secret_access_key=AWS_SECRET_KEY,
 )
 
+# 장면 이미지 백그라운드 업로더 (DB 기록은 여러 장면을 모아 한 트랜잭션으로)
+def write_scene_image_urls(rows):
+    with crud.get_session() as db:
+        crud.save_scene_image_urls(db, rows)
+
+scene_uploader = StreamingSceneUploader(
+    upload_image_to_s3,
+    write_scene_image_urls,
+    max_workers=IMAGE_UPLOAD_CONCURRENCY,
+    max_in_flight=max(IMAGE_UPLOAD_MAX_IN_FLIGHT, IMAGE_UPLOAD_CONCURRENCY),
+    db_batch_size=IMAGE_DB_BATCH_SIZE,
+    db_flush_interval=IMAGE_DB_FLUSH_MS / 1000
+)
+
+# task payload 저장소 (큰 payload 압축 / artifact store로 내보내기, 끝난 task 해시 TTL)
+artifact_store_options = {
+    "local": {"root_dir": PAYLOAD_ARTIFACT_DIR},
+    "s3": {"s3_client": s3_client, "bucket": AWS_BUCKET},
+}.get(PAYLOAD_ARTIFACT_STORE, {})
+payloads = PayloadStore(
+    r,
+    artifact_store=ArtifactStoreSelector.get_artifact_store(PAYLOAD_ARTIFACT_STORE, **artifact_store_options),
+    codec=PAYLOAD_CODEC,
+    compress_threshold=PAYLOAD_COMPRESS_THRESHOLD_BYTES,
+    spill_threshold=PAYLOAD_SPILL_THRESHOLD_BYTES,
+    finished_ttl=TASK_RESULT_TTL_SECONDS
+)
+
+def print_payload_report(pipeline_id):
+    report = payloads.pipeline_report(pipeline_id)
+    print(
+        f"[payload] pipeline {pipeline_id}: 원본 {report['raw_bytes']}B → Redis {report['redis_bytes']}B "
+        f"(절약 {report['saved_bytes']}B, artifact {report['artifact_bytes']}B), "
+        f"남은 task 해시 메모리 {report['redis_memory_bytes']}B"
+    )
+
 # Step 매핑
 step_map = {
     1: ko_en_translator,
@@ -347,39 +732,222 @@ step_map = {
     6: notify_fairytale_completion
 }
 
-# 워커 루프
-print("워커 시작됨. 작업 대기 중...")
+# Step별 사용 자원 (동시 실행 모드에서 자원별 동시 실행 한도 적용)
+step_resource_map = {
+    1: "cpu_model",
+    2: "http",
+    3: "http",
+    4: "http",
+    5: "diffusion",
+    31: "cpu_model",
+    32: "cpu_model",
+    6: "http"
+}
 
-while True:
-    try:
-        # 1. 대기열에서 작업 꺼내기
-        _, step_id = r.brpop("task_queue")
-        task_key = f"task:{step_id}"
-
-        # 2. 해시에서 작업 데이터 읽기
-        task_data = r.hgetall(task_key)
-
-        # 3. 필수 필드 확인
-        required_fields = ["status", "payload", "pipelineId", "order"]
-        if not all(field in task_data for field in required_fields):
-            print(f"[경고] 필수 필드 누락: {task_data}")
-            r.hset(task_key, "status", "failed")
-            continue
-
-        # 4. 처리 시작 전 상태 업데이트
-        r.hset(task_key, "status", "processing")
-        task_data["stepId"] = step_id  # step 함수에 전달
-
-        # 5. 스텝 함수 실행
-        order = int(task_data["order"])
-        step_fn = step_map.get(order)
-
-        if step_fn:
-            step(task_data, step_fn)
-        else:
-            print(f"[경고] 정의되지 않은 step order: {order}")
-            r.hset(task_key, "status", "failed")
+def mark_failed(step_id):
+    pipe = r.pipeline(transaction=True)
+    pipe.hset(f"task:{step_id}", "status", "failed")
+    payloads.mark_finished(step_id, pipe=pipe)
+    pipe.execute()
+
+# 큐에서 꺼낸 step id로 작업 데이터 읽기 및 검증
+def load_task(step_id):
+    """
+    task 해시를 읽어 필수 필드를 확인하고 step 함수와 함께 반환
 
+    Returns:
+        tuple: (task_data, step_fn). 유효하지 않은 작업이면 (None, None)
+    """
+    task_key = f"task:{step_id}"
+
+    # 해시에서 작업 데이터 읽기
+    task_data = r.hgetall(task_key)
+
+    # 필수 필드 확인
+    required_fields = ["status", "payload", "pipelineId", "order"]
+    if not all(field in task_data for field in required_fields):
+        print(f"[경고] 필수 필드 누락: {task_data}")
+        mark_failed(step_id)
+        return None, None
+
+    # 압축/내보낸 payload 복원
+    try:
+        task_data["payload"] = payloads.unpack(task_data)
     except Exception as e:
-        print(f"[에러] 처리 중 예외 발생: {e}")
-        time.sleep(1)
+        print(f"[경고] payload 복원 실패: {step_id}: {e}")
+        mark_failed(step_id)
+        return None, None
+
+    task_data["stepId"] = step_id  # step 함수에 전달
+    observe_queue_wait(task_data)
+
+    order = int(task_data["order"])
+    step_fn = step_map.get(order)
+    if not step_fn:
+        print(f"[경고] 정의되지 않은 step order: {order}")
+        mark_failed(step_id)
+        return None, None
+
+    return task_data, step_fn
+
+def run_step(task_data, step_fn):
+    # 처리 시작 전 상태 업데이트 후 스텝 함수 실행
+    r.hset(f"task:{task_data['stepId']}", "status", "processing")
+    pending = step(task_data, step_fn)
+    stats = registry.stats()
+    print(f"[모델 레지스트리] hit {stats['hits']} / miss {stats['misses']}, 상주 모델: {stats['resident']}")
+    return pending
+
+def run_claimed_step(task_data, step_fn):
+    """
+    claim한 step을 실행하고 결과에 따라 ack/nack
+    실패하거나 도중에 프로세스가 죽으면 이 step만 재시도되고 앞선 step은 다시 실행되지 않음
+    백그라운드 작업(이미지 업로드 등)이 남은 step은 그 작업이 끝날 때 ack/nack (그동안 lease는 heartbeat로 유지)
+    """
+    step_id = task_data["stepId"]
+    try:
+        pending = run_step(task_data, step_fn)
+    except Exception as e:
+        print(f"[에러] step {step_id} 처리 중 예외 발생: {e}")
+        queue.nack(step_id)
+        return
+
+    if pending is None:
+        queue.ack(step_id)
+    else:
+        pending.add_done_callback(lambda finished: settle_background_step(step_id, finished))
+
+def settle_background_step(step_id, finished):
+    error = finished.exception()
+    if error is not None:
+        print(f"[에러] step {step_id} 백그라운드 처리 중 예외 발생: {error}")
+        queue.nack(step_id)
+    else:
+        queue.ack(step_id)
+
+def claim_task(stages=None):
+    """
+    담당 stage 대기열에서 step을 claim하고 작업 데이터를 읽음
+
+    Args:
+        stages (list, optional): 이번에 확인할 stage 목록 (생략 시 워커 담당 stage 전체)
+
+    Returns:
+        tuple: (task_data, step_fn). 대기 중인 작업이 없거나 유효하지 않으면 (None, None)
+    """
+    step_id = queue.claim(timeout=1, stages=stages)
+    if step_id is None:
+        return None, None
+
+    task_data, step_fn = load_task(step_id)
+    if task_data is None:
+        # 재시도해도 처리할 수 없는 작업은 큐에서 제거 (status는 load_task에서 failed로 표시)
+        queue.ack(step_id)
+    return task_data, step_fn
+
+# 죽은 워커의 step 회수 (주기적으로 호출)
+last_reclaim_at = 0.0
+
+def reclaim_expired_steps():
+    global last_reclaim_at
+    now = time.time()
+    if now - last_reclaim_at < TASK_RECLAIM_INTERVAL_SECONDS:
+        return
+    last_reclaim_at = now
+    queue.reclaim_expired()
+    # 로컬 artifact는 만료 기능이 없으므로 task 해시 TTL이 지난 blob을 직접 정리 (S3는 lifecycle 규칙 사용)
+    if isinstance(payloads.artifact_store, LocalArtifactStore):
+        payloads.artifact_store.purge_older_than(TASK_RESULT_TTL_SECONDS)
+
+# 워커 루프 (한 번에 step 하나씩 실행)
+def run_serial_worker():
+    print(f"워커 시작됨 ({queue.worker_id}). 작업 대기 중...")
+
+    while True:
+        try:
+            reclaim_expired_steps()
+
+            # 대기열에서 작업 꺼내기
+            task_data, step_fn = claim_task()
+            if task_data is None:
+                continue
+
+            run_claimed_step(task_data, step_fn)
+
+        except Exception as e:
+            print(f"[에러] 처리 중 예외 발생: {e}")
+            time.sleep(1)
+
+# 동시 실행 워커 루프 (자원별 한도 내에서 서로 다른 종류의 step을 겹쳐 실행)
+def run_concurrent_worker():
+    global image_batcher
+    if IMAGE_BATCH_MAX_SIZE > 1:
+        image_batcher = DynamicImageBatcher(
+            get_image_maker,
+            max_batch_size=IMAGE_BATCH_MAX_SIZE,
+            max_wait_seconds=IMAGE_BATCH_MAX_WAIT_MS / 1000
+        )
+
+    runner = ConcurrentStepRunner({
+        # batching 중에는 장면 step 대부분이 batch 결과를 기다리므로 batch 크기만큼 동시에 claim
+        "diffusion": max(WORKER_DIFFUSION_CONCURRENCY, IMAGE_BATCH_MAX_SIZE),
+        "cpu_model": WORKER_CPU_MODEL_CONCURRENCY,
+        "http": WORKER_HTTP_CONCURRENCY
+    })
+    print(f"동시 실행 워커 시작됨 ({queue.worker_id}, 자원별 한도: {runner.resource_limits}). 작업 대기 중...")
+
+    while True:
+        try:
+            reclaim_expired_steps()
+
+            # 모든 자원이 사용 중이면 슬롯이 빌 때까지 대기
+            runner.wait_for_capacity()
+
+            # 빈 슬롯이 있는 자원을 쓰는 stage 대기열에서만 claim
+            stages = [stage for stage in queue.stages if runner.has_capacity(step_resource_map.get(stage, "cpu_model"))]
+            task_data, step_fn = claim_task(stages)
+            if task_data is None:
+                continue
+
+            resource = step_resource_map.get(int(task_data["order"]), "cpu_model")
+            if not runner.try_submit(resource, run_claimed_step, task_data, step_fn):
+                # claim 사이에 자원이 가득 찼으면 큐 뒤로 되돌리고, 다른 step이 끝날 때까지 잠시 대기
+                queue.release(task_data["stepId"])
+                runner.wait_for_release(timeout=WORKER_REQUEUE_BACKOFF_SECONDS)
+
+        except Exception as e:
+            print(f"[에러] 처리 중 예외 발생: {e}")
+            time.sleep(1)
+
+def parse_stages(value):
+    """'1,31,32' 형태의 문자열을 stage 목록으로 변환 (step_map에 없는 stage는 오류)"""
+    if not value:
+        return []
+    stages = [int(stage) for stage in value.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in step_map]
+    if unknown:
+        raise ValueError(f"정의되지 않은 stage: {unknown} (가능한 stage: {list(step_map)})")
+    return stages
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="StoryPool 파이프라인 워커")
+    parser.add_argument("--stages", default=WORKER_STAGES,
+                        help="담당 stage 목록 (예: 5 또는 1,31,32). 앞쪽일수록 우선, 미지정 시 전체 stage")
+    parser.add_argument("--steal-stages", default=WORKER_STEAL_STAGES,
+                        help="담당 stage가 모두 비었을 때 가져와 처리할 낮은 우선순위 stage 목록 (work stealing)")
+    args = parser.parse_args()
+
+    # 담당 stage를 먼저 확인하고, 모두 비어 있을 때만 steal stage를 확인
+    primary_stages = parse_stages(args.stages) or list(step_map)
+    steal_stages = [stage for stage in parse_stages(args.steal_stages) if stage not in primary_stages]
+    queue = build_task_queue(primary_stages + steal_stages)
+    join = FanInJoin(r, queue)
+    print(f"담당 stage: {primary_stages}, work stealing stage: {steal_stages}")
+
+    if WORKER_METRICS_PORT:
+        start_http_server(int(WORKER_METRICS_PORT))
+
+    if WORKER_MODE == "concurrent":
+        run_concurrent_worker()
+    else:
+        run_serial_worker()